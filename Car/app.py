@@ -1,8 +1,12 @@
-import requests
-from flask import Flask, request, render_template
-import pandas as pd
+from flask import Flask, request, render_template, jsonify
 import os
 from dotenv import load_dotenv  # Import the library to load environment variables
+from http_client import CarApiClient  # Shared, pooled HTTP client for the car API
+from comparison import (MAX_CARS, fetch_all, parse_car_slots,  # Parallel N-car comparison
+                        flatten_results, build_comparison)
+from cache import CarCache, normalise_key  # LRU + TTL cache for car lookups
+from table import Table, comparison_rows  # Lightweight HTML tables rendered by the templates
+from dataset import CarDataset  # Optional local car-spec dataset for offline lookups
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,10 +17,20 @@ app = Flask(__name__)
 # Get the API key from the environment variable
 API_KEY = os.getenv('API_KEY')
 
+# Shared client so connections to the API are kept alive across requests
+client = CarApiClient.from_env(API_KEY)
+
+# Cache for car lookups; specs for a make/model/year almost never change
+cache = CarCache.from_env()
+
+# Local dataset answering lookups without the API (None unless CAR_DATASET_DB is set)
+dataset = CarDataset.from_env()
+
 # Function to fetch car data from the API
 def fetch_car_data(make, model, year):
     """
-    Fetches car data from the API based on make, model, and year.
+    Fetches car data based on make, model, and year.
+    The local dataset is checked first (if configured), then the cache, then the API.
 
     Parameters:
         make (str): Car make
@@ -26,16 +40,32 @@ def fetch_car_data(make, model, year):
     Returns:
         dict: JSON response from the API containing car details, or None if an error occurs.
     """
-    url = f"https://api.api-ninjas.com/v1/cars?make={make}&model={model}&year={year}"
-    response = requests.get(url, headers={'X-Api-Key': API_KEY})
-    if response.status_code != 200:  # Check if the API request was successful
-        return None
-    return response.json()  # Return the JSON response
+    if dataset is not None:
+        car_data = dataset.lookup(make, model, year)
+        if car_data:
+            return car_data
+    key = normalise_key(make, model, year)
+    make, model, year = key
+    return cache.get_or_load(key, lambda: client.get_json({'make': make, 'model': model, 'year': year}))
+
+# Function to convert car data into a table for display
+def create_table(car_data):
+    """
+    Wraps car data in a Table that the templates render row by row.
+
+    Parameters:
+        car_data (list): List of dictionaries containing car details
+
+    Returns:
+        Table: A table with ordered columns and formatted values
+    """
+    return Table(car_data)
 
 # Function to convert car data into a Pandas DataFrame
 def create_dataframe(car_data):
     """
-    Converts car data into a Pandas DataFrame for easier display.
+    Converts car data into a Pandas DataFrame for analysis.
+    pandas is optional and only imported when this function is called.
 
     Parameters:
         car_data (list): List of dictionaries containing car details
@@ -43,10 +73,10 @@ def create_dataframe(car_data):
     Returns:
         pd.DataFrame: A DataFrame representation of the car data
     """
+    import pandas as pd  # Optional dependency
     if not car_data:  # Check if car data is empty or None
         return pd.DataFrame()  # Return an empty DataFrame
-    df = pd.DataFrame(car_data)
-    return df
+    return pd.DataFrame(car_data)
 
 # Route for the main page (index)
 @app.route('/', methods=['GET', 'POST'])
@@ -66,9 +96,8 @@ def index():
         # Fetch car data from the API
         car_data = fetch_car_data(make, model, year)
         if car_data:
-            # Create a DataFrame and render it as an HTML table
-            df = create_dataframe(car_data)
-            return render_template('index.html', tables=[df.to_html(classes='data', header="true")])
+            # Create a table that the template renders row by row
+            return render_template('index.html', tables=[create_table(car_data)])
         else:
             # Display an error message if no data is found
             return render_template('index.html', error="No data found for the specified car.")
@@ -76,40 +105,93 @@ def index():
     # Render the default index page
     return render_template('index.html')
 
+# Function to fetch several cars and compare their specs
+def compare_cars(cars):
+    """
+    Fetches all cars in parallel and builds the side-by-side comparison.
+
+    Parameters:
+        cars (list): (make, model, year) tuples
+
+    Returns:
+        dict: Comparison with aligned fields, deltas and rankings
+    """
+    results = fetch_all(fetch_car_data, cars)
+    return build_comparison(*flatten_results(cars, results))
+
 # Route for the compare cars page
 @app.route('/compare', methods=['GET', 'POST'])
 def compare():
     """
-    Handles the compare cars page where users can input details of two cars
+    Handles the compare cars page where users can input details of two or more cars
     and view a side-by-side comparison.
 
-    If the request method is POST, it fetches data for both cars from the API
-    and displays it in two separate tables.
+    If the request method is POST, it fetches data for all cars from the API in parallel
+    and displays a single merged table with the best value of each spec highlighted.
     """
+    # Number of car slots to show in the form (two by default)
+    slots = min(max(request.args.get('cars', 2, type=int), 2), MAX_CARS)
+
     if request.method == 'POST':
-        # Get form data for both cars
-        make1 = request.form['make1']
-        model1 = request.form['model1']
-        year1 = request.form['year1']
-        make2 = request.form['make2']
-        model2 = request.form['model2']
-        year2 = request.form['year2']
-        
-        # Fetch car data for both cars
-        car_data1 = fetch_car_data(make1, model1, year1)
-        car_data2 = fetch_car_data(make2, model2, year2)
-        
-        # Create DataFrames for both cars
-        df1 = create_dataframe(car_data1)
-        df2 = create_dataframe(car_data2)
-        
-        # Render the comparison page with both tables
-        return render_template('compare.html', 
-                               table1=df1.to_html(classes='data', header="true"), 
-                               table2=df2.to_html(classes='data', header="true"))
-    
+        # Get form data for every filled-in car slot
+        cars = parse_car_slots(request.form)
+        slots = max(slots, len(cars))
+
+        # Fetch car data for all cars concurrently and align their specs
+        comparison = compare_cars(cars)
+
+        # Render the comparison page with the merged table
+        return render_template('compare.html', comparison=comparison,
+                               rows=comparison_rows(comparison), slots=slots, max_cars=MAX_CARS)
+
     # Render the default compare page
-    return render_template('compare.html')
+    return render_template('compare.html', slots=slots, max_cars=MAX_CARS)
+
+# JSON endpoint for programmatic comparisons
+@app.route('/api/compare')
+def api_compare():
+    """
+    Compares cars given as repeated car=make,model,year query parameters and returns JSON.
+
+    Example:
+        /api/compare?car=toyota,camry,2020&car=honda,accord,2020
+    """
+    cars = []
+    for value in request.args.getlist('car')[:MAX_CARS]:
+        parts = [part.strip() for part in value.split(',')]
+        if len(parts) != 3 or not all(parts):
+            return jsonify(error=f"Expected car=make,model,year, got {value!r}"), 400
+        cars.append(tuple(parts))
+    if not cars:
+        return jsonify(error="At least one car parameter is required."), 400
+    return jsonify(compare_cars(cars))
+
+# Route for searching the local dataset
+@app.route('/search')
+def search():
+    """
+    Searches the local dataset with query-string filters and returns JSON.
+
+    Examples:
+        /search?year=2020&city_mpg__gt=30
+        /search?make=toyota&model__prefix=cam&limit=20
+    """
+    if dataset is None:
+        return jsonify(error="Offline dataset is not configured."), 404
+    filters = request.args.to_dict()
+    limit = filters.pop('limit', 100)
+    try:
+        return jsonify(dataset.search(limit=limit, **filters))
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+# Route exposing the cache counters
+@app.route('/cache-stats')
+def cache_stats():
+    """
+    Returns the car lookup cache hit/miss/eviction counters as JSON.
+    """
+    return jsonify(cache.stats())
 
 # Run the Flask application
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+"""
+Benchmarks for the Car app, run against a local stub of the API Ninjas endpoint.
+
+Usage:
+    python benchmark.py pooling [--requests 200] [--delay 0.005]
+    python benchmark.py compare [--requests 20] [--delay 0.1]
+    python benchmark.py table [--rows 20] [--iterations 2000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Point the app at the stub before it is imported
+os.environ.setdefault('API_KEY', 'benchmark')
+# Disable the lookup cache so every request reaches the stub
+os.environ.setdefault('CAR_CACHE_SIZE', '0')
+os.environ.pop('CAR_CACHE_DB', None)
+
+
+# Request handler that mimics the /v1/cars endpoint
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Allow keep-alive connections
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls on kept-alive connections
+    delay = 0.0  # Simulated upstream latency in seconds
+
+    @staticmethod
+    def body_for(make, model, year):
+        """Returns the encoded JSON response for a lookup."""
+        return json.dumps([{
+            "make": make,
+            "model": model,
+            "year": year,
+            "class": "midsize car",
+            "cylinders": 4,
+            "displacement": 2.5,
+            "drive": "fwd",
+            "fuel_type": "gas",
+            "transmission": "a",
+            "city_mpg": 28,
+            "highway_mpg": 39,
+            "combination_mpg": 32,
+        }]).encode()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        time.sleep(self.delay)
+        body = self.body_for(query.get('make', [''])[0], query.get('model', [''])[0],
+                             int(query.get('year', ['0'])[0] or 0))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+def start_stub(delay=0.0):
+    """
+    Starts the stub server on a free local port in a background thread.
+
+    Parameters:
+        delay (float): Simulated upstream latency in seconds
+
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() when done)
+    """
+    handler = type('Handler', (StubHandler,), {'delay': delay})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(samples, pct):
+    """Returns the pct-th percentile of a list of samples (nearest rank)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def time_requests(test_client, path, form, count):
+    """
+    Posts the same form count times and returns the latencies in milliseconds.
+    """
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = test_client.post(path, data=form)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return latencies
+
+
+def report(label, latencies):
+    print(f"{label:<28} p50={percentile(latencies, 50):7.2f} ms  p99={percentile(latencies, 99):7.2f} ms")
+
+
+def bench_pooling(args):
+    """Compares keep-alive pooling against a fresh connection per upstream call."""
+    server = start_stub(args.delay)
+    os.environ['CAR_API_URL'] = f"http://127.0.0.1:{server.server_port}/v1/cars"
+    import app as car_app
+    from http_client import CarApiClient
+
+    index_form = {'make': 'toyota', 'model': 'camry', 'year': '2020'}
+    compare_form = {'make1': 'toyota', 'model1': 'camry', 'year1': '2020',
+                    'make2': 'honda', 'model2': 'accord', 'year2': '2020'}
+    test_client = car_app.app.test_client()
+
+    for pooling in (False, True):
+        os.environ['CAR_API_POOLING'] = '1' if pooling else '0'
+        car_app.client = CarApiClient.from_env(car_app.API_KEY)
+        label = 'pooled' if pooling else 'unpooled'
+        report(f"/ ({label})", time_requests(test_client, '/', index_form, args.requests))
+        report(f"/compare ({label})", time_requests(test_client, '/compare', compare_form, args.requests))
+        car_app.client.close()
+
+    server.shutdown()
+
+
+def bench_compare(args):
+    """Shows /compare latency tracking the slowest lookup as the number of cars grows."""
+    server = start_stub(args.delay)
+    os.environ['CAR_API_URL'] = f"http://127.0.0.1:{server.server_port}/v1/cars"
+    import app as car_app
+    from http_client import CarApiClient
+
+    car_app.client = CarApiClient.from_env(car_app.API_KEY)
+    test_client = car_app.app.test_client()
+    print(f"upstream delay per lookup: {args.delay * 1000:.0f} ms")
+
+    for count in range(1, car_app.MAX_CARS + 1):
+        form = {}
+        for slot in range(1, count + 1):
+            form.update({f'make{slot}': 'toyota', f'model{slot}': f'model{slot}', f'year{slot}': '2020'})
+        report(f"/compare ({count} cars)", time_requests(test_client, '/compare', form, args.requests))
+
+    car_app.client.close()
+    server.shutdown()
+
+
+def max_rss_after_import(module):
+    """Returns the peak resident memory in MB of a fresh interpreter that imports module."""
+    # VmHWM is reset on exec, unlike ru_maxrss which Linux carries over from the parent
+    code = (f"import {module}\n"
+            "for line in open('/proc/self/status'):\n"
+            "    if line.startswith('VmHWM:'):\n"
+            "        print(line.split()[1])")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return int(output.stdout) / 1024  # Reported in KB
+
+
+def bench_table(args):
+    """Compares the Table renderer against the pandas DataFrame.to_html path."""
+    import pandas as pd
+    from flask import render_template_string
+    import app as car_app
+
+    record = json.loads(StubHandler.body_for('toyota', 'camry', 2020))[0]
+    records = [dict(record, model=f"camry trim {i}") for i in range(args.rows)]
+    template = "{% from '_table.html' import render_table %}{{ render_table(table) }}"
+
+    with car_app.app.test_request_context():
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            render_template_string("{{ table|safe }}",
+                                   table=pd.DataFrame(records).to_html(classes='data', header="true"))
+        pandas_ms = (time.perf_counter() - start) * 1000 / args.iterations
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            render_template_string(template, table=car_app.create_table(records))
+        table_ms = (time.perf_counter() - start) * 1000 / args.iterations
+
+    print(f"per-render CPU ({args.rows} rows): pandas to_html {pandas_ms:.3f} ms, Table {table_ms:.3f} ms")
+    print(f"cold-start peak RSS: flask+pandas {max_rss_after_import('flask, pandas'):.1f} MB, "
+          f"flask+table {max_rss_after_import('flask, table'):.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pooling = subparsers.add_parser('pooling', help='p50/p99 latency with pooling on and off')
+    pooling.add_argument('--requests', type=int, default=200)
+    pooling.add_argument('--delay', type=float, default=0.005)
+    pooling.set_defaults(func=bench_pooling)
+
+    compare = subparsers.add_parser('compare', help='/compare latency for 1..N cars')
+    compare.add_argument('--requests', type=int, default=20)
+    compare.add_argument('--delay', type=float, default=0.1)
+    compare.set_defaults(func=bench_compare)
+
+    table = subparsers.add_parser('table', help='Table renderer vs pandas to_html')
+    table.add_argument('--rows', type=int, default=20)
+    table.add_argument('--iterations', type=int, default=2000)
+    table.set_defaults(func=bench_table)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
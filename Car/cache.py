@@ -0,0 +1,192 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# Function to build a normalised cache key from the lookup parameters
+def normalise_key(make, model, year):
+    """
+    Normalises a (make, model, year) lookup so that "Toyota ", "toyota" and
+    "TOYOTA" share one cache entry.
+
+    Parameters:
+        make (str): Car make
+        model (str): Car model
+        year (str): Car year
+
+    Returns:
+        tuple: Lower-cased, whitespace-collapsed (make, model, year)
+    """
+    return tuple(' '.join(str(part).split()).lower() for part in (make, model, year))
+
+
+# Class for the optional on-disk cache tier that survives restarts
+class SQLiteTier:
+    """
+    Stores cached values as JSON in a single SQLite table.
+
+    Parameters:
+        path (str): Location of the SQLite database file
+        ttl (float): Seconds an entry stays valid
+    """
+
+    def __init__(self, path, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS car_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """Returns the stored value, or None if it is missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM car_cache WHERE key = ?", ('|'.join(key),)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        """Stores a value, replacing any previous entry for the key."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO car_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                ('|'.join(key), json.dumps(value), time.time()),
+            )
+            self._conn.commit()
+
+
+# Class implementing an in-process LRU cache with a time-to-live per entry
+class CarCache:
+    """
+    Size-bounded LRU cache with TTL, an optional SQLite tier, and single-flight
+    loading so concurrent identical lookups share one upstream call.
+
+    Parameters:
+        max_size (int): Maximum number of entries kept in memory
+        ttl (float): Seconds an entry stays valid
+        db_path (str): Optional path of the SQLite tier; None keeps the cache in memory only
+    """
+
+    def __init__(self, max_size=256, ttl=24 * 3600, db_path=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.disk = SQLiteTier(db_path, ttl) if db_path else None
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._inflight = {}  # key -> {'done': Event, 'value': result} for loads in progress
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        """Builds a cache using the CAR_CACHE_* environment variables."""
+        return cls(
+            max_size=int(os.getenv('CAR_CACHE_SIZE', 256)),
+            ttl=float(os.getenv('CAR_CACHE_TTL', 24 * 3600)),
+            db_path=os.getenv('CAR_CACHE_DB') or None,
+        )
+
+    def _get_memory(self, key):
+        # Must be called with the lock held
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]  # Expired
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _set_memory(self, key, value):
+        # Must be called with the lock held
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """
+        Returns the cached value for key, calling loader() on a miss.
+
+        Only one thread runs loader() for a given key at a time; others wait for
+        and share its result. Results that are None (failed lookups) are not cached.
+
+        Parameters:
+            key (tuple): Normalised cache key
+            loader (callable): Zero-argument function fetching the value upstream
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        with self._lock:
+            value = self._get_memory(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            flight = self._inflight.get(key)
+            if flight is None:
+                # This thread becomes the loader for the key
+                flight = self._inflight[key] = {'done': threading.Event(), 'value': None}
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            # Another thread is already loading this key; share its result
+            flight['done'].wait()
+            with self._lock:
+                self.collapsed += 1
+            return flight['value']
+
+        value = None
+        try:
+            value = self.disk.get(key) if self.disk else None
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+            else:
+                with self._lock:
+                    self.misses += 1
+                value = loader()
+                if value is not None and self.disk:
+                    self.disk.set(key, value)
+            if value is not None:
+                with self._lock:
+                    self._set_memory(key, value)
+            return value
+        finally:
+            flight['value'] = value
+            with self._lock:
+                del self._inflight[key]
+            flight['done'].set()
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, disk_hits, misses, collapsed (requests that shared an
+                  in-flight load), evictions and current size
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'collapsed': self.collapsed,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
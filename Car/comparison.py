@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from table import order_columns
+
+# Maximum number of cars that can be compared in a single request
+MAX_CARS = int(os.getenv('CAR_COMPARE_MAX_CARS', 8))
+
+# Deadline in seconds for all lookups of a single comparison
+DEADLINE = float(os.getenv('CAR_COMPARE_DEADLINE', 15))
+
+# Shared worker pool so threads are reused across requests
+_executor = ThreadPoolExecutor(max_workers=MAX_CARS, thread_name_prefix='car-compare')
+
+
+# Function to read the numbered car slots from the compare form
+def parse_car_slots(form):
+    """
+    Reads make1/model1/year1, make2/model2/year2, ... from the submitted form.
+
+    Parameters:
+        form (MultiDict): Submitted form data
+
+    Returns:
+        list: (make, model, year) tuples, one per filled-in slot, at most MAX_CARS
+    """
+    cars = []
+    for slot in range(1, MAX_CARS + 1):
+        make = form.get(f'make{slot}', '').strip()
+        model = form.get(f'model{slot}', '').strip()
+        year = form.get(f'year{slot}', '').strip()
+        if make and model and year:
+            cars.append((make, model, year))
+    return cars
+
+
+# Function to fetch several cars in parallel
+def fetch_all(fetch, cars, deadline=DEADLINE):
+    """
+    Runs fetch(make, model, year) for every car concurrently so the total time
+    tracks the slowest single lookup rather than the sum of all of them.
+
+    Parameters:
+        fetch (callable): Lookup function, e.g. fetch_car_data
+        cars (list): (make, model, year) tuples
+        deadline (float): Seconds to wait for all lookups before giving up
+
+    Returns:
+        list: One result per car in the same order; None for lookups that failed
+              or did not finish before the deadline
+    """
+    futures = [_executor.submit(fetch, *car) for car in cars]
+    wait(futures, timeout=deadline)
+    results = []
+    for future in futures:
+        if future.done() and future.exception() is None:
+            results.append(future.result())
+        else:
+            future.cancel()  # Drop lookups that are still queued
+            results.append(None)
+    return results
+
+
+# Numeric fields that are ranked, mapped to True when a higher value is better
+RANKED_FIELDS = {
+    'city_mpg': True,
+    'highway_mpg': True,
+    'combination_mpg': True,
+    'displacement': True,
+    'cylinders': True,
+    'year': True,
+}
+
+
+# Function to flatten lookup results into one column per trim
+def flatten_results(cars, results):
+    """
+    Turns the per-car lookup results into one labelled record per trim, since a
+    single make/model/year can return several trims.
+
+    Parameters:
+        cars (list): (make, model, year) tuples
+        results (list): Lookup results in the same order (lists of dicts or None)
+
+    Returns:
+        tuple: (labels, records) lists of the same length
+    """
+    labels, records = [], []
+    for (make, model, year), car_data in zip(cars, results):
+        base = f"{year} {make} {model}"
+        if not car_data:
+            labels.append(f"{base} (not found)")
+            records.append({})
+            continue
+        for trim, record in enumerate(car_data, start=1):
+            labels.append(base if len(car_data) == 1 else f"{base} #{trim}")
+            records.append(record)
+    return labels, records
+
+
+# Function to align specs across cars and compute deltas and rankings
+def build_comparison(labels, records):
+    """
+    Aligns the spec fields of all records and, for ranked numeric fields,
+    computes the best value, each car's delta from it and its rank.
+
+    The data is transposed once into one list per field, so each field is
+    processed in a single column-wise pass rather than row by row.
+
+    Parameters:
+        labels (list): Display label of each record
+        records (list): Dictionaries containing car details
+
+    Returns:
+        dict: {'cars': labels, 'fields': [...]} where each field entry has
+              'field' and 'values', plus 'best', 'deltas', 'ranks' and
+              'leaders' for ranked fields with at least one numeric value
+    """
+    fields = []
+    for field in order_columns(records):
+        values = [record.get(field) for record in records]
+        entry = {'field': field, 'values': values}
+        if field in RANKED_FIELDS:
+            numeric = [v if isinstance(v, (int, float)) and not isinstance(v, bool) else None for v in values]
+            present = [v for v in numeric if v is not None]
+            if present:
+                higher_is_better = RANKED_FIELDS[field]
+                best = max(present) if higher_is_better else min(present)
+                # Dense ranking: equal values share a rank
+                rank_of = {v: rank for rank, v in enumerate(sorted(set(present), reverse=higher_is_better), start=1)}
+                entry['best'] = best
+                entry['deltas'] = [None if v is None else round(v - best, 3) for v in numeric]
+                entry['ranks'] = [rank_of.get(v) for v in numeric]
+                entry['leaders'] = [label for label, v in zip(labels, numeric) if v == best]
+        fields.append(entry)
+    return {'cars': labels, 'fields': fields}
@@ -0,0 +1,227 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+from contextlib import nullcontext
+
+# Columns stored for every car, with their SQLite types
+COLUMNS = {
+    'make': 'TEXT',
+    'model': 'TEXT',
+    'year': 'INTEGER',
+    'class': 'TEXT',
+    'fuel_type': 'TEXT',
+    'drive': 'TEXT',
+    'transmission': 'TEXT',
+    'cylinders': 'INTEGER',
+    'displacement': 'REAL',
+    'city_mpg': 'INTEGER',
+    'highway_mpg': 'INTEGER',
+    'combination_mpg': 'INTEGER',
+}
+
+# Numeric columns that accept range filters (e.g. city_mpg__gt=30)
+NUMERIC_COLUMNS = [name for name, kind in COLUMNS.items() if kind in ('INTEGER', 'REAL')]
+
+# Comparison operators accepted as filter suffixes
+OPERATORS = {'gt': '>', 'gte': '>=', 'lt': '<', 'lte': '<=', 'eq': '='}
+
+
+# Function to convert a raw CSV/JSON value into the column's type
+def _coerce(column, value):
+    if value is None or value == '':
+        return None
+    kind = COLUMNS[column]
+    try:
+        if kind == 'INTEGER':
+            return int(float(value))
+        if kind == 'REAL':
+            return float(value)
+    except (TypeError, ValueError):
+        return None  # e.g. "premium subscribers only"
+    return str(value).strip().lower() if column in ('make', 'model') else str(value).strip()
+
+
+# Function to read records from a CSV or JSON export
+def read_records(path):
+    """
+    Reads car records from a CSV file or a JSON array of objects.
+
+    Parameters:
+        path (str): Path of the export (.csv or .json)
+
+    Returns:
+        iterator: Dictionaries containing car details
+    """
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            yield from json.load(f)
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+
+# Class wrapping an indexed SQLite store of car specs
+class CarDataset:
+    """
+    Local, indexed store of car specs for offline lookups and searches.
+
+    Parameters:
+        path (str): SQLite database file (":memory:" for a throwaway store)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()  # One connection per thread
+        self._shared = sqlite3.connect(path, check_same_thread=False) if path == ':memory:' else None
+        self._lock = threading.Lock()
+        self._create_schema()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Opens the dataset named by CAR_DATASET_DB, importing CAR_DATASET_SOURCE first if set.
+
+        Returns:
+            CarDataset: The opened store, or None if offline mode is not configured
+        """
+        db_path = os.getenv('CAR_DATASET_DB')
+        if not db_path:
+            return None
+        dataset = cls(db_path)
+        source = os.getenv('CAR_DATASET_SOURCE')
+        if source and dataset.count() == 0:
+            dataset.load(read_records(source))
+        return dataset
+
+    def _connection(self):
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Read-mostly workload: memory-map the database file
+            conn = self._local.conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA mmap_size = 268435456")
+        return conn
+
+    def _execute(self, sql, params=()):
+        # An in-memory store shares one connection, so serialise access to it
+        with self._lock if self._shared is not None else nullcontext():
+            return self._connection().execute(sql, params).fetchall()
+
+    def _create_schema(self):
+        conn = self._connection()
+        columns = ', '.join(f'"{name}" {kind}' for name, kind in COLUMNS.items())
+        conn.execute(f"CREATE TABLE IF NOT EXISTS cars (id INTEGER PRIMARY KEY, {columns})")
+        # Composite index serving exact make/model/year lookups and make/model prefix searches
+        conn.execute("CREATE INDEX IF NOT EXISTS cars_make_model_year ON cars (make, model, year)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cars_model ON cars (model)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cars_year ON cars (year)")
+        for name in NUMERIC_COLUMNS:
+            if name != 'year':
+                conn.execute(f'CREATE INDEX IF NOT EXISTS cars_{name} ON cars ("{name}")')
+        conn.commit()
+
+    def load(self, records, batch_size=5000):
+        """
+        Bulk-imports records into the store.
+
+        Parameters:
+            records (iterable): Dictionaries containing car details
+            batch_size (int): Rows inserted per executemany call
+
+        Returns:
+            int: Number of rows imported
+        """
+        names = list(COLUMNS)
+        sql = f"INSERT INTO cars ({self._select_list()}) VALUES ({', '.join('?' * len(names))})"
+        conn = self._connection()
+        total = 0
+        batch = []
+        for record in records:
+            batch.append([_coerce(name, record.get(name)) for name in names])
+            if len(batch) >= batch_size:
+                conn.executemany(sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(sql, batch)
+            total += len(batch)
+        conn.commit()
+        conn.execute("ANALYZE")  # Give the query planner statistics for the new data
+        return total
+
+    def count(self):
+        """Returns the number of cars in the store."""
+        return self._execute("SELECT COUNT(*) FROM cars")[0][0]
+
+    def _rows_to_dicts(self, rows):
+        names = list(COLUMNS)
+        return [{name: value for name, value in zip(names, row) if value is not None} for row in rows]
+
+    def lookup(self, make, model, year):
+        """
+        Finds cars matching an exact make, model and year (case-insensitive).
+
+        Returns:
+            list: Dictionaries containing car details, or None if nothing matches
+        """
+        rows = self._execute(
+            f"SELECT {self._select_list()} FROM cars WHERE make = ? AND model = ? AND year = ?",
+            (_coerce('make', make), _coerce('model', model), _coerce('year', year)),
+        )
+        return self._rows_to_dicts(rows) or None
+
+    def search(self, limit=100, **filters):
+        """
+        Searches the store with exact, prefix and range filters.
+
+        Filters:
+            make, model, year, fuel_type, ...: exact match
+            make__prefix, model__prefix: prefix match
+            <numeric column>__gt/__gte/__lt/__lte/__eq: range match, e.g. city_mpg__gt=30
+
+        Parameters:
+            limit (int): Maximum number of rows returned, at least 1
+
+        Returns:
+            list: Dictionaries containing car details
+
+        Raises:
+            ValueError: On an unknown filter, an empty prefix or a limit below 1
+        """
+        limit = int(limit)
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        clauses, params = [], []
+        for key, value in filters.items():
+            column, _, op = key.partition('__')
+            if column not in COLUMNS:
+                raise ValueError(f"Unknown column: {column}")
+            if op == 'prefix' and column not in NUMERIC_COLUMNS:
+                # Range form of a prefix match so the index can be used
+                prefix = _coerce(column, value)
+                if prefix is None:
+                    raise ValueError(f"Empty prefix for {key}")
+                clauses.append(f'"{column}" >= ? AND "{column}" < ?')
+                params.extend([prefix, prefix + '\uffff'])
+            elif op in OPERATORS and column in NUMERIC_COLUMNS:
+                clauses.append(f'"{column}" {OPERATORS[op]} ?')
+                params.append(_coerce(column, value))
+            elif not op:
+                clauses.append(f'"{column}" = ?')
+                params.append(_coerce(column, value))
+            else:
+                raise ValueError(f"Unsupported filter: {key}")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._execute(
+            f"SELECT {self._select_list()} FROM cars {where} ORDER BY make, model, year LIMIT ?",
+            params + [limit],
+        )
+        return self._rows_to_dicts(rows)
+
+    @staticmethod
+    def _select_list():
+        return ', '.join(f'"{name}"' for name in COLUMNS)
+
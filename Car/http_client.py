@@ -0,0 +1,108 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Default location of the API Ninjas car endpoint (overridable for local testing)
+DEFAULT_BASE_URL = "https://api.api-ninjas.com/v1/cars"
+
+# Status codes that are worth retrying (rate limiting and transient server errors)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+# Class to manage a shared, pooled HTTP client for the car API
+class CarApiClient:
+    """
+    Thin wrapper around a requests.Session that keeps connections to the
+    upstream API alive between requests.
+
+    Parameters:
+        api_key (str): API Ninjas key sent in the X-Api-Key header
+        base_url (str): URL of the cars endpoint
+        pool_size (int): Maximum number of kept-alive connections to the upstream host
+        timeout (tuple): (connect, read) timeout in seconds for every request
+        retries (int): Number of retries for failed connections and retryable statuses
+        backoff (float): Backoff factor between retries (0.3 -> 0.3s, 0.6s, 1.2s, ...)
+        pooling (bool): When False every call opens a fresh connection (used for benchmarks)
+    """
+
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, pool_size=10,
+                 timeout=(3.05, 10), retries=3, backoff=0.3, pooling=True):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pooling = pooling
+        self.session = self._build_session() if pooling else None
+
+    @classmethod
+    def from_env(cls, api_key):
+        """
+        Builds a client using the CAR_API_* environment variables, falling back to defaults.
+
+        Parameters:
+            api_key (str): API Ninjas key
+
+        Returns:
+            CarApiClient: A configured client
+        """
+        return cls(
+            api_key,
+            base_url=os.getenv('CAR_API_URL', DEFAULT_BASE_URL),
+            pool_size=int(os.getenv('CAR_API_POOL_SIZE', 10)),
+            timeout=(float(os.getenv('CAR_API_CONNECT_TIMEOUT', 3.05)),
+                     float(os.getenv('CAR_API_READ_TIMEOUT', 10))),
+            retries=int(os.getenv('CAR_API_RETRIES', 3)),
+            backoff=float(os.getenv('CAR_API_BACKOFF', 0.3)),
+            pooling=os.getenv('CAR_API_POOLING', '1') != '0',
+        )
+
+    def _retry_policy(self):
+        # Retry GETs on connection errors and retryable statuses with exponential backoff
+        return Retry(total=self.retries, backoff_factor=self.backoff,
+                     status_forcelist=RETRY_STATUSES, allowed_methods=frozenset(['GET']),
+                     raise_on_status=False)
+
+    def _build_session(self):
+        session = requests.Session()
+        session.headers.update({'X-Api-Key': self.api_key})
+        # pool_block=True bounds concurrency: callers wait for a free connection
+        # instead of opening extra ones beyond pool_size
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size,
+                              max_retries=self._retry_policy(), pool_block=True)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_json(self, params):
+        """
+        Performs a GET against the cars endpoint.
+
+        Parameters:
+            params (dict): Query string parameters (make, model, year, ...)
+
+        Returns:
+            list: Decoded JSON body, or None if the request failed
+        """
+        try:
+            if self.session is not None:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            else:
+                # Unpooled path: a throwaway session so retries still apply
+                with requests.Session() as session:
+                    session.mount('https://', HTTPAdapter(max_retries=self._retry_policy()))
+                    session.mount('http://', HTTPAdapter(max_retries=self._retry_policy()))
+                    response = session.get(self.base_url, params=params, timeout=self.timeout,
+                                           headers={'X-Api-Key': self.api_key})
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:  # Check if the API request was successful
+            return None
+        return response.json()
+
+    def close(self):
+        """Closes all pooled connections."""
+        if self.session is not None:
+            self.session.close()
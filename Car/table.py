@@ -0,0 +1,132 @@
+# Preferred order of the columns returned by the car API; unknown columns follow in arrival order
+COLUMN_ORDER = [
+    'make', 'model', 'year', 'class', 'fuel_type', 'drive', 'transmission',
+    'cylinders', 'displacement', 'city_mpg', 'highway_mpg', 'combination_mpg',
+]
+
+# Human-readable column headings
+COLUMN_LABELS = {
+    'make': 'Make',
+    'model': 'Model',
+    'year': 'Year',
+    'class': 'Class',
+    'fuel_type': 'Fuel Type',
+    'drive': 'Drive',
+    'transmission': 'Transmission',
+    'cylinders': 'Cylinders',
+    'displacement': 'Displacement',
+    'city_mpg': 'City MPG',
+    'highway_mpg': 'Highway MPG',
+    'combination_mpg': 'Combined MPG',
+}
+
+# Units appended to numeric values
+UNITS = {
+    'displacement': ' L',
+    'city_mpg': ' mpg',
+    'highway_mpg': ' mpg',
+    'combination_mpg': ' mpg',
+}
+
+# Expanded values for coded fields
+TRANSMISSIONS = {'a': 'Automatic', 'm': 'Manual'}
+
+
+# Function to format a single cell for display
+def format_value(column, value):
+    """
+    Formats a value for display, adding units to numeric fields.
+
+    Parameters:
+        column (str): Column name
+        value: Raw value from the API
+
+    Returns:
+        str: Display text for the cell
+    """
+    if value is None:
+        return ''
+    if column == 'transmission':
+        return TRANSMISSIONS.get(value, value)
+    if column == 'drive':
+        return str(value).upper()  # e.g. fwd -> FWD
+    if column in ('make', 'model'):
+        return str(value).title()
+    if isinstance(value, (int, float)) and column in UNITS:
+        return f"{value:g}{UNITS[column]}"
+    return str(value)
+
+
+# Function to work out the column order for a list of records
+def order_columns(records, columns=None):
+    """
+    Returns the columns to display, in COLUMN_ORDER first and then in arrival order.
+
+    Parameters:
+        records (list): List of dictionaries containing car details
+        columns (list): Optional explicit column list
+
+    Returns:
+        list: Column names
+    """
+    if columns:
+        return list(columns)
+    seen = {}
+    for record in records:
+        for column in record:
+            seen.setdefault(column, None)
+    ordered = [column for column in COLUMN_ORDER if column in seen]
+    return ordered + [column for column in seen if column not in COLUMN_ORDER]
+
+
+# Class describing a table that templates render row by row
+class Table:
+    """
+    Lightweight table for a list of dicts. Rows are produced lazily while the
+    template iterates, so no intermediate frame or HTML string is built.
+
+    Parameters:
+        records (list): List of dictionaries containing car details
+        columns (list): Optional explicit column list
+    """
+
+    def __init__(self, records, columns=None):
+        self.records = records or []
+        self.columns = order_columns(self.records, columns)
+
+    @property
+    def headers(self):
+        """Display headings for the columns."""
+        return [COLUMN_LABELS.get(column, column.replace('_', ' ').title()) for column in self.columns]
+
+    @property
+    def rows(self):
+        """Yields one list of formatted cells per record."""
+        for record in self.records:
+            yield [format_value(column, record.get(column)) for column in self.columns]
+
+    def __bool__(self):
+        return bool(self.records)
+
+
+# Function to lay out a comparison as rows of formatted cells
+def comparison_rows(comparison):
+    """
+    Yields one row per spec field for the merged comparison table.
+
+    Parameters:
+        comparison (dict): Result of comparison.build_comparison
+
+    Yields:
+        tuple: (heading, cells) where each cell is (text, is_best)
+    """
+    for entry in comparison['fields']:
+        field = entry['field']
+        deltas = entry.get('deltas') or [None] * len(entry['values'])
+        cells = []
+        for value, delta in zip(entry['values'], deltas):
+            text = format_value(field, value)
+            if delta:  # Show how far behind the best value this car is
+                text += f" ({delta:+g})"
+            cells.append((text, 'best' in entry and value == entry['best']))
+        yield COLUMN_LABELS.get(field, field.replace('_', ' ').title()), cells
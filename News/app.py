@@ -1,7 +1,10 @@
-from flask import Flask, render_template, request
-import requests
+from flask import Flask, render_template, request, jsonify
 from dotenv import load_dotenv
 import os
+from http_client import NewsApiClient
+from cache import HeadlineCache
+from feed import aggregate
+from search_index import ArticleIndex
 
 # Load environment variables from .env file
 load_dotenv()
@@ -11,14 +14,122 @@ app = Flask(__name__)
 # Retrieve the API key from environment variables
 API_KEY = os.getenv('API_KEY')
 
+# Shared client with pooled connections, strict timeouts and a circuit breaker
+client = NewsApiClient.from_env(API_KEY)
+
+# Headlines per (country, category), served stale while a background refresh runs
+cache = HeadlineCache.from_env()
+
+# Local full-text index of every article fetched (None if NEWS_INDEX_DB is empty)
+article_index = ArticleIndex.from_env()
+
+# Articles per page; NewsAPI allows at most 100
+PAGE_SIZE = int(os.getenv('NEWS_PAGE_SIZE', 20))
+MAX_PAGE_SIZE = 100
+
+# Whether to fetch the next page in the background after serving a page
+PREFETCH_NEXT_PAGE = os.getenv('NEWS_PREFETCH_NEXT_PAGE', '0') == '1'
+
+def fetch_headlines(country, category, page=1, page_size=PAGE_SIZE):
+    """Fetches headlines from NewsAPI; returns None if only a fallback payload was available."""
+    payload, stale = client.top_headlines(country=country, category=category, page=page, pageSize=page_size)
+    if stale:
+        return None
+    if article_index is not None:
+        article_index.ingest(payload.get('articles', []))  # Queued; written in the background
+    return payload
+
+async def afetch_headlines(country, category, page=1, page_size=PAGE_SIZE):
+    """Async fetch_headlines for the ASGI entry point, through the event loop's aiohttp client."""
+    payload, stale = await client.async_client().top_headlines(
+        country=country, category=category, page=page, pageSize=page_size)
+    if stale:
+        return None
+    if article_index is not None:
+        article_index.ingest(payload.get('articles', []))  # Queued; written in the background
+    return payload
+
+def get_headlines(country, category, page, page_size):
+    """Returns (payload, stale) for one page of headlines, using the cache when possible."""
+    key = (country, category, str(page), str(page_size))
+    payload = cache.get(key, lambda: fetch_headlines(country, category, page, page_size))
+    if payload is None:
+        # Nothing cached and NewsAPI is failing: fall back to the client's last good payload
+        return client.last_good(country=country, category=category, page=page, pageSize=page_size), True
+    if PREFETCH_NEXT_PAGE and page * page_size < payload.get('totalResults', 0):
+        next_key = (country, category, str(page + 1), str(page_size))
+        cache.prefetch(next_key, lambda: fetch_headlines(country, category, page + 1, page_size))
+    return payload, False
+
+async def aget_headlines(country, category, page, page_size):
+    """Async get_headlines for the ASGI entry point; the cache is shared with the WSGI views."""
+    key = (country, category, str(page), str(page_size))
+    payload = await cache.aget(key, lambda: afetch_headlines(country, category, page, page_size))
+    if payload is None:
+        return client.last_good(country=country, category=category, page=page, pageSize=page_size), True
+    if PREFETCH_NEXT_PAGE and page * page_size < payload.get('totalResults', 0):
+        next_key = (country, category, str(page + 1), str(page_size))
+        cache.aprefetch(next_key, lambda: afetch_headlines(country, category, page + 1, page_size))
+    return payload, False
+
+def read_query(args):
+    """Reads country, category, page and pageSize from query-string arguments (a MultiDict)."""
+    category = args.get('category', 'general')
+    country = args.get('country', 'us')
+    page = max(args.get('page', 1, type=int), 1)
+    page_size = min(max(args.get('pageSize', PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    return country, category, page, page_size
+
+def render_index(country, category, page, page_size, payload, stale):
+    """Renders the headlines page for one page of headlines."""
+    articles = payload.get('articles', [])
+    has_more = page * page_size < payload.get('totalResults', 0)
+    return render_template('index.html', articles=articles, category=category, country=country, stale=stale,
+                           page=page, page_size=page_size, has_more=has_more)
+
+def articles_batch(page, page_size, payload, stale):
+    """Returns the JSON response for one batch of articles."""
+    has_more = page * page_size < payload.get('totalResults', 0)
+    return jsonify(articles=payload.get('articles', []), page=page, pageSize=page_size,
+                   nextPage=page + 1 if has_more else None, stale=stale)
+
 @app.route('/', methods=['GET'])
 def index():
-    category = request.args.get('category', 'general')
-    country = request.args.get('country', 'us')
-    url = f'https://newsapi.org/v2/top-headlines?country={country}&category={category}&apiKey={API_KEY}'
-    response = requests.get(url)
-    articles = response.json().get('articles', [])
-    return render_template('index.html', articles=articles, category=category, country=country)
+    country, category, page, page_size = read_query(request.args)
+    payload, stale = get_headlines(country, category, page, page_size)
+    return render_index(country, category, page, page_size, payload, stale)
+
+@app.route('/api/articles', methods=['GET'])
+def api_articles():
+    # One batch of articles for incremental loading on scroll
+    country, category, page, page_size = read_query(request.args)
+    payload, stale = get_headlines(country, category, page, page_size)
+    return articles_batch(page, page_size, payload, stale)
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    # Hit ratio and entry ages, for tuning NEWS_CACHE_TTL against API quota
+    return jsonify(cache.stats())
+
+@app.route('/api/feed', methods=['GET'])
+def api_feed():
+    # Combined feed across every requested country/category pair, e.g.
+    # /api/feed?country=us&country=gb&category=business&category=technology
+    countries = request.args.getlist('country') or ['us']
+    categories = request.args.getlist('category') or ['general']
+    pairs = [(country, category) for country in countries for category in categories]
+    page_size = min(max(request.args.get('pageSize', PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    result = aggregate(lambda country, category: get_headlines(country, category, 1, page_size), pairs)
+    return jsonify(result)
+
+@app.route('/api/search', methods=['GET'])
+def api_search():
+    # Keyword search over title, description and source of previously fetched articles
+    if article_index is None:
+        return jsonify(error='Search index is disabled.'), 404
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    return jsonify(query=query, articles=article_index.search(query, limit))
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,70 @@
+"""
+ASGI entry point for the News app, for serving with an event-loop server:
+
+    uvicorn asgi:application
+
+The headline routes, / and /api/articles, run as async handlers. They call
+NewsAPI through an aiohttp client, one per event loop, so a slow or hung
+upstream holds a coroutine instead of a worker thread for the read timeout.
+They share the headline cache, circuit breaker and last good payloads with
+the WSGI views. Every other route is served by the Flask app through
+asgiref's WSGI adapter.
+"""
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.datastructures import MultiDict
+
+from app import aget_headlines, app, articles_batch, client, read_query, render_index
+
+# The Flask app, for every route without an async handler
+flask_application = WsgiToAsgi(app)
+
+
+async def index(args):
+    country, category, page, page_size = read_query(args)
+    payload, stale = await aget_headlines(country, category, page, page_size)
+    with app.app_context():
+        return app.make_response(render_index(country, category, page, page_size, payload, stale))
+
+
+async def api_articles(args):
+    # One batch of articles for incremental loading on scroll
+    country, category, page, page_size = read_query(args)
+    payload, stale = await aget_headlines(country, category, page, page_size)
+    with app.app_context():
+        return articles_batch(page, page_size, payload, stale)
+
+
+# Async handlers by path; only GET is served asynchronously
+ROUTES = {'/': index, '/api/articles': api_articles}
+
+
+async def lifespan(receive, send):
+    # Close the worker's pooled upstream connections when the server shuts down
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await client.close_async_client()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    handler = ROUTES.get(scope.get('path')) if scope['type'] == 'http' and scope['method'] == 'GET' else None
+    if handler is None:
+        await flask_application(scope, receive, send)
+        return
+    args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+    response = await handler(args)
+    body = response.get_data()
+    headers = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+               for name, value in response.headers.items() if name.lower() != 'content-length']
+    headers.append((b'content-length', str(len(body)).encode()))
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,274 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Class tracking one load of a cache key, waited for by threads and coroutines alike
+class PendingLoad:
+    """
+    A load or refresh in progress. Threads wait on a threading.Event; coroutines wait
+    on a future of their own event loop, resolved when the load finishes, so waiting
+    holds neither a thread nor an executor slot.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._futures = []  # (loop, future) of waiting coroutines
+        self._lock = threading.Lock()
+
+    def set(self):
+        """Marks the load as finished and wakes every waiter."""
+        with self._lock:
+            self._event.set()
+            futures, self._futures = self._futures, []
+        for loop, future in futures:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # The waiter's loop is closed; nobody is left to wake
+
+    def wait(self):
+        """Blocks the calling thread until the load finishes."""
+        self._event.wait()
+
+    async def wait_async(self):
+        """Waits on the running event loop until the load finishes."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._event.is_set():
+                return
+            future = loop.create_future()
+            self._futures.append((loop, future))
+        await future
+
+
+def _resolve(future):
+    if not future.done():  # A cancelled waiter's future is already done
+        future.set_result(None)
+
+
+# Class implementing a stale-while-revalidate cache for headline payloads
+class HeadlineCache:
+    """
+    Caches headline payloads per (country, category, page, pageSize).
+
+    Fresh entries (younger than ttl) are served directly. Stale entries are
+    served immediately while a single background refresh runs. Entries older
+    than max_stale, and missing entries, are loaded synchronously, with
+    concurrent requests for the same key sharing one load.
+
+    Parameters:
+        ttl (float): Seconds an entry is considered fresh
+        max_stale (float): Seconds after which a stale entry is no longer served
+        max_entries (int): Maximum number of keys kept (least recently used are dropped)
+    """
+
+    def __init__(self, ttl=300, max_stale=3600, max_entries=64):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, payload), least recently used first
+        self._inflight = {}  # key -> PendingLoad for loads and refreshes in progress
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='headline-refresh')
+        self._tasks = set()  # Background refreshes running on an event loop (aget, aprefetch)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.prefetches = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        """Builds a cache using the NEWS_CACHE_* environment variables."""
+        return cls(
+            ttl=float(os.getenv('NEWS_CACHE_TTL', 300)),
+            max_stale=float(os.getenv('NEWS_CACHE_MAX_STALE', 3600)),
+            max_entries=int(os.getenv('NEWS_CACHE_MAX_ENTRIES', 64)),
+        )
+
+    def _store(self, key, payload):
+        # Must be called with the lock held
+        self._entries[key] = (time.monotonic(), payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key, loader, event):
+        """Runs loader() and stores a successful result; always releases the key."""
+        payload = None
+        try:
+            payload = loader()
+        finally:
+            with self._lock:
+                if payload is not None:
+                    self._store(key, payload)
+                del self._inflight[key]
+            event.set()
+        return payload
+
+    def _refresh(self, key, loader, event):
+        payload = self._load(key, loader, event)
+        with self._lock:
+            if payload is None:
+                self.refresh_failures += 1  # Keep serving the stale entry
+
+    async def _aload(self, key, loader, event):
+        """Async _load: awaits loader(), a coroutine, and stores a successful result."""
+        payload = None
+        try:
+            payload = await loader()
+        finally:
+            with self._lock:
+                if payload is not None:
+                    self._store(key, payload)
+                del self._inflight[key]
+            event.set()
+        return payload
+
+    async def _arefresh(self, key, loader, event):
+        payload = await self._aload(key, loader, event)
+        with self._lock:
+            if payload is None:
+                self.refresh_failures += 1  # Keep serving the stale entry
+
+    def _spawn(self, coroutine):
+        """Runs a coroutine as a background task on the running event loop."""
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)  # Keep a reference until it finishes
+        task.add_done_callback(self._tasks.discard)
+
+    def _lookup(self, key, start_refresh):
+        """
+        Looks key up, starting a single-flight background refresh of a stale entry
+        with start_refresh(event).
+
+        Returns:
+            tuple: (payload, None, False) for a cached payload; otherwise (None, event, leader)
+                   where the leader must load the key and others wait for event
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.monotonic() - entry[0] if entry else None
+            if entry and age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], None, False
+            if entry and age < self.max_stale:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    event = self._inflight[key] = PendingLoad()
+                    self.refreshes += 1
+                    start_refresh(event)
+                return entry[1], None, False
+            self.misses += 1
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = PendingLoad()
+            return None, event, leader
+
+    def _loaded(self, key):
+        """Returns the payload another request loaded for key, or None if its load failed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry else None
+
+    def get(self, key, loader):
+        """
+        Returns the payload for key, loading or refreshing it as needed.
+
+        Parameters:
+            key (tuple): (country, category, page, pageSize)
+            loader (callable): Zero-argument function returning a payload, or None on failure
+
+        Returns:
+            dict: The payload, or None if nothing could be loaded
+        """
+        payload, event, leader = self._lookup(
+            key, lambda event: self._refresher.submit(self._refresh, key, loader, event))
+        if event is None:
+            return payload
+        if leader:
+            return self._load(key, loader, event)
+        # Another request is already loading this key; wait and share its result
+        event.wait()
+        return self._loaded(key)
+
+    async def aget(self, key, loader):
+        """
+        Async get, for the ASGI entry point: loader is a zero-argument function returning a
+        coroutine, and background refreshes run as tasks on the running event loop.
+
+        Returns:
+            dict: The payload, or None if nothing could be loaded
+        """
+        payload, event, leader = self._lookup(
+            key, lambda event: self._spawn(self._arefresh(key, loader, event)))
+        if event is None:
+            return payload
+        if leader:
+            return await self._aload(key, loader, event)
+        # Another request, possibly on a WSGI thread, is loading this key; wait on this loop
+        await event.wait_async()
+        return self._loaded(key)
+
+    def _claim(self, key):
+        """Marks key as loading and returns its event, or None if it is cached or already loading."""
+        with self._lock:
+            if key in self._entries or key in self._inflight:
+                return None
+            event = self._inflight[key] = PendingLoad()
+            self.prefetches += 1
+            return event
+
+    def prefetch(self, key, loader):
+        """
+        Loads key in the background if it is not cached or already loading.
+
+        Parameters:
+            key (tuple): Cache key
+            loader (callable): Zero-argument function returning a payload, or None on failure
+        """
+        event = self._claim(key)
+        if event is not None:
+            self._refresher.submit(self._load, key, loader, event)
+
+    def aprefetch(self, key, loader):
+        """prefetch for a coroutine loader, as a task on the running event loop."""
+        event = self._claim(key)
+        if event is not None:
+            self._spawn(self._aload(key, loader, event))
+
+    def stats(self):
+        """
+        Returns hit-ratio and age metrics for tuning the TTL.
+
+        Returns:
+            dict: Counters, hit ratio and the age in seconds of every cached key
+        """
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            now = time.monotonic()
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'prefetches': self.prefetches,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'ages': {'/'.join(key): round(now - stored_at, 1)
+                         for key, (stored_at, _) in self._entries.items()},
+            }
@@ -0,0 +1,91 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Seconds to wait for all feeds of an aggregated request
+FEED_DEADLINE = float(os.getenv('NEWS_FEED_DEADLINE', 3))
+
+# Maximum number of (country, category) pairs per aggregated request
+MAX_FEEDS = int(os.getenv('NEWS_FEED_MAX_PAIRS', 28))
+
+# Shared worker pool so threads are reused across requests
+_executor = ThreadPoolExecutor(max_workers=MAX_FEEDS, thread_name_prefix='news-feed')
+
+
+# Function to build the identity used to detect duplicate articles
+def article_keys(article):
+    """
+    Returns the keys identifying an article: its URL and a hash of its normalised title.
+
+    Parameters:
+        article (dict): Article from NewsAPI
+
+    Returns:
+        list: Non-empty identity keys
+    """
+    keys = []
+    if article.get('url'):
+        keys.append('url:' + article['url'])
+    title = ' '.join((article.get('title') or '').lower().split())
+    if title:
+        keys.append('title:' + hashlib.sha1(title.encode('utf-8')).hexdigest())
+    return keys
+
+
+# Function to fetch several feeds in parallel and merge them
+def aggregate(fetch, pairs, deadline=FEED_DEADLINE, max_feeds=MAX_FEEDS):
+    """
+    Fetches every (country, category) pair concurrently, then merges the
+    articles newest first and drops duplicates by URL or title.
+
+    Feeds that fail or miss the deadline are left out and reported instead of
+    blocking the response. Pairs beyond max_feeds are not fetched and are
+    reported too.
+
+    Parameters:
+        fetch (callable): fetch(country, category) returning (payload, stale)
+        pairs (list): (country, category) tuples
+        deadline (float): Seconds to wait for all feeds
+        max_feeds (int): Maximum number of pairs fetched
+
+    Returns:
+        dict: {'articles': [...], 'feeds': [...], 'missing': [...]} where each
+              feed entry has country, category, status ('ok', 'stale', 'error',
+              'timeout' or 'over limit') and the number of articles it contributed
+    """
+    pairs, skipped = pairs[:max_feeds], pairs[max_feeds:]
+    futures = [_executor.submit(fetch, country, category) for country, category in pairs]
+    wait(futures, timeout=deadline)
+
+    feeds, collected = [], []
+    for (country, category), future in zip(pairs, futures):
+        feed = {'country': country, 'category': category, 'articles': 0}
+        if not future.done():
+            future.cancel()  # Drop feeds that are still queued
+            feed['status'] = 'timeout'
+        elif future.exception() is not None:
+            feed['status'] = 'error'
+        else:
+            payload, stale = future.result()
+            articles = payload.get('articles', [])
+            feed['status'] = 'stale' if stale else 'ok'
+            feed['articles'] = len(articles)
+            for article in articles:
+                collected.append(dict(article, country=country, category=category))
+        feeds.append(feed)
+    for country, category in skipped:
+        feeds.append({'country': country, 'category': category, 'articles': 0, 'status': 'over limit'})
+
+    # ISO 8601 timestamps in UTC sort correctly as strings
+    collected.sort(key=lambda article: article.get('publishedAt') or '', reverse=True)
+    seen, merged = set(), []
+    for article in collected:
+        keys = article_keys(article)
+        if any(key in seen for key in keys):
+            continue
+        seen.update(keys)
+        merged.append(article)
+
+    missing = [{'country': feed['country'], 'category': feed['category'], 'status': feed['status']}
+               for feed in feeds if feed['status'] in ('error', 'timeout', 'over limit')]
+    return {'articles': merged, 'feeds': feeds, 'missing': missing}
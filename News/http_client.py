@@ -0,0 +1,265 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+import requests
+from requests.adapters import HTTPAdapter
+
+# Default location of the NewsAPI top-headlines endpoint (overridable for local testing)
+DEFAULT_BASE_URL = "https://newsapi.org/v2/top-headlines"
+
+
+# Class implementing a simple circuit breaker around upstream calls
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream for a while so requests fail fast instead
+    of each waiting for a timeout.
+
+    States:
+        closed: calls go through; consecutive failures are counted
+        open: calls are skipped until reset_timeout has passed
+        half-open: one trial call is let through; success closes the breaker
+
+    Parameters:
+        failure_threshold (int): Consecutive failures that open the breaker
+        reset_timeout (float): Seconds to stay open before allowing a trial call
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Current state: 'closed', 'open' or 'half-open'."""
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """Returns True if a call may be made now."""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_progress:
+                self._trial_in_progress = True  # Only one trial call at a time
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_progress = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()  # (Re)open the breaker
+
+
+# Class keeping the last good payload per request, shared by every thread and event loop
+class LastGoodPayloads:
+    """
+    Last successful payload per request parameters, served when NewsAPI fails.
+    Read and written by request, refresher and feed threads, so guarded by a lock.
+
+    Parameters:
+        max_entries (int): Bound on remembered payloads; the oldest is dropped first
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._payloads = {}  # Query parameters -> payload, oldest first
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the payload stored for key, or {}."""
+        with self._lock:
+            return self._payloads.get(key, {})
+
+    def put(self, key, payload):
+        with self._lock:
+            if key not in self._payloads and len(self._payloads) >= self.max_entries:
+                self._payloads.pop(next(iter(self._payloads)))  # Drop the oldest entry
+            self._payloads[key] = payload
+
+
+# Class to manage a shared, pooled HTTP client for NewsAPI
+class NewsApiClient:
+    """
+    Pooled client for the NewsAPI top-headlines endpoint with strict timeouts,
+    a circuit breaker, and a fallback to the last good payload per request.
+
+    Parameters:
+        api_key (str): NewsAPI key
+        base_url (str): URL of the top-headlines endpoint
+        pool_size (int): Maximum number of kept-alive connections to the upstream host
+        timeout (tuple): (connect, read) timeout in seconds for every request
+        breaker (CircuitBreaker): Breaker guarding the upstream
+    """
+
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, pool_size=10,
+                 timeout=(2, 5), breaker=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        self.session.headers.update({'X-Api-Key': api_key})
+        # Non-blocking pool: a burst beyond pool_size opens short-lived extra
+        # connections instead of making workers wait for a free one
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.fallbacks = LastGoodPayloads()
+        self._async_clients = weakref.WeakKeyDictionary()  # Event loop -> AsyncNewsApiClient
+
+    @classmethod
+    def from_env(cls, api_key):
+        """
+        Builds a client using the NEWS_API_* environment variables, falling back to defaults.
+
+        Parameters:
+            api_key (str): NewsAPI key
+
+        Returns:
+            NewsApiClient: A configured client
+        """
+        return cls(
+            api_key,
+            base_url=os.getenv('NEWS_API_URL', DEFAULT_BASE_URL),
+            pool_size=int(os.getenv('NEWS_API_POOL_SIZE', 10)),
+            timeout=(float(os.getenv('NEWS_API_CONNECT_TIMEOUT', 2)),
+                     float(os.getenv('NEWS_API_READ_TIMEOUT', 5))),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv('NEWS_API_BREAKER_FAILURES', 3)),
+                reset_timeout=float(os.getenv('NEWS_API_BREAKER_RESET', 30)),
+            ),
+        )
+
+    def top_headlines(self, **params):
+        """
+        Fetches top headlines, falling back to the last good payload when the
+        upstream fails or the circuit breaker is open.
+
+        Parameters:
+            **params: Query string parameters (country, category, ...)
+
+        Returns:
+            tuple: (payload dict, stale flag); payload is {} if nothing is available
+        """
+        key = self._key(params)
+        if self.breaker.allow():
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                response.raise_for_status()
+                payload = response.json()
+            except (requests.RequestException, ValueError):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+                self.fallbacks.put(key, payload)
+                return payload, False
+        return self.fallbacks.get(key), True
+
+    def last_good(self, **params):
+        """Returns the last successful payload for the parameters without calling upstream."""
+        return self.fallbacks.get(self._key(params))
+
+    def async_client(self):
+        """
+        Returns the async client of the running event loop, creating it on first use. Under an
+        ASGI server there is one loop per worker, so its connections are kept alive across requests.
+        It shares this client's circuit breaker and last good payloads.
+
+        Returns:
+            AsyncNewsApiClient: Client for the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = AsyncNewsApiClient(self)
+        return client
+
+    async def close_async_client(self):
+        """Closes the running event loop's async client, if it has one."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    @staticmethod
+    def _key(params):
+        return tuple(sorted(params.items()))
+
+    def close(self):
+        """Closes all pooled connections."""
+        self.session.close()
+
+
+# Class to call NewsAPI from an event loop, used by the ASGI entry point (asgi.py)
+# aiohttp is optional and only imported when an async client is created
+class AsyncNewsApiClient:
+    """
+    aiohttp client for the NewsAPI top-headlines endpoint with the same
+    settings, circuit breaker and fallbacks as a NewsApiClient. Its connections
+    belong to one event loop; use NewsApiClient.async_client() to get it.
+
+    Parameters:
+        client (NewsApiClient): Client whose settings, breaker and fallbacks are shared
+    """
+
+    def __init__(self, client):
+        import aiohttp
+
+        self.client = client
+        connect_timeout, read_timeout = client.timeout
+        self.session = aiohttp.ClientSession(
+            headers={'X-Api-Key': client.api_key},
+            connector=aiohttp.TCPConnector(limit=client.pool_size),
+            # Waiting for a free pooled connection counts against the read timeout
+            timeout=aiohttp.ClientTimeout(connect=read_timeout, sock_connect=connect_timeout,
+                                          sock_read=read_timeout),
+        )
+
+    async def top_headlines(self, **params):
+        """
+        Fetches top headlines as NewsApiClient.top_headlines does, without blocking the event loop.
+
+        Returns:
+            tuple: (payload dict, stale flag); payload is {} if nothing is available
+        """
+        import aiohttp
+
+        client = self.client
+        key = client._key(params)
+        if client.breaker.allow():
+            try:
+                async with self.session.get(client.base_url, params=params) as response:
+                    response.raise_for_status()
+                    payload = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                client.breaker.record_failure()
+            except asyncio.CancelledError:
+                client.breaker.record_failure()  # Frees a half-open trial call
+                raise
+            else:
+                client.breaker.record_success()
+                client.fallbacks.put(key, payload)
+                return payload, False
+        return client.fallbacks.get(key), True
+
+    async def aclose(self):
+        """Closes all pooled connections."""
+        await self.session.close()
@@ -0,0 +1,216 @@
+"""
+Load test for the News app against a local fake of the NewsAPI endpoint.
+
+Starts the fake upstream and the app on local ports, then drives the app with
+concurrent clients and reports throughput and latency. The app is served by a
+threaded WSGI server, or with --server asgi by uvicorn through asgi.py, whose
+headline routes are async.
+
+Usage:
+    python load_test.py [--clients 20] [--duration 5] [--latency 0.05] [--server wsgi|asgi]
+
+Scenarios:
+    waiters   more coroutines wait for one cold key than the event loop's
+              executor has threads, while the loading request needs the
+              executor itself (as aiohttp does to resolve DNS); all must
+              get the payload, so waiting must not hold executor threads
+    healthy   upstream answers after --latency seconds
+    hung      upstream stops answering for longer than the read timeout; the
+              circuit breaker opens and the last good payload is served
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configure the app before it is imported
+os.environ.setdefault('API_KEY', 'load-test')
+os.environ.setdefault('NEWS_API_READ_TIMEOUT', '0.5')
+os.environ.setdefault('NEWS_API_BREAKER_RESET', '2')
+# Disable headline caching so requests exercise the upstream path
+os.environ.setdefault('NEWS_CACHE_TTL', '0')
+os.environ.setdefault('NEWS_CACHE_MAX_STALE', '0')
+# Do not write a search index during the load test
+os.environ.setdefault('NEWS_INDEX_DB', '')
+
+# Sample article returned by the fake upstream
+ARTICLE = {
+    "source": {"id": None, "name": "Load Test News"},
+    "author": "Load Tester",
+    "title": "Example headline",
+    "description": "Example description of the article.",
+    "url": "https://example.com/article",
+    "urlToImage": None,
+    "publishedAt": "2025-01-05T10:00:00Z",
+    "content": "Example content.",
+}
+
+
+# Request handler that mimics /v2/top-headlines with injectable latency
+class FakeUpstream(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Allow keep-alive connections
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls on kept-alive connections
+    latency = 0.05  # Seconds before answering; changed per scenario
+
+    def do_GET(self):
+        time.sleep(type(self).latency)
+        body = json.dumps({"status": "ok", "totalResults": 20, "articles": [ARTICLE] * 20}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep load test output clean
+
+
+def start_server(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_asgi_server():
+    """Serves asgi.py with uvicorn (one event loop) in a background thread and waits until it listens."""
+    import uvicorn
+    from asgi import application
+
+    server = uvicorn.Server(uvicorn.Config(application, host='127.0.0.1', port=0, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def check_cache_waiters(waiters=64, executor_threads=4, timeout=5):
+    """
+    Runs the waiters scenario against a HeadlineCache on a fresh event loop.
+
+    Returns:
+        bool: Whether every waiter got the payload within timeout seconds
+    """
+    from cache import HeadlineCache
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=executor_threads))
+        cache = HeadlineCache()
+        release = asyncio.Event()
+
+        async def loader():
+            await release.wait()
+            await loop.run_in_executor(None, time.sleep, 0)  # Stands in for aiohttp's DNS lookup
+            return {'articles': [ARTICLE]}
+
+        key = ('us', 'general', 1, 20)
+        leader = asyncio.ensure_future(cache.aget(key, loader))
+        await asyncio.sleep(0)  # The leader claims the key first
+        others = [asyncio.ensure_future(cache.aget(key, loader)) for _ in range(waiters)]
+        await asyncio.sleep(0.1)  # Every waiter is waiting
+        release.set()
+        payloads = await asyncio.wait_for(asyncio.gather(leader, *others), timeout)
+        return all(payload is not None for payload in payloads)
+
+    try:
+        return asyncio.run(scenario())
+    except asyncio.TimeoutError:
+        return False
+
+
+def percentile(samples, pct):
+    """Returns the pct-th percentile of a list of samples (nearest rank)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def drive(url, clients, duration):
+    """
+    Runs clients threads requesting url for duration seconds.
+
+    Returns:
+        list: Latencies in milliseconds of all completed requests
+    """
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            with urllib.request.urlopen(url, timeout=60) as response:
+                response.read()
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def report(label, latencies, duration):
+    if not latencies:
+        print(f"{label:<10} no requests completed")
+        return
+    print(f"{label:<10} {len(latencies) / duration:8.1f} req/s  "
+          f"p50={percentile(latencies, 50):8.2f} ms  p99={percentile(latencies, 99):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi')
+    args = parser.parse_args()
+
+    waiters_ok = check_cache_waiters()
+    print(f"{'waiters':<10} {'ok' if waiters_ok else 'FAILED: waiting coroutines starved the event loop executor'}")
+
+    upstream = start_server(ThreadingHTTPServer(('127.0.0.1', 0), FakeUpstream))
+    os.environ['NEWS_API_URL'] = f"http://127.0.0.1:{upstream.server_port}/v2/top-headlines"
+
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    import app as news_app
+
+    # Request handler that does not log every request
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    if args.server == 'asgi':
+        server = start_asgi_server()
+        port = server.servers[0].sockets[0].getsockname()[1]
+    else:
+        server = start_server(make_server('127.0.0.1', 0, news_app.app, threaded=True, request_handler=QuietHandler))
+        port = server.server_port
+    url = f"http://127.0.0.1:{port}/?country=us&category=general"
+
+    FakeUpstream.latency = args.latency
+    report('healthy', drive(url, args.clients, args.duration), args.duration)
+
+    # Upstream hangs past the read timeout: after a few failures the breaker
+    # opens and workers answer from the last good payload without waiting
+    FakeUpstream.latency = 30
+    report('hung', drive(url, args.clients, args.duration), args.duration)
+    print(f"breaker state: {news_app.client.breaker.state}")
+
+    if args.server == 'asgi':
+        server.should_exit = True
+    else:
+        server.shutdown()
+    upstream.shutdown()
+    if not waiters_ok:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+# Words (letters and digits) extracted from a search query
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+# Function to turn free text into a safe FTS5 query
+def build_match_query(text):
+    """
+    Converts user input into an FTS5 query where every word must match, the
+    last one as a prefix (so "clim" finds "climate").
+
+    Parameters:
+        text (str): Raw search input
+
+    Returns:
+        str: FTS5 MATCH expression, or '' if the input has no words
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return ''
+    quoted = [f'"{token}"' for token in tokens]  # Quoting disables FTS5 operators
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+# Class wrapping a local full-text index of fetched articles
+class ArticleIndex:
+    """
+    SQLite FTS5 index over article title, description and source name.
+
+    Articles are queued by ingest() and written in batches by a background
+    thread, so request handlers never wait on the database. Articles are
+    deduplicated by URL, and entries older than the retention period are
+    evicted, with an optional cap on the total number of rows.
+
+    Parameters:
+        path (str): SQLite database file
+        retention_days (float): Days an article is kept after it was last seen
+        max_articles (int): Maximum number of articles kept (oldest are evicted first)
+    """
+
+    def __init__(self, path, retention_days=30, max_articles=100000):
+        self.path = path
+        self.retention = retention_days * 86400
+        self.max_articles = max_articles
+        self._queue = queue.Queue()
+        self._writer = sqlite3.connect(path, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode = WAL")  # Readers are not blocked by the writer
+        self._create_schema()
+        self._local = threading.local()
+        threading.Thread(target=self._write_loop, name='article-index', daemon=True).start()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Opens the index named by NEWS_INDEX_DB.
+
+        Returns:
+            ArticleIndex: The index, or None if NEWS_INDEX_DB is set to an empty value
+        """
+        path = os.getenv('NEWS_INDEX_DB', 'articles.sqlite3')
+        if not path:
+            return None
+        return cls(path,
+                   retention_days=float(os.getenv('NEWS_INDEX_RETENTION_DAYS', 30)),
+                   max_articles=int(os.getenv('NEWS_INDEX_MAX_ARTICLES', 100000)))
+
+    def _create_schema(self):
+        self._writer.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                title TEXT,
+                description TEXT,
+                source TEXT,
+                image_url TEXT,
+                published_at TEXT,
+                seen_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS articles_seen_at ON articles (seen_at);
+
+            -- External-content FTS table kept in sync by triggers
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, description, source, content='articles', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, description, source)
+                VALUES (new.id, new.title, new.description, new.source);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, description, source)
+                VALUES ('delete', old.id, old.title, old.description, old.source);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, description, source ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, description, source)
+                VALUES ('delete', old.id, old.title, old.description, old.source);
+                INSERT INTO articles_fts (rowid, title, description, source)
+                VALUES (new.id, new.title, new.description, new.source);
+            END;
+        """)
+
+    def ingest(self, articles):
+        """
+        Queues articles for indexing without blocking.
+
+        Parameters:
+            articles (list): Articles as returned by NewsAPI
+        """
+        if articles:
+            self._queue.put(list(articles))
+
+    def _write_loop(self):
+        while True:
+            batches = [self._queue.get()]
+            # Drain whatever else is queued so it is written in one transaction
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write([article for batch in batches for article in batch])
+            except sqlite3.Error:
+                pass  # Indexing is best effort; the page was already served
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+    def _write(self, articles):
+        now = time.time()
+        rows = [(
+            article['url'],
+            article.get('title'),
+            article.get('description'),
+            (article.get('source') or {}).get('name'),
+            article.get('urlToImage'),
+            article.get('publishedAt'),
+            now,
+        ) for article in articles if article.get('url')]
+        with self._writer:
+            # Incremental update: new URLs are inserted, known ones refreshed in place
+            self._writer.executemany("""
+                INSERT INTO articles (url, title, description, source, image_url, published_at, seen_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    title = excluded.title, description = excluded.description,
+                    source = excluded.source, image_url = excluded.image_url,
+                    published_at = excluded.published_at, seen_at = excluded.seen_at
+            """, rows)
+            self._evict(now)
+
+    def _evict(self, now):
+        # Retention by age, then by count, both served by the seen_at index
+        self._writer.execute("DELETE FROM articles WHERE seen_at < ?", (now - self.retention,))
+        self._writer.execute("""
+            DELETE FROM articles WHERE id IN (
+                SELECT id FROM articles ORDER BY seen_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_articles,))
+
+    def flush(self):
+        """Blocks until all queued articles have been written."""
+        self._queue.join()
+
+    def _reader(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path)
+        return conn
+
+    def search(self, text, limit=20):
+        """
+        Finds articles whose title, description or source match all words of text.
+
+        Parameters:
+            text (str): Search input
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Articles in NewsAPI shape, best matches first
+        """
+        match = build_match_query(text)
+        if not match:
+            return []
+        rows = self._reader().execute("""
+            SELECT a.url, a.title, a.description, a.source, a.image_url, a.published_at
+            FROM articles_fts JOIN articles AS a ON a.id = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+            ORDER BY bm25(articles_fts, 5.0, 1.0, 2.0)
+            LIMIT ?
+        """, (match, int(limit))).fetchall()
+        return [{
+            'url': url,
+            'title': title,
+            'description': description,
+            'source': {'id': None, 'name': source},
+            'urlToImage': image_url,
+            'publishedAt': published_at,
+        } for url, title, description, source, image_url, published_at in rows]
@@ -0,0 +1,226 @@
+"""
+Many headless Pong games stepped together with NumPy.
+
+BatchGame holds the state of n games in arrays and advances all of them by
+one tick per step, with the same physics as pong.Game: given the same
+actions, every game follows the same ticks as a pong.Game would. Games that
+are won restart on the next step, so the batch can be stepped indefinitely.
+"""
+import numpy as np  # Importing NumPy for batched games
+
+from pong import (
+    BALL_RADIUS, DOWN, HEIGHT, MAX_BOUNCES, PADDLE_HEIGHT, PADDLE_MARGIN, PADDLE_WIDTH, SIDE_NORMALS, UP, WIDTH,
+    WINNING_SCORE, Ball, Paddle,
+)
+
+# Ball and paddle starting positions, as in pong.Game
+BALL_X, BALL_Y = WIDTH // 2, HEIGHT // 2
+PADDLE_Y = HEIGHT // 2 - PADDLE_HEIGHT // 2
+LEFT_PADDLE_X = PADDLE_MARGIN
+RIGHT_PADDLE_X = WIDTH - PADDLE_MARGIN - PADDLE_WIDTH
+
+# What each ball bounced off in BatchGame.move_balls
+NO_HIT, WALL_HIT, LEFT_HIT, RIGHT_HIT = 0, 1, 2, 3
+
+# Outward normals of the sides of a box, by side (pong.SIDE_NORMALS)
+SIDE_NORMALS_X, SIDE_NORMALS_Y = np.array(SIDE_NORMALS, dtype=np.float64).T
+
+
+# Many games of Pong, advanced one tick at a time
+class BatchGame:
+    def __init__(self, games, ball_speed=Ball.MAX_VEL):
+        """
+        :param games: Number of games
+        :param ball_speed: Ball speed in pixels per tick, as in pong.Game
+        """
+        self.games = games
+        self.ball_speed = ball_speed
+        self.ball_x = np.full(games, BALL_X, dtype=np.float64)
+        self.ball_y = np.full(games, BALL_Y, dtype=np.float64)
+        self.ball_x_vel = np.full(games, ball_speed, dtype=np.float64)
+        self.ball_y_vel = np.zeros(games, dtype=np.float64)
+        self.left_y = np.full(games, PADDLE_Y, dtype=np.int64)
+        self.right_y = np.full(games, PADDLE_Y, dtype=np.int64)
+        self.left_score = np.zeros(games, dtype=np.int64)
+        self.right_score = np.zeros(games, dtype=np.int64)
+        self.ticks = np.zeros(games, dtype=np.int64)  # Ticks played since each game started
+
+    def step(self, left_actions, right_actions):
+        """
+        Advance every game by one tick.
+        :param left_actions: Array of UP, STAY or DOWN for the left paddle of every game
+        :param right_actions: Array of UP, STAY or DOWN for the right paddle of every game
+        :return: (scored, won): arrays with +1 where the left player scored (won) on this tick,
+                 -1 where the right player did and 0 elsewhere. Won games show their final
+                 scores until the next step, which restarts them.
+        """
+        self.reset(self.winners() != 0)  # Games won on the previous tick
+
+        move_paddles(self.left_y, left_actions)
+        move_paddles(self.right_y, right_actions)
+
+        self.move_balls()
+        self.ticks += 1
+
+        # Update scores and reset balls on scoring
+        right_scored = self.ball_x < 0
+        left_scored = self.ball_x > WIDTH
+        self.right_score += right_scored
+        self.left_score += left_scored
+        self.reset_balls(right_scored | left_scored)
+        scored = left_scored.astype(np.int8) - right_scored
+        return scored, self.winners()
+
+    def move_balls(self):
+        """Move the balls through one tick with swept collisions, as pong.move_ball does."""
+        radius = BALL_RADIUS
+        games = slice(None)  # Games whose ball is still moving in this tick: all, then those that bounced
+        remaining = 1.0  # Fraction of the tick each of them still has to move
+        reduction_factor = (PADDLE_HEIGHT / 2) / self.ball_speed
+        for _ in range(MAX_BOUNCES):
+            x, y = self.ball_x[games], self.ball_y[games]
+            x_vel, y_vel = self.ball_x_vel[games], self.ball_y_vel[games]
+            dx, dy = x_vel * remaining, y_vel * remaining
+            end_x, end_y = x + dx, y + dy
+
+            # Earliest contact: top or bottom wall, then each paddle (infinite for none)
+            t = np.full(len(x), np.inf)
+            hit = np.full(len(x), NO_HIT, dtype=np.int8)
+            walls = np.flatnonzero(((dy < 0) & (end_y - radius <= 0)) | ((dy > 0) & (end_y + radius >= HEIGHT)))
+            wall_y, wall_dy = y[walls], dy[walls]
+            t[walls] = np.maximum(0.0, np.where(wall_dy < 0, radius - wall_y, HEIGHT - radius - wall_y) / wall_dy)
+            hit[walls] = WALL_HIT
+
+            normal_x, normal_y = np.zeros(len(x)), np.zeros(len(x))
+            low_x, high_x = np.minimum(x, end_x), np.maximum(x, end_x)
+            for paddle_hit, paddle_x, paddle_y in ((LEFT_HIT, LEFT_PADDLE_X, self.left_y),
+                                                   (RIGHT_HIT, RIGHT_PADDLE_X, self.right_y)):
+                # Only balls within reach of the paddle, as in pong.sweep_circle
+                near = np.flatnonzero((low_x <= paddle_x + PADDLE_WIDTH + radius) & (high_x >= paddle_x - radius))
+                near_y = paddle_y[games][near]
+                near = near[(np.minimum(y[near], end_y[near]) <= near_y + PADDLE_HEIGHT + radius)
+                            & (np.maximum(y[near], end_y[near]) >= near_y - radius)]
+                if not len(near):
+                    continue
+                near_y = paddle_y[games][near]
+                contact_t, contact_x, contact_y = sweep_circles(
+                    x[near], y[near], dx[near], dy[near], radius,
+                    paddle_x, near_y, paddle_x + PADDLE_WIDTH, near_y + PADDLE_HEIGHT,
+                )
+                first = contact_t < t[near]
+                hits = near[first]
+                t[hits], hit[hits] = contact_t[first], paddle_hit
+                normal_x[hits], normal_y[hits] = contact_x[first], contact_y[first]
+
+            # Move all the way, or up to the contact and bounce
+            bounced = np.flatnonzero(hit != NO_HIT)
+            t = t[bounced]
+            end_x[bounced] = x[bounced] + dx[bounced] * t
+            end_y[bounced] = y[bounced] + dy[bounced] * t
+            self.ball_x[games], self.ball_y[games] = end_x, end_y
+            if not len(bounced):
+                break
+            games = bounced if isinstance(games, slice) else games[bounced]
+            remaining = remaining[bounced] if isinstance(remaining, np.ndarray) else np.full(len(bounced), remaining)
+            remaining -= remaining * t
+            y, hit = end_y[bounced], hit[bounced]
+            x_vel, y_vel = x_vel[bounced], y_vel[bounced]
+            normal_x, normal_y = normal_x[bounced], normal_y[bounced]
+
+            wall = hit == WALL_HIT
+            facing = ~wall & (normal_x * x_vel < 0)  # Side of the paddle facing the ball
+            reflected = ~wall & ~facing  # Top or bottom of the paddle
+            middle_y = np.where(hit == LEFT_HIT, self.left_y[games], self.right_y[games]) + PADDLE_HEIGHT / 2
+            along = x_vel * normal_x + y_vel * normal_y
+            self.ball_x_vel[games] = np.where(reflected, np.copysign(x_vel, x_vel - 2 * along * normal_x),
+                                              np.where(facing, -x_vel, x_vel))
+            self.ball_y_vel[games] = np.where(reflected, y_vel - 2 * along * normal_y, np.where(
+                facing, -1 * ((middle_y - y) / reduction_factor), np.where(wall, -y_vel, y_vel)))
+
+    def winners(self):
+        """Return an array with +1 for games the left player has won, -1 for the right player, else 0."""
+        return (self.left_score >= WINNING_SCORE).astype(np.int8) - (self.right_score >= WINNING_SCORE)
+
+    def reset_balls(self, games):
+        """Put the balls of some games back in the middle, served the other way (Ball.reset)."""
+        self.ball_x[games] = BALL_X
+        self.ball_y[games] = BALL_Y
+        self.ball_y_vel[games] = 0
+        self.ball_x_vel[games] = -np.copysign(self.ball_speed, self.ball_x_vel[games])
+
+    def reset(self, games):
+        """Start new games (Game.reset) where games is True."""
+        if not games.any():
+            return
+        self.reset_balls(games)
+        self.left_y[games] = PADDLE_Y
+        self.right_y[games] = PADDLE_Y
+        self.left_score[games] = 0
+        self.right_score[games] = 0
+        self.ticks[games] = 0
+
+    def track_ball(self, paddle_y, dead_zone=PADDLE_HEIGHT // 4):
+        """Return the actions of pong.track_ball for paddles at paddle_y in every game."""
+        offset = self.ball_y - (paddle_y + PADDLE_HEIGHT / 2)
+        return (offset > dead_zone).astype(np.int8) - (offset < -dead_zone)
+
+
+# Function to move paddles by actions, keeping them inside the court (pong.handle_paddle_movement)
+def move_paddles(paddle_y, actions):
+    paddle_y -= Paddle.VEL * ((actions == UP) & (paddle_y - Paddle.VEL >= 0))
+    paddle_y += Paddle.VEL * ((actions == DOWN) & (paddle_y + Paddle.VEL + PADDLE_HEIGHT <= HEIGHT))
+
+
+# Function to find when moving balls first touch boxes (pong.sweep_circle for arrays)
+def sweep_circles(x, y, dx, dy, radius, left, top, right, bottom):
+    """
+    :return: (t, normal_x, normal_y) arrays, with t infinite where a ball does not touch its box
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Already touching: the normal points from the nearest point of the box to the centre
+        offset_x = x - np.minimum(np.maximum(x, left), right)
+        offset_y = y - np.minimum(np.maximum(y, top), bottom)
+        distance = offset_x * offset_x + offset_y * offset_y
+        touching = distance <= radius * radius
+        side = np.stack([x - left, right - x, y - top, bottom - y]).argmin(axis=0)
+        inside = (offset_x == 0) & (offset_y == 0)
+        length = np.sqrt(distance)
+        touch_x = np.where(inside, SIDE_NORMALS_X[side], offset_x / length)
+        touch_y = np.where(inside, SIDE_NORMALS_Y[side], offset_y / length)
+        approaching = dx * touch_x + dy * touch_y < 0
+
+        # Entry into the box grown by the radius, one axis at a time
+        t_enter, t_exit = np.zeros(len(x)), np.ones(len(x))
+        missed = np.zeros(len(x), dtype=bool)
+        for position, delta, low, high in ((x, dx, left - radius, right + radius),
+                                           (y, dy, top - radius, bottom + radius)):
+            still = delta == 0
+            missed |= still & ((position < low) | (position > high))
+            t_low, t_high = (low - position) / delta, (high - position) / delta
+            t_enter = np.where(still, t_enter, np.maximum(t_enter, np.minimum(t_low, t_high)))
+            t_exit = np.where(still, t_exit, np.minimum(t_exit, np.maximum(t_low, t_high)))
+        missed |= t_enter > t_exit
+
+        # Entering beside one of the sides touches that side
+        contact_x, contact_y = x + dx * t_enter, y + dy * t_enter
+        top_or_bottom = (left <= contact_x) & (contact_x <= right)
+        left_or_right = ~top_or_bottom & (top <= contact_y) & (contact_y <= bottom)
+        corner = ~top_or_bottom & ~left_or_right
+
+        # Entering near a corner: the ball touches the corner itself, if at all
+        from_x = x - np.where(contact_x < left, left, right)
+        from_y = y - np.where(contact_y < top, top, bottom)
+        a = dx * dx + dy * dy
+        b = from_x * dx + from_y * dy
+        c = from_x * from_x + from_y * from_y - radius * radius
+        discriminant = b * b - a * c
+        corner_t = (-b - np.sqrt(discriminant)) / a
+        missed |= corner & ((b >= 0) | (discriminant < 0) | (corner_t > 1))
+
+        t = np.where(touching, np.where(approaching, 0.0, np.inf),
+                     np.where(missed, np.inf, np.where(corner, corner_t, t_enter)))
+        normal_x = np.where(touching, touch_x, np.where(
+            corner, (from_x + dx * corner_t) / radius, np.where(left_or_right, np.where(dx > 0, -1.0, 1.0), 0.0)))
+        normal_y = np.where(touching, touch_y, np.where(
+            corner, (from_y + dy * corner_t) / radius, np.where(top_or_bottom, np.where(dy > 0, -1.0, 1.0), 0.0)))
+    return t, normal_x, normal_y
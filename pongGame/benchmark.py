@@ -0,0 +1,104 @@
+"""
+Benchmark of the headless Pong simulation: one pong.Game at a time against
+many games stepped together with batch.BatchGame (needs NumPy; skipped
+without it).
+
+Both paddles are played by bots that follow the ball with pong.track_ball,
+but make a random move on a share of the ticks (--noise), so that points are
+scored and games are won. Speeds are in ticks of game time per second, in
+games played to the winning score per second, and as a multiple of real
+time (TICK_RATE ticks per second).
+
+Usage:
+    python benchmark.py [--ticks 200000] [--games 10000] [--batch-ticks 10000] [--noise 0.5] [--seed 0]
+"""
+import argparse  # Importing argparse to read the command-line options
+import random  # Importing random for the bots' random moves
+import time  # Importing time to measure the games
+
+from pong import DOWN, STAY, TICK_RATE, UP, Game, track_ball
+
+
+# Function to print the speed of a benchmark
+def report(label, ticks, games, elapsed):
+    """
+    :param label: Name of the benchmark
+    :param ticks: Ticks of game time simulated, over all games
+    :param games: Games played to the winning score
+    :param elapsed: Seconds taken
+    :return: Ticks per second
+    """
+    rate = ticks / elapsed
+    print(f"{label:<40} {rate:>14,.0f} ticks/s {games / elapsed:>10,.1f} games/s "
+          f"{rate / TICK_RATE:>10,.0f}x real time")
+    return rate
+
+
+# Function to play games one at a time
+def play_games(ticks, noise, seed):
+    """
+    :return: Number of games won
+    """
+    rand = random.Random(seed)
+    actions = (UP, STAY, DOWN)
+    game = Game()
+    won = 0
+    for _ in range(ticks):
+        left_action = rand.choice(actions) if rand.random() < noise else track_ball(game.left_paddle, game.ball)
+        right_action = rand.choice(actions) if rand.random() < noise else track_ball(game.right_paddle, game.ball)
+        _, winner = game.step(left_action, right_action)
+        won += winner is not None
+    return won
+
+
+# Function to play many games at once
+def play_batch(games, ticks, noise, seed):
+    """
+    :param ticks: Ticks to play in every game
+    :return: Number of games won
+    """
+    import numpy as np
+    from batch import BatchGame
+
+    rng = np.random.default_rng(seed)
+    batch = BatchGame(games)
+    won = 0
+    for _ in range(ticks):
+        left_actions = batch.track_ball(batch.left_y)
+        right_actions = batch.track_ball(batch.right_y)
+        for actions in (left_actions, right_actions):
+            random_moves = rng.random(games) < noise
+            actions[random_moves] = rng.integers(UP, DOWN + 1, size=int(random_moves.sum()), dtype=np.int8)
+        _, winners = batch.step(left_actions, right_actions)
+        won += int(np.count_nonzero(winners))
+    return won
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=200_000, help="ticks played one game at a time")
+    parser.add_argument("--games", type=int, default=10_000, help="games stepped together")
+    parser.add_argument("--batch-ticks", type=int, default=10_000, help="ticks played in every game of the batch")
+    parser.add_argument("--noise", type=float, default=0.5, help="share of random moves by the bots")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    won = play_games(args.ticks, args.noise, args.seed)
+    before = report("pong.Game, 1 game", args.ticks, won, time.perf_counter() - start)
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("NumPy is not installed; skipping the batched benchmark")
+        return
+
+    start = time.perf_counter()
+    won = play_batch(args.games, args.batch_ticks, args.noise, args.seed)
+    after = report(f"BatchGame, {args.games:,} games", args.games * args.batch_ticks, won,
+                   time.perf_counter() - start)
+    print(f"Speedup of batched games: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Headless Pong simulation: the game's physics without pygame.
+
+The game advances in fixed timesteps (ticks) of 1 / TICK_RATE seconds of game
+time, whatever the frame rate or how fast the simulation is run, so a game
+can be fast-forwarded, replayed tick for tick or played by bots. game.py
+draws it with pygame; batch.py steps many games at once with NumPy.
+
+Paddles are controlled by actions: UP, STAY or DOWN for every tick. The
+ball's collisions are swept (move_ball): it bounces at the exact moment it
+touches a wall or a paddle, so it cannot pass through them at any speed.
+"""
+import math  # Importing math for the collision times
+
+# Court dimensions
+WIDTH, HEIGHT = 700, 500  # Court width and height
+
+# Game settings
+TICK_RATE = 60  # Ticks per second of game time
+WINNING_SCORE = 10  # Score required to win the game
+
+# Paddle and Ball settings
+PADDLE_WIDTH, PADDLE_HEIGHT = 20, 100  # Paddle dimensions
+PADDLE_MARGIN = 10  # Distance between the paddles and the edges of the court
+BALL_RADIUS = 7  # Ball radius
+MAX_BOUNCES = 4  # Most bounces of the ball in one tick; it stops for the rest of the tick after them
+
+# Paddle actions
+UP, STAY, DOWN = -1, 0, 1
+
+# Players
+LEFT, RIGHT = "left", "right"
+
+# What the ball bounced off, besides paddles
+WALL = "wall"
+
+# Outward normals of the left, right, top and bottom sides of a box
+SIDE_NORMALS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+# Paddle class to manage paddle properties and behavior
+class Paddle:
+    VEL = 4  # Paddle velocity, in pixels per tick
+
+    def __init__(self, x, y, width, height):
+        self.x = self.original_x = x  # Initial and reset x-position
+        self.y = self.original_y = y  # Initial and reset y-position
+        self.width = width  # Paddle width
+        self.height = height  # Paddle height
+
+    def move(self, up=True):
+        """Move the paddle up or down."""
+        if up:
+            self.y -= self.VEL  # Move up
+        else:
+            self.y += self.VEL  # Move down
+
+    def reset(self):
+        """Reset paddle to its original position."""
+        self.x = self.original_x
+        self.y = self.original_y
+
+
+# Ball class to manage ball properties and behavior
+class Ball:
+    MAX_VEL = 5  # Maximum ball velocity, in pixels per tick
+
+    def __init__(self, x, y, radius, max_vel=MAX_VEL):
+        self.x = self.original_x = x  # Initial and reset x-position
+        self.y = self.original_y = y  # Initial and reset y-position
+        self.radius = radius  # Ball radius
+        self.MAX_VEL = max_vel  # Maximum velocity of this ball
+        self.x_vel = self.MAX_VEL  # Initial x-velocity
+        self.y_vel = 0  # Initial y-velocity
+
+    def move(self):
+        """Update the ball's position based on its velocity."""
+        self.move_by(self.x_vel, self.y_vel)
+
+    def move_by(self, dx, dy):
+        """Move the ball by an offset."""
+        self.x += dx
+        self.y += dy
+
+    def reset(self):
+        """Reset the ball to its original position, served the other way at full speed."""
+        self.x = self.original_x
+        self.y = self.original_y
+        self.y_vel = 0
+        self.x_vel = -math.copysign(self.MAX_VEL, self.x_vel)  # Reverse direction
+
+
+# Function to find when a moving ball first touches a box
+def sweep_circle(x, y, dx, dy, radius, left, top, right, bottom):
+    """
+    Find when a ball moving from (x, y) to (x + dx, y + dy) first touches a box (swept circle against
+    an axis-aligned box). A ball already touching the box touches it at once, unless it is moving away.
+    :return: (t, normal_x, normal_y): fraction of the move done at the contact and the box's unit normal
+             at the contact point, or None if the ball does not touch the box during the move
+    """
+    # Out of reach: the move stays clear of the box grown by the radius
+    if (min(x, x + dx) > right + radius or max(x, x + dx) < left - radius
+            or min(y, y + dy) > bottom + radius or max(y, y + dy) < top - radius):
+        return None
+
+    # Already touching: the normal points from the nearest point of the box to the centre
+    closest_x = min(max(x, left), right)
+    closest_y = min(max(y, top), bottom)
+    offset_x, offset_y = x - closest_x, y - closest_y
+    distance = offset_x * offset_x + offset_y * offset_y
+    if distance <= radius * radius:
+        if offset_x == 0 and offset_y == 0:  # Centre inside the box: the nearest side
+            depths = [x - left, right - x, y - top, bottom - y]
+            normal_x, normal_y = SIDE_NORMALS[depths.index(min(depths))]
+        else:
+            length = math.sqrt(distance)
+            normal_x, normal_y = offset_x / length, offset_y / length
+        if dx * normal_x + dy * normal_y >= 0:  # Moving away
+            return None
+        return 0.0, normal_x, normal_y
+
+    # Entry into the box grown by the radius, one axis at a time
+    t_enter, t_exit = 0.0, 1.0
+    for position, delta, low, high in ((x, dx, left - radius, right + radius),
+                                       (y, dy, top - radius, bottom + radius)):
+        if delta == 0:
+            if position < low or position > high:
+                return None
+            continue
+        t_low, t_high = (low - position) / delta, (high - position) / delta
+        t_enter = max(t_enter, min(t_low, t_high))
+        t_exit = min(t_exit, max(t_low, t_high))
+    if t_enter > t_exit:
+        return None
+
+    # Entering beside one of the sides touches that side
+    contact_x, contact_y = x + dx * t_enter, y + dy * t_enter
+    if left <= contact_x <= right:  # Top or bottom
+        return t_enter, 0, -1 if dy > 0 else 1
+    if top <= contact_y <= bottom:  # Left or right side
+        return t_enter, -1 if dx > 0 else 1, 0
+
+    # Entering near a corner: the ball touches the corner itself, if at all
+    corner_x = left if contact_x < left else right
+    corner_y = top if contact_y < top else bottom
+    from_x, from_y = x - corner_x, y - corner_y
+    a = dx * dx + dy * dy
+    b = from_x * dx + from_y * dy
+    c = from_x * from_x + from_y * from_y - radius * radius
+    discriminant = b * b - a * c
+    if b >= 0 or discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    if t > 1:
+        return None
+    return t, (from_x + dx * t) / radius, (from_y + dy * t) / radius
+
+
+# Function to move the ball through one tick, bouncing off the walls and paddles
+def move_ball(ball, left_paddle, right_paddle):
+    """
+    Move the ball by its velocity. The ball bounces off the walls and paddles at the moment it touches
+    them, found with sweep_circle, and moves on for the rest of the tick, so it cannot pass through a
+    wall or a paddle however fast it moves.
+
+    A ball hitting the side of a paddle that faces it bounces back, steeper the further from the
+    middle of the paddle it hits; a ball hitting the top or bottom of a paddle is reflected. Either way
+    the ball keeps its horizontal speed.
+    """
+    remaining = 1.0  # Fraction of the tick still to move
+    for _ in range(MAX_BOUNCES):
+        dx, dy = ball.x_vel * remaining, ball.y_vel * remaining
+
+        # Earliest contact: top or bottom wall, then each paddle
+        t, hit = 1.0, None
+        if dy < 0 and ball.y + dy - ball.radius <= 0:
+            t, hit = max(0.0, (ball.radius - ball.y) / dy), WALL
+        elif dy > 0 and ball.y + dy + ball.radius >= HEIGHT:
+            t, hit = max(0.0, (HEIGHT - ball.radius - ball.y) / dy), WALL
+        for paddle in (left_paddle, right_paddle):
+            contact = sweep_circle(ball.x, ball.y, dx, dy, ball.radius,
+                                   paddle.x, paddle.y, paddle.x + paddle.width, paddle.y + paddle.height)
+            if contact is not None and (hit is None or contact[0] < t):
+                (t, normal_x, normal_y), hit = contact, paddle
+
+        if hit is None:
+            ball.move_by(dx, dy)
+            return
+        ball.move_by(dx * t, dy * t)
+        remaining -= remaining * t
+
+        if hit is WALL:
+            ball.y_vel *= -1  # Reverse y-velocity
+        elif normal_x * ball.x_vel < 0:  # Side of the paddle facing the ball
+            ball.x_vel *= -1  # Reverse x-velocity
+
+            # Calculate ball's new y-velocity
+            middle_y = hit.y + hit.height / 2
+            difference_in_y = middle_y - ball.y
+            reduction_factor = (hit.height / 2) / ball.MAX_VEL
+            y_vel = difference_in_y / reduction_factor
+            ball.y_vel = -1 * y_vel
+        else:  # Top or bottom of the paddle: reflected, keeping the ball's horizontal speed
+            along = ball.x_vel * normal_x + ball.y_vel * normal_y
+            ball.x_vel = math.copysign(ball.x_vel, ball.x_vel - 2 * along * normal_x)
+            ball.y_vel -= 2 * along * normal_y
+
+
+# Function to move a paddle by an action, keeping it inside the court
+def handle_paddle_movement(paddle, action):
+    if action == UP and paddle.y - paddle.VEL >= 0:
+        paddle.move(up=True)
+    elif action == DOWN and paddle.y + paddle.VEL + paddle.height <= HEIGHT:
+        paddle.move(up=False)
+
+
+# A game of Pong, advanced one tick at a time
+class Game:
+    def __init__(self, ball_speed=Ball.MAX_VEL):
+        """
+        :param ball_speed: Ball speed in pixels per tick, the horizontal speed it is served at
+        """
+        self.left_paddle = Paddle(PADDLE_MARGIN, HEIGHT//2 - PADDLE_HEIGHT//2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.right_paddle = Paddle(WIDTH - PADDLE_MARGIN - PADDLE_WIDTH, HEIGHT//2 - PADDLE_HEIGHT//2, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.ball = Ball(WIDTH // 2, HEIGHT // 2, BALL_RADIUS, ball_speed)
+        self.left_score = 0
+        self.right_score = 0
+        self.ticks = 0  # Ticks played since the game started
+
+    def step(self, left_action=STAY, right_action=STAY):
+        """
+        Advance the game by one tick.
+        :param left_action: UP, STAY or DOWN for the left paddle
+        :param right_action: UP, STAY or DOWN for the right paddle
+        :return: (scorer, winner): LEFT or RIGHT if a player scored or won on this tick, else None.
+                 When a player wins, the scores are shown as final and the next step starts a new game.
+        """
+        if self.winner() is not None:  # The previous tick ended the game
+            self.reset()
+
+        handle_paddle_movement(self.left_paddle, left_action)
+        handle_paddle_movement(self.right_paddle, right_action)
+
+        move_ball(self.ball, self.left_paddle, self.right_paddle)
+        self.ticks += 1
+
+        # Update scores and reset ball on scoring
+        scorer = None
+        if self.ball.x < 0:
+            self.right_score += 1
+            self.ball.reset()
+            scorer = RIGHT
+        elif self.ball.x > WIDTH:
+            self.left_score += 1
+            self.ball.reset()
+            scorer = LEFT
+        return scorer, self.winner()
+
+    def winner(self):
+        """Return LEFT or RIGHT once a player has reached the winning score, else None."""
+        if self.left_score >= WINNING_SCORE:
+            return LEFT
+        if self.right_score >= WINNING_SCORE:
+            return RIGHT
+        return None
+
+    def reset(self):
+        """Start a new game."""
+        self.ball.reset()
+        self.left_paddle.reset()
+        self.right_paddle.reset()
+        self.left_score = 0
+        self.right_score = 0
+        self.ticks = 0
+
+
+# A simple bot: move the paddle towards the ball
+def track_ball(paddle, ball, dead_zone=PADDLE_HEIGHT // 4):
+    """
+    Return the action that moves a paddle's centre towards the ball.
+    :param dead_zone: Distance from the centre within which the paddle stays still
+    """
+    offset = ball.y - (paddle.y + paddle.height / 2)
+    if offset < -dead_zone:
+        return UP
+    if offset > dead_zone:
+        return DOWN
+    return STAY
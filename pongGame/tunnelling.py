@@ -0,0 +1,171 @@
+"""
+Regression test of ball collisions at high speeds: the original discrete
+collision check against the swept collisions of pong.move_ball.
+
+The original game moved the ball, then checked whether it overlapped a wall
+or a paddle. A ball moving further in one tick than a paddle is wide passes
+through it, and a ball moving fast enough leaves the court through the
+walls. move_ball finds the exact moment the ball touches a wall or a paddle
+instead, so neither can happen at any speed.
+
+Both are played by the noisy tracking bots of benchmark.py at growing ball
+speeds. A tunnel is a move of the ball, between two bounces, that takes its
+centre from outside a paddle to inside it. A paddle moving onto the ball is
+not the ball's move and is not counted. An escape is a tick that ended with
+the centre of the ball above or below the court. A drift is a tick that
+ended with the ball's horizontal speed different from the speed it is
+served at. Exits with an error if the swept collisions let the ball tunnel,
+escape or drift even once.
+
+Usage:
+    python tunnelling.py [--ticks 100000] [--noise 0.5] [--seed 0]
+"""
+import argparse  # Importing argparse to read the command-line options
+import random  # Importing random for the bots' random moves
+import time  # Importing time to measure the games
+
+from pong import (
+    BALL_RADIUS, DOWN, HEIGHT, STAY, UP, WIDTH, Ball, Game, handle_paddle_movement, move_ball, track_ball,
+)
+
+# Ball speeds tested, in pixels per tick: from the game's own speed to crossing the court in 3 ticks
+SPEEDS = [Ball.MAX_VEL, 10, 20, 50, 100, 250]
+
+
+# The original collision check, kept for comparison
+def legacy_move_ball(ball, left_paddle, right_paddle):
+    ball.move()
+
+    # Ball collision with top or bottom wall
+    if ball.y + ball.radius >= HEIGHT or ball.y - ball.radius <= 0:
+        ball.y_vel *= -1  # Reverse y-velocity
+
+    # Ball collision with left paddle
+    if ball.x_vel < 0:
+        if left_paddle.y <= ball.y <= left_paddle.y + left_paddle.height:
+            if ball.x - ball.radius <= left_paddle.x + left_paddle.width:
+                ball.x_vel *= -1  # Reverse x-velocity
+
+                # Calculate ball's new y-velocity
+                middle_y = left_paddle.y + left_paddle.height / 2
+                difference_in_y = middle_y - ball.y
+                reduction_factor = (left_paddle.height / 2) / ball.MAX_VEL
+                y_vel = difference_in_y / reduction_factor
+                ball.y_vel = -1 * y_vel
+
+    # Ball collision with right paddle
+    else:
+        if right_paddle.y <= ball.y <= right_paddle.y + right_paddle.height:
+            if ball.x + ball.radius >= right_paddle.x:
+                ball.x_vel *= -1  # Reverse x-velocity
+
+                # Calculate ball's new y-velocity
+                middle_y = right_paddle.y + right_paddle.height / 2
+                difference_in_y = middle_y - ball.y
+                reduction_factor = (right_paddle.height / 2) / ball.MAX_VEL
+                y_vel = difference_in_y / reduction_factor
+                ball.y_vel = -1 * y_vel
+
+
+# Function to check whether a move goes inside a paddle
+def enters(x0, y0, x1, y1, paddle):
+    """
+    :return: Whether the segment from (x0, y0) to (x1, y1) starts outside the paddle (or on its edge)
+             and goes inside it, not just touching it
+    """
+    left, top, right, bottom = paddle.x, paddle.y, paddle.x + paddle.width, paddle.y + paddle.height
+    if left < x0 < right and top < y0 < bottom:
+        return False
+    t_enter, t_exit = 0.0, 1.0
+    for start, end, low, high in ((x0, x1, left, right), (y0, y1, top, bottom)):
+        delta = end - start
+        if delta == 0:
+            if not low < start < high:
+                return False
+            continue
+        t_low, t_high = sorted(((low - start) / delta, (high - start) / delta))
+        t_enter, t_exit = max(t_enter, t_low), min(t_exit, t_high)
+    return t_enter < t_exit
+
+
+# A ball that checks every move it makes for a paddle in its way
+class TracedBall(Ball):
+    def __init__(self, x, y, radius, max_vel, paddles):
+        super().__init__(x, y, radius, max_vel)
+        self.paddles = paddles
+        self.tunnels = 0  # Moves that went inside a paddle
+
+    def move_by(self, dx, dy):
+        self.tunnels += any(enters(self.x, self.y, self.x + dx, self.y + dy, paddle) for paddle in self.paddles)
+        super().move_by(dx, dy)
+
+
+# Function to play one game at a ball speed and count what went wrong
+def play(speed, move, ticks, noise, seed):
+    """
+    Play a game tick by tick as Game.step does, moving the ball with move.
+    :param speed: Ball speed in pixels per tick
+    :param move: legacy_move_ball or pong.move_ball
+    :return: Dictionary with the numbers of paddle hits, points, tunnels, escapes and drifts, and the ticks
+             per second
+    """
+    rand = random.Random(seed)
+    actions = (UP, STAY, DOWN)
+    game = Game(speed)
+    paddles = (game.left_paddle, game.right_paddle)
+    game.ball = ball = TracedBall(WIDTH // 2, HEIGHT // 2, BALL_RADIUS, speed, paddles)
+    counts = {"hits": 0, "points": 0, "escapes": 0, "drifts": 0}
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        left_action = rand.choice(actions) if rand.random() < noise else track_ball(game.left_paddle, ball)
+        right_action = rand.choice(actions) if rand.random() < noise else track_ball(game.right_paddle, ball)
+        if game.winner() is not None:
+            game.reset()
+        handle_paddle_movement(game.left_paddle, left_action)
+        handle_paddle_movement(game.right_paddle, right_action)
+
+        x_vel = ball.x_vel
+        move(ball, *paddles)
+        counts["escapes"] += not 0 <= ball.y <= HEIGHT
+
+        # Update scores and reset ball on scoring
+        if ball.x < 0:
+            game.right_score += 1
+            ball.reset()
+            counts["points"] += 1
+        elif ball.x > WIDTH:
+            game.left_score += 1
+            ball.reset()
+            counts["points"] += 1
+        else:
+            counts["hits"] += (ball.x_vel < 0) != (x_vel < 0)
+        counts["drifts"] += abs(ball.x_vel) != speed
+    counts["rate"] = ticks / (time.perf_counter() - start)
+    counts["tunnels"] = ball.tunnels
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=100_000, help="ticks played at every speed")
+    parser.add_argument("--noise", type=float, default=0.5, help="share of random moves by the bots")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'speed':>5} {'collisions':<10} {'ticks/s':>10} {'hits':>7} {'points':>7} {'tunnels':>8} {'escapes':>8} {'drifts':>8}")
+    failures = 0
+    for speed in SPEEDS:
+        for name, move in (("discrete", legacy_move_ball), ("swept", move_ball)):
+            counts = play(speed, move, args.ticks, args.noise, args.seed)
+            print(f"{speed:>5} {name:<10} {counts['rate']:>10,.0f} {counts['hits']:>7,} {counts['points']:>7,} "
+                  f"{counts['tunnels']:>8,} {counts['escapes']:>8,} {counts['drifts']:>8,}")
+            if move is move_ball:
+                failures += counts["tunnels"] + counts["escapes"] + counts["drifts"]
+    if failures:
+        raise SystemExit(f"the swept collisions let the ball tunnel, escape or drift {failures} times")
+    print("No tunnelling or speed drift with swept collisions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark of spin generation in main.py, before and after the precompiled reel,
+and of scoring batches of spins with paytable.py.
+
+"before" is the original get_slot_machine_spin, which rebuilt the list of
+symbols on every spin, copied it for every column and removed each drawn
+symbol with list.remove. The other rows use the precompiled Reel.
+
+The paytable rows score one batch of spins on growing grids and numbers of
+paylines (needs NumPy; skipped without it).
+
+Usage:
+    python benchmark.py [--spins 200000]
+"""
+import argparse  # Importing argparse to read the command-line options
+import random  # Importing random for the original spin generation
+import time  # Importing time to measure the spins
+
+from main import COLS, MAX_LINES, ROWS, Reel, check_winnings, get_slot_machine_spin, symbol_count, symbol_value
+
+
+# The original spin generation, kept for comparison
+def legacy_spin(rows, cols, symbols):
+    all_symbols = []
+    for symbol, symbol_count in symbols.items():
+        for _ in range(symbol_count):
+            all_symbols.append(symbol)
+
+    columns = []
+    for _ in range(cols):
+        column = []
+        current_symbols = all_symbols[:]
+        for _ in range(rows):
+            value = random.choice(current_symbols)
+            current_symbols.remove(value)
+            column.append(value)
+
+        columns.append(column)
+
+    return columns
+
+
+# Machines for the paytable benchmark: rows, columns, number of paylines, symbol counts and paytable
+PAYTABLE_MACHINES = [
+    (3, 3, 3, {"A": 2, "B": 4, "C": 6, "D": 8}, {}),
+    (3, 5, 20, {"A": 3, "B": 5, "C": 8, "D": 10, "W": 2, "S": 2}, {"wild": "W", "scatter": "S"}),
+    (5, 5, 65, {"A": 3, "B": 5, "C": 8, "D": 10, "W": 2, "S": 2}, {"wild": "W", "scatter": "S"}),
+]
+
+
+# Function to time a benchmark
+def measure(label, spins, run):
+    """
+    Run a benchmark and print its speed.
+    :param label: Name of the benchmark
+    :param spins: Number of spins it generates
+    :param run: Function running the benchmark
+    :return: Spins per second
+    """
+    start = time.perf_counter()
+    run()
+    rate = spins / (time.perf_counter() - start)
+    print(f"{label:<60} {rate:>12,.0f} spins/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spins", type=int, default=200_000)
+    args = parser.parse_args()
+    spins = args.spins
+    reel = Reel(ROWS, COLS, symbol_count, symbol_value)
+    size = ROWS * COLS
+
+    def legacy_spins():
+        for _ in range(spins):
+            legacy_spin(ROWS, COLS, symbol_count)
+
+    def legacy_spins_and_wins():
+        for _ in range(spins):
+            check_winnings(legacy_spin(ROWS, COLS, symbol_count), MAX_LINES, 1, symbol_value)
+
+    def game_spins():
+        for _ in range(spins):
+            get_slot_machine_spin(ROWS, COLS, symbol_count)
+
+    def reel_spins():
+        for _ in range(spins):
+            reel.spin()
+
+    def batch_spins():
+        reel.spin_batch(spins)
+
+    def batch_spins_and_wins():
+        batch = reel.spin_batch(spins)
+        for start in range(0, len(batch), size):
+            check_winnings(batch[start:start + size], MAX_LINES, 1, reel.values, ROWS)
+
+    before = measure("before: get_slot_machine_spin", spins, legacy_spins)
+    measure("after:  get_slot_machine_spin (symbols)", spins, game_spins)
+    measure("after:  Reel.spin (integer encoding)", spins, reel_spins)
+    after = measure("after:  Reel.spin_batch (integer encoding)", spins, batch_spins)
+    print(f"Speedup of batched spins: {after / before:.1f}x")
+
+    before = measure("before: spin + check_winnings", spins, legacy_spins_and_wins)
+    after = measure("after:  Reel.spin_batch + check_winnings (encoded)", spins, batch_spins_and_wins)
+    print(f"Speedup of spins with winnings: {after / before:.1f}x")
+
+    try:
+        from paytable import Paytable, standard_paylines
+    except ImportError:
+        print("NumPy is not installed; skipping the paytable benchmark")
+        return
+
+    for rows, cols, lines, symbols, special in PAYTABLE_MACHINES:
+        machine = Reel(rows, cols, symbols)
+        pays = {symbol: {length: length * (len(symbols) - code) for length in range(3, cols + 1)}
+                for code, symbol in enumerate(machine.names) if symbol != special.get("scatter")}
+        paytable = Paytable(rows, cols, machine.names, standard_paylines(rows, cols)[:lines], pays,
+                            scatter_pays={3: 2, 4: 10, 5: 50} if "scatter" in special else None, **special)
+        batch = paytable.decode(machine.spin_batch(spins))
+        extras = " with wild and scatter" if special else ""
+        measure(f"Paytable.evaluate, {rows}x{cols}, {lines} paylines{extras}", spins, lambda: paytable.evaluate(batch))
+
+
+if __name__ == "__main__":
+    main()
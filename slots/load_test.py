@@ -0,0 +1,140 @@
+"""
+Load test of the slot session server (server.py).
+
+Starts the server with a fresh spin log, opens many player sessions and
+spins them from concurrent clients over kept-alive connections, then stops
+the server and replays the spin log to check every spin and balance.
+
+Usage:
+    python load_test.py [--sessions 1000] [--clients 100] [--duration 10]
+"""
+import argparse  # Importing argparse to read the command-line options
+import http.client  # Importing http.client for kept-alive connections
+import json  # Importing json to talk to the server
+import os  # Importing os to find this directory
+import socket  # Importing socket to find a free port and wait for the server
+import subprocess  # Importing subprocess to run the server
+import sys  # Importing sys to run the server with this Python
+import tempfile  # Importing tempfile for the spin log
+import threading  # Importing threading for the clients
+import time  # Importing time to measure the spins
+
+from spin_log import replay  # Importing replay to audit the spin log
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# Function to find a free local port
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Function to wait until the server accepts connections
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+# Function to send a JSON request on a connection
+def request(connection, method, path, body=None):
+    """
+    :return: Response status and JSON body
+    """
+    payload = json.dumps(body) if body is not None else None
+    connection.request(method, path, payload, {"Content-Type": "application/json"} if payload else {})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+# Function to return a percentile of a list of numbers
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=100, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_path = os.path.join(log_dir, "spins.db")
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "server.py", "--port", str(port), "--log", log_path],
+            cwd=BASE_DIR, stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port, server)
+
+            # Open the sessions, with enough money to keep spinning
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            sessions = [request(connection, "POST", "/sessions", {"deposit": 10 ** 9})[1]["session"]
+                        for _ in range(args.sessions)]
+            connection.close()
+
+            # Every client spins its own share of the sessions in turn
+            latencies, errors = [], []
+            lock = threading.Lock()
+            deadline = time.monotonic() + args.duration
+
+            def client(mine):
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                timings, failures = [], 0
+                turn = 0
+                while time.monotonic() < deadline:
+                    start = time.perf_counter()
+                    status, _ = request(connection, "POST", f"/sessions/{mine[turn % len(mine)]}/spin",
+                                        {"lines": 3, "bet": 1})
+                    timings.append((time.perf_counter() - start) * 1000)
+                    failures += status != 200
+                    turn += 1
+                connection.close()
+                with lock:
+                    latencies.extend(timings)
+                    errors.append(failures)
+
+            threads = [threading.Thread(target=client, args=(sessions[number::args.clients],))
+                       for number in range(min(args.clients, args.sessions))]
+            start = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - start
+
+            # Cash out every session
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            for session in sessions:
+                request(connection, "DELETE", f"/sessions/{session}")
+            connection.close()
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        print(f"{args.sessions:,} sessions, {len(threads)} clients, {elapsed:.1f} s")
+        print(f"{len(latencies) / elapsed:,.0f} spins/s  p50={percentile(latencies, 50):.2f} ms  "
+              f"p99={percentile(latencies, 99):.2f} ms  errors={sum(errors)}")
+
+        start = time.perf_counter()
+        report = replay(log_path)
+        print(f"Replayed {report['spins']:,} spins in {time.perf_counter() - start:.2f} s: "
+              f"{len(report['problems'])} problems, {len(report['open_balances'])} sessions left open")
+        if report["spins"] != len(latencies) or report["problems"] or sum(errors):
+            raise SystemExit("the spin log does not match the spins played")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import random  # Importing the random module for random number generation
+import threading  # Importing threading to keep a separate set of reels per thread
 
 # Constants for the slot machine
 MAX_LINES = 3  # Maximum number of lines a user can bet on
@@ -25,18 +26,123 @@ symbol_value = {
     "D": 2   # Symbol 'D' has a value of 2
 }
 
+# Precompiled reel for a slot machine configuration, built once and reused for every spin
+class Reel:
+    """
+    Reel of a slot machine configuration, with the symbols encoded as integers.
+    Symbol i is names[i] and is worth values[i]; a spin is a bytearray of cols x rows
+    symbol codes, column by column, so row r of column c is spin[c * rows + r].
+    Not thread-safe: spins shuffle the strip in place, so two threads spinning one reel at
+    once can draw the same copy of a symbol twice. get_reel gives each thread its own reel;
+    a reel shared between threads must be spun under a lock.
+    """
+
+    def __init__(self, rows, cols, symbols, values=None):
+        """
+        Build the reel.
+        :param rows: Number of rows in the slot machine
+        :param cols: Number of columns in the slot machine
+        :param symbols: Dictionary of symbols and their counts
+        :param values: Dictionary mapping symbols to their values (optional)
+        """
+        if len(symbols) > 256:
+            raise ValueError("a reel holds at most 256 different symbols")
+        self.rows = rows
+        self.cols = cols
+        self.names = list(symbols)  # Symbol of each code
+        self.codes = {symbol: code for code, symbol in enumerate(self.names)}  # Code of each symbol
+        self.values = [values[symbol] for symbol in self.names] if values is not None else None
+        # Every copy of every symbol; shuffled in place by the spins, never copied
+        self.strip = [code for code, symbol in enumerate(self.names) for _ in range(symbols[symbol])]
+        if rows > len(self.strip):
+            raise ValueError("each column draws more symbols than the reel holds")
+
+    def spin(self, rand=random.random):
+        """
+        Generate a random spin.
+        Each column is drawn without replacement by a partial Fisher-Yates shuffle of the strip:
+        row r swaps in a random symbol from the part of the strip not drawn yet.
+        :param rand: Function returning random floats in [0, 1)
+        :return: Bytearray of symbol codes, column by column
+        """
+        return self.spin_batch(1, rand)
+
+    def spin_batch(self, count, rand=random.random):
+        """
+        Generate count random spins in one compact array.
+        :param count: Number of spins
+        :param rand: Function returning random floats in [0, 1)
+        :return: Bytearray of count x cols x rows symbol codes; spin i is the slice
+                 [i * cols * rows:(i + 1) * cols * rows]
+        """
+        strip, rows = self.strip, self.rows
+        spans = [(row, len(strip) - row) for row in range(rows)]  # Each row's choice of symbols not drawn yet
+        spins = bytearray(count * self.cols * rows)
+        position = 0
+        for _ in range(count * self.cols):
+            for row, span in spans:
+                # Symbols before row are drawn already; the shuffle stays uniform whatever
+                # order earlier columns left the strip in, so it is never reset
+                # (int(rand() * n) is as fast as it gets and uniform to within n / 2**53)
+                pick = row + int(rand() * span)
+                strip[row], strip[pick] = strip[pick], strip[row]
+                spins[position] = strip[row]
+                position += 1
+        return spins
+
+    def columns(self, spin):
+        """
+        Decode a spin into the list of columns of symbols used by print_slot_machine.
+        :param spin: Spin from spin or spin_batch
+        :return: List of columns, each a list of symbols
+        """
+        rows = self.rows
+        return [[self.names[code] for code in spin[start:start + rows]] for start in range(0, len(spin), rows)]
+
+# Precompiled reels by configuration, so each configuration is built only once per thread
+# (a Reel is not thread-safe, so threads do not share them)
+reels = threading.local()
+
+# Function to get the precompiled reel of a configuration
+def get_reel(rows, cols, symbols, values=None):
+    """
+    Return the calling thread's reel for a configuration, building it on first use.
+    :param rows: Number of rows in the slot machine
+    :param cols: Number of columns in the slot machine
+    :param symbols: Dictionary of symbols and their counts
+    :param values: Dictionary mapping symbols to their values (optional)
+    :return: Reel
+    """
+    key = (rows, cols, tuple(symbols.items()), tuple(values.items()) if values is not None else None)
+    thread_reels = vars(reels)
+    reel = thread_reels.get(key)
+    if reel is None:
+        reel = thread_reels[key] = Reel(rows, cols, symbols, values)
+    return reel
+
 # Function to calculate winnings based on the slot machine's result
-def check_winnings(columns, lines, bet, values):
+def check_winnings(columns, lines, bet, values, rows=None):
     """
     Check if the player has won and calculate the total winnings.
-    :param columns: List of columns from the slot machine spin
+    :param columns: List of columns from the slot machine spin, or, with rows, a spin
+                    encoded as integers by Reel (a bytearray of symbol codes, column by column)
     :param lines: Number of lines the player is betting on
     :param bet: Bet amount per line
-    :param values: Dictionary mapping symbols to their values
+    :param values: Dictionary mapping symbols to their values (for encoded spins, Reel.values)
+    :param rows: Number of rows of an encoded spin; None for a list of columns
     :return: Total winnings and the winning lines
     """
     winnings = 0
     winnings_lines = []
+    if rows is not None:
+        for line in range(lines):
+            line_symbols = columns[line::rows]  # The symbol of every column on the line
+            symbol = line_symbols[0]
+            if line_symbols.count(symbol) == len(line_symbols):  # Check if all symbols in the line match
+                winnings += values[symbol] * bet
+                winnings_lines.append(line + 1)
+        return winnings, winnings_lines
+
     for line in range(lines):
         symbol = columns[0][line]  # Get the symbol in the first column for the line
         for column in columns:
@@ -59,24 +165,34 @@ def get_slot_machine_spin(rows, cols, symbols):
     :param symbols: Dictionary of symbols and their counts
     :return: List of columns representing the slot machine spin
     """
-    all_symbols = []
-    for symbol, symbol_count in symbols.items():
-        # Add each symbol to the list according to its count
-        for _ in range(symbol_count):
-            all_symbols.append(symbol)
-
-    columns = []
-    for _ in range(cols):
-        column = []
-        current_symbols = all_symbols[:]  # Make a copy of the symbols list
-        for _ in range(rows):
-            value = random.choice(current_symbols)  # Randomly select a symbol
-            current_symbols.remove(value)  # Remove the symbol to avoid repetition
-            column.append(value)
+    reel = get_reel(rows, cols, symbols)  # Built once per configuration
+    return reel.columns(reel.spin())
 
-        columns.append(column)
+# Function to play a single spin without any input or output, so the game can be embedded
+def play_spin(balance, lines, bet, reel=None):
+    """
+    Check the bet, spin the slot machine and settle the winnings.
+    :param balance: Current balance of the player
+    :param lines: Number of lines to bet on
+    :param bet: Bet amount per line
+    :param reel: Reel with symbol values to spin (defaults to the game's configuration)
+    :return: The spin (encoded as in Reel.spin), winnings, winning lines and the new balance
+    :raises ValueError: If the number of lines or the bet is invalid, or the balance is too low
+    """
+    if reel is None:
+        reel = get_reel(ROWS, COLS, symbol_count, symbol_value)
+    max_lines = min(MAX_LINES, reel.rows)
+    if not 1 <= lines <= max_lines:
+        raise ValueError(f"Number of lines must be between 1 and {max_lines}.")
+    if not MIN_BET <= bet <= MAX_BET:
+        raise ValueError(f"Amount must be between ${MIN_BET} - ${MAX_BET}.")
+    total_bet = bet * lines
+    if total_bet > balance:
+        raise ValueError(f"You do not have enough to bet that amount, your current balance is: ${balance}")
 
-    return columns
+    slots = reel.spin()
+    winnings, winning_lines = check_winnings(slots, lines, bet, reel.values, reel.rows)
+    return slots, winnings, winning_lines, balance - total_bet + winnings
 
 # Function to display the slot machine columns
 def print_slot_machine(columns):
@@ -169,12 +285,10 @@ def spin(balance):
 
     print(f"You are betting ${bet} on {lines} lines. Total bet is equal to: ${total_bet}")
 
-    # Generate and display the slot machine spin
-    slots = get_slot_machine_spin(ROWS, COLS, symbol_count)
-    print_slot_machine(slots)
-
-    # Check winnings and display results
-    winnings, winning_lines = check_winnings(slots, lines, bet, symbol_value)
+    # Generate the slot machine spin, check winnings and display results
+    reel = get_reel(ROWS, COLS, symbol_count, symbol_value)
+    slots, winnings, winning_lines, _ = play_spin(balance, lines, bet, reel)
+    print_slot_machine(reel.columns(slots))
     print(f"You won ${winnings}.")
     print(f"You won on lines:", *winning_lines)
 
@@ -196,4 +310,5 @@ def main():
     print(f"You left with ${balance}")  # Display final balance
 
 
-main()  # Run the main game function
+if __name__ == "__main__":
+    main()  # Run the main game function when started as a script, not when imported
@@ -0,0 +1,234 @@
+"""
+Exact payout calculator for the slot machine in main.py.
+
+Each column of a spin draws its symbols from the reel without replacement,
+and the columns are independent, so the probability of every line outcome
+can be computed exactly instead of simulated. The outcome probabilities
+depend only on the reel and the machine's size and are memoised, so trying
+different symbol values (the paytable) is instant.
+
+Usage:
+    python payouts.py [--lines 3] [--simulate 1000000] [--seed 42]
+
+With --simulate the Monte Carlo simulator (simulate.py, needs NumPy) is run
+as well and checked against the exact figures.
+"""
+import argparse  # Importing argparse to read the command-line options
+import math  # Importing math for falling factorials and square roots
+from collections import Counter, defaultdict  # Importing Counter and defaultdict to tally symbols and outcomes
+from fractions import Fraction  # Importing Fraction to keep probabilities exact
+from functools import lru_cache  # Importing lru_cache to memoise the outcome distributions
+from itertools import combinations_with_replacement  # Importing combinations_with_replacement to enumerate the symbols on a column
+
+from main import COLS, MAX_LINES, ROWS, symbol_count, symbol_value  # The machine's configuration
+
+# Simulated figures further than this many standard errors from the exact ones are reported as failures
+MAX_Z_SCORE = 4
+
+
+# Function to calculate the probability of a column showing given symbols on given rows
+@lru_cache(maxsize=None)
+def match_probability(counts, symbols):
+    """
+    Calculate the probability that a column shows the given symbols on as many given rows.
+    Ways of drawing them without replacement: for each symbol needed m times,
+    count x (count - 1) x ... (m factors), out of total x (total - 1) x ... (one factor per row).
+    :param counts: Tuple with the number of copies of each symbol on the reel
+    :param symbols: Sorted tuple of the symbol indexes needed, one per row
+    :return: Probability as a Fraction
+    """
+    ways = 1
+    for symbol, times in Counter(symbols).items():
+        ways *= math.perm(counts[symbol], times)
+    return Fraction(ways, math.perm(sum(counts), len(symbols)))
+
+
+# Function to calculate how the next column changes an outcome
+@lru_cache(maxsize=None)
+def next_outcomes(counts, outcome):
+    """
+    Calculate the probability of each set of lines still matching after one more column.
+    The probability that at least a set of lines match is match_probability; the probability
+    that exactly that set matches follows by inclusion-exclusion over the larger sets.
+    :param counts: Tuple with the number of copies of each symbol on the reel
+    :param outcome: Sorted tuple of the symbol indexes the lines still in play match
+    :return: List of (outcome after the column, probability)
+    """
+    # Sets of lines are bit masks over the positions in outcome
+    size = len(outcome)
+    exactly = [
+        match_probability(counts, tuple(symbol for line, symbol in enumerate(outcome) if mask >> line & 1))
+        for mask in range(1 << size)
+    ]
+    for line in range(size):
+        for mask in range(1 << size):
+            if not mask >> line & 1:
+                exactly[mask] -= exactly[mask | 1 << line]
+
+    results = defaultdict(Fraction)
+    for mask, probability in enumerate(exactly):
+        if probability:
+            results[tuple(symbol for line, symbol in enumerate(outcome) if mask >> line & 1)] += probability
+    return list(results.items())
+
+
+# Function to calculate the probabilities of every combination of winning lines
+@lru_cache(maxsize=None)
+def outcome_distribution(counts, lines, cols):
+    """
+    Calculate the probability of each outcome of a spin, column by column: after each
+    column a line is either still matching one symbol or lost. Rows are drawn alike, so
+    which lines won does not matter, only with which symbols.
+    :param counts: Tuple with the number of copies of each symbol on the reel
+    :param lines: Number of lines bet on
+    :param cols: Number of columns in the slot machine
+    :return: Dictionary mapping outcomes to their probabilities; an outcome is a sorted
+             tuple with the index of the symbol of each winning line
+    """
+    # After the first column every line still matches the symbol it shows
+    outcomes = {}
+    for symbols in combinations_with_replacement(range(len(counts)), lines):
+        arrangements = math.factorial(lines)
+        for times in Counter(symbols).values():
+            arrangements //= math.factorial(times)
+        probability = arrangements * match_probability(counts, symbols)
+        if probability:
+            outcomes[symbols] = probability
+
+    for _ in range(cols - 1):
+        following = defaultdict(Fraction)
+        for outcome, probability in outcomes.items():
+            for matched, column_probability in next_outcomes(counts, outcome):
+                following[matched] += probability * column_probability
+        outcomes = dict(following)
+    return outcomes
+
+
+# Function to calculate the exact statistics of the slot machine
+def exact(lines=MAX_LINES, symbols=symbol_count, values=symbol_value, rows=ROWS, cols=COLS):
+    """
+    Calculate the exact return to player, hit frequency, variance and per-line payout
+    distribution, for a bet of 1 per line. Returns the same figures as simulate.simulate.
+    :param lines: Number of lines bet on (1 to rows)
+    :param symbols: Dictionary of symbols and their counts
+    :param values: Dictionary mapping symbols to their values
+    :param rows: Number of rows in the slot machine
+    :param cols: Number of columns in the slot machine
+    :return: Dictionary with the statistics; "rtp_fraction" holds the return to player as an exact fraction
+             and "symbol_win_probability" the probability of a line winning with each symbol
+    """
+    if not 1 <= lines <= rows:
+        raise ValueError(f"lines must be between 1 and {rows}")
+    if rows > sum(symbols.values()):
+        raise ValueError("each column draws more symbols than the reel holds")
+    if cols < 1:
+        raise ValueError("the slot machine needs at least one column")
+
+    # Lines below the ones bet on do not affect the result, so only those rows are looked at
+    names = list(symbols)
+    outcomes = outcome_distribution(tuple(symbols[name] for name in names), lines, cols)
+    payouts = [values[name] for name in names]
+
+    won, won_squared, hits = Fraction(0), Fraction(0), Fraction(0)
+    symbol_wins = defaultdict(Fraction)  # Expected number of lines won with each symbol
+    for outcome, probability in outcomes.items():
+        total = sum(payouts[symbol] for symbol in outcome)
+        won += probability * total
+        won_squared += probability * total * total
+        if outcome:
+            hits += probability
+        for symbol in outcome:
+            symbol_wins[names[symbol]] += probability
+
+    # Every line is alike, so each has the same payout distribution
+    line_distribution = defaultdict(Fraction)
+    for name in names:
+        symbol_wins[name] /= lines
+        line_distribution[values[name]] += symbol_wins[name]
+    line_distribution[0] += 1 - sum(symbol_wins.values())
+
+    # Return per spin as a multiple of the total bet (lines x 1)
+    rtp = won / lines
+    variance = won_squared / lines ** 2 - rtp ** 2
+    return {
+        "lines": lines,
+        "rtp": float(rtp),
+        "rtp_fraction": rtp,
+        "hit_frequency": float(hits),
+        "variance": float(variance),
+        "std_dev": math.sqrt(variance),
+        "line_distribution": [
+            {payout: float(probability) for payout, probability in sorted(line_distribution.items()) if probability}
+        ] * lines,
+        "symbol_win_probability": {name: float(symbol_wins[name]) for name in names},
+    }
+
+
+# Function to check simulated statistics against the exact ones
+def validate(simulated, expected):
+    """
+    Compare a simulation with the exact figures, in standard errors of the simulation.
+    :param simulated: Result of simulate.simulate
+    :param expected: Result of exact for the same configuration
+    :return: Dictionary mapping each figure to its (simulated, exact, z-score)
+    """
+    spins = simulated["spins"]
+    p = expected["hit_frequency"]
+    standard_errors = {
+        "rtp": expected["std_dev"] / math.sqrt(spins),
+        "hit_frequency": math.sqrt(p * (1 - p) / spins),
+    }
+    return {
+        figure: (
+            simulated[figure],
+            expected[figure],
+            (simulated[figure] - expected[figure]) / error if error else 0.0,
+        )
+        for figure, error in standard_errors.items()
+    }
+
+
+# Function to print the exact statistics
+def print_report(report, symbols, values):
+    """
+    Print the exact statistics and each symbol's share of the return to player.
+    :param report: Result of exact
+    :param symbols: Dictionary of symbols and their counts
+    :param values: Dictionary mapping symbols to their values
+    """
+    rtp = report["rtp_fraction"]
+    print(f"Return to player: {report['rtp']:.6%} (exactly {rtp.numerator}/{rtp.denominator})")
+    print(f"Hit frequency:  {report['hit_frequency']:.6%}")
+    print(f"Variance:       {report['variance']:.6f} (std dev {report['std_dev']:.6f}) per unit bet")
+
+    print("Symbol  Count  Value  Line win probability  RTP share")
+    for name, probability in report["symbol_win_probability"].items():
+        print(f"{name:<6}  {symbols[name]:>5}  {values[name]:>5}  {probability:>20.6%}  {probability * values[name]:>9.4%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=MAX_LINES)
+    parser.add_argument("--simulate", type=int, default=0, metavar="SPINS", help="check a simulation of SPINS spins")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    report = exact(args.lines)
+    print_report(report, symbol_count, symbol_value)
+    if not args.simulate:
+        return
+
+    from simulate import simulate  # NumPy is only needed for the check
+
+    print(f"\nChecking {args.simulate:,} simulated spins:")
+    failed = False
+    for figure, (simulated, expected, z_score) in validate(simulate(args.simulate, args.lines, args.seed), report).items():
+        status = "ok" if abs(z_score) <= MAX_Z_SCORE else "FAILED"
+        failed = failed or status != "ok"
+        print(f"{figure:<14} simulated {simulated:.4%}  exact {expected:.4%}  z = {z_score:+.2f}  {status}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Paytable engine for slot machines with any grid size and payline shapes.
+
+A payline picks one row in every column. It pays when it shows a run of the
+same symbol from the leftmost column, as long as the paytable has a payout
+for a run that long. Wild symbols stand in for any other symbol, and scatter
+symbols pay by how many appear anywhere on the grid.
+
+Paylines are compiled once into arrays of positions in the integer encoding
+of spins used by main.Reel (cols x rows symbol codes, column by column).
+Whole batches of spins are then scored with vectorised NumPy comparisons.
+
+Example (a 5x3 machine with 20 paylines, a wild and a scatter):
+    reel = Reel(3, 5, {"A": 3, "B": 5, "C": 8, "W": 2, "S": 2})
+    paytable = Paytable(
+        3, 5, reel.names, standard_paylines(3, 5)[:20],
+        pays={"A": {3: 20, 4: 50, 5: 200}, "B": {3: 5, 4: 20, 5: 50}, "C": {3: 2, 4: 5, 5: 10}},
+        wild="W", scatter="S", scatter_pays={3: 2, 4: 10, 5: 50},
+    )
+    line_wins, scatter_wins = paytable.evaluate(paytable.decode(reel.spin_batch(1000)))
+"""
+import numpy as np  # Importing NumPy for batched scoring
+
+
+# Function to build a list of payline shapes for a grid
+def standard_paylines(rows, cols):
+    """
+    Build the usual payline shapes for a grid: the straight rows first, then diagonals,
+    V shapes, upside-down V shapes and zigzags between every pair of rows.
+    :param rows: Number of rows in the slot machine
+    :param cols: Number of columns in the slot machine
+    :return: List of paylines, each a tuple with the row of every column
+    """
+    # Each shape gives the height of a column between the two rows, from 0 (top) to 1 (bottom)
+    last = max(cols - 1, 1)
+    shapes = [
+        lambda col: col / last,  # Diagonal
+        lambda col: 1 - col / last,  # Diagonal the other way
+        lambda col: 1 - abs(2 * col / last - 1),  # V
+        lambda col: abs(2 * col / last - 1),  # Upside-down V
+        lambda col: col % 2,  # Zigzag
+        lambda col: 1 - col % 2,  # Zigzag the other way
+    ]
+
+    paylines = [(row,) * cols for row in range(rows)]
+    for top in range(rows):
+        for bottom in range(top + 1, rows):
+            for shape in shapes:
+                payline = tuple(top + round((bottom - top) * shape(col)) for col in range(cols))
+                if payline not in paylines:
+                    paylines.append(payline)
+    return paylines
+
+
+# A compiled paytable that scores batches of spins
+class Paytable:
+    """
+    Paylines, payouts, wilds and scatters of a slot machine, compiled for scoring batches of spins.
+    """
+
+    def __init__(self, rows, cols, names, paylines, pays, wild=None, scatter=None, scatter_pays=None):
+        """
+        Compile the paytable.
+        :param rows: Number of rows in the slot machine
+        :param cols: Number of columns in the slot machine
+        :param names: Symbols in the order of their codes (Reel.names)
+        :param paylines: List of paylines, each a sequence with the row of every column
+        :param pays: Dictionary mapping symbols to {run length: payout per unit bet}
+        :param wild: Symbol that stands in for any other symbol on a payline (optional)
+        :param scatter: Symbol that pays by its count anywhere on the grid (optional)
+        :param scatter_pays: Dictionary mapping scatter counts to payouts per unit of the total bet
+        """
+        self.rows = rows
+        self.cols = cols
+        self.names = list(names)
+        codes = {symbol: code for code, symbol in enumerate(self.names)}
+
+        for payline in paylines:
+            if len(payline) != cols or not all(0 <= row < rows for row in payline):
+                raise ValueError(f"payline {payline} does not fit a {rows}x{cols} grid")
+        self.paylines = [tuple(payline) for payline in paylines]
+        # Position of every column's symbol in an encoded spin, one row per payline
+        self.positions = np.array(
+            [[col * rows + row for col, row in enumerate(payline)] for payline in self.paylines], dtype=np.intp
+        ).reshape(len(self.paylines), cols)
+
+        # Payout of a run of each length of each symbol: payouts[code, length]
+        self.payouts = np.zeros((len(self.names), cols + 1), dtype=np.int64)
+        for symbol, runs in pays.items():
+            for length, payout in runs.items():
+                if not 1 <= length <= cols:
+                    raise ValueError(f"a run of {length} {symbol} does not fit {cols} columns")
+                self.payouts[codes[symbol], length] = payout
+
+        self.wild = codes[wild] if wild is not None else None
+        self.wild_pays = self.wild is not None and bool(self.payouts[self.wild].any())
+        self.scatter = codes[scatter] if scatter is not None else None
+        # Payout of each number of scatters anywhere on the grid
+        self.scatter_payouts = np.zeros(rows * cols + 1, dtype=np.int64)
+        for count, payout in (scatter_pays or {}).items():
+            self.scatter_payouts[count] = payout
+
+    @classmethod
+    def classic(cls, rows, cols, names, values, lines=None):
+        """
+        Build the paytable of main.check_winnings: straight rows that pay the symbol's
+        value when every column matches.
+        :param rows: Number of rows in the slot machine
+        :param cols: Number of columns in the slot machine
+        :param names: Symbols in the order of their codes (Reel.names)
+        :param values: Dictionary mapping symbols to their values
+        :param lines: Number of paylines (defaults to rows)
+        :return: Paytable
+        """
+        return cls(
+            rows, cols, names, [(row,) * cols for row in range(lines or rows)],
+            {symbol: {cols: value} for symbol, value in values.items()},
+        )
+
+    def decode(self, spins):
+        """
+        View encoded spins as an array with one spin per row.
+        :param spins: Spins from Reel.spin_batch (a bytearray), or an array of symbol codes
+        :return: Array of shape (spins, cols x rows)
+        """
+        if isinstance(spins, (bytes, bytearray, memoryview)):
+            spins = np.frombuffer(spins, dtype=np.uint8)
+        return np.asarray(spins).reshape(-1, self.rows * self.cols)
+
+    def evaluate(self, spins, bet=1, lines=None):
+        """
+        Score a batch of spins.
+        :param spins: Array of shape (spins, cols x rows) of symbol codes (see decode)
+        :param bet: Bet per payline
+        :param lines: Number of paylines bet on, the first ones in order (defaults to all)
+        :return: Winnings of every payline of every spin, with shape (spins, lines), and the
+                 scatter winnings of every spin, with shape (spins,)
+        """
+        lines = len(self.paylines) if lines is None else lines
+        positions = self.positions[:lines]
+
+        # Follow every payline of every spin from left to right, one column at a time, on arrays
+        # of shape (spins, lines): the symbol it matches, whether its run goes on and how long it is
+        line_symbol = spins[:, positions[:, 0]]
+        running = np.ones(line_symbol.shape, dtype=bool)
+        run = np.ones(line_symbol.shape, dtype=np.int8)
+        if self.wild is not None:
+            # Runs of wilds alone, which may pay more than the symbol they complete
+            wild_running = line_symbol == self.wild
+            wild_run = wild_running.astype(np.int8)
+
+        for col in range(1, self.cols):
+            symbols = spins[:, positions[:, col]]
+            if self.wild is None:
+                matches = running & (symbols == line_symbol)
+            else:
+                # Until a payline meets a symbol that is not wild, it matches anything and
+                # takes that symbol
+                wilds = symbols == self.wild
+                undecided = line_symbol == self.wild
+                matches = running & ((symbols == line_symbol) | wilds | undecided)
+                np.copyto(line_symbol, symbols, where=matches & undecided)
+                wild_running &= wilds
+                wild_run += wild_running
+            run += matches
+            running = matches
+
+        line_wins = self.payouts[line_symbol, run]
+        if self.wild_pays:
+            line_wins = np.maximum(line_wins, self.payouts[self.wild, wild_run])
+
+        if self.scatter is None:
+            scatter_wins = np.zeros(len(spins), dtype=np.int64)
+        else:
+            scatter_wins = self.scatter_payouts[np.count_nonzero(spins == self.scatter, axis=1)] * lines
+        return line_wins * bet, scatter_wins * bet
+
+    def winnings(self, spin, bet=1, lines=None):
+        """
+        Score a single spin, like main.check_winnings.
+        :param spin: Spin from Reel.spin (a bytearray), or a sequence of symbol codes
+        :param bet: Bet per payline
+        :param lines: Number of paylines bet on (defaults to all)
+        :return: Total winnings and the winning paylines (1-indexed)
+        """
+        line_wins, scatter_wins = self.evaluate(self.decode(spin), bet, lines)
+        return int(line_wins.sum() + scatter_wins.sum()), [int(line) + 1 for line in np.flatnonzero(line_wins[0])]
+
@@ -0,0 +1,285 @@
+"""
+HTTP/JSON server for playing the slot machine in main.py, with many player
+sessions at once. Balances are held in memory and every session and spin is
+written to an append-only spin log (see spin_log.py) before it is answered.
+
+Requests whose event cannot be written to the spin log are answered with 503.
+
+Endpoints:
+    POST   /sessions                {"deposit": 100}          -> {"session", "balance"}
+    GET    /sessions/<id>                                     -> {"session", "balance"}
+    POST   /sessions/<id>/spin      {"lines": 3, "bet": 10}   -> {"columns", "winnings", "winning_lines", "balance"}
+    DELETE /sessions/<id>                                     -> {"session", "balance"} (cashes out)
+
+Usage:
+    python server.py [--port 8000] [--log spins.db]
+"""
+import argparse  # Importing argparse to read the command-line options
+import json  # Importing json to read requests and write responses
+import secrets  # Importing secrets to generate session ids
+import signal  # Importing signal to shut down cleanly when terminated
+import threading  # Importing threading to guard the sessions
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Importing the HTTP server
+
+from main import COLS, ROWS, get_reel, play_spin, symbol_count, symbol_value  # The game core
+from spin_log import SpinLog, SpinLogError  # The spin log
+
+# Largest request body accepted, in bytes
+MAX_BODY = 1024
+
+# Seconds to wait for an event to be written to the spin log before answering 503
+LOG_TIMEOUT = 10
+
+
+# A player's session
+class Session:
+    """
+    Balance of a player, with a lock so that one session plays one spin at a time.
+    """
+
+    def __init__(self, session_id, balance):
+        self.id = session_id
+        self.balance = balance
+        self.lock = threading.Lock()
+        self.closed = False
+
+
+# The game shared by all sessions
+class SlotService:
+    """
+    Sessions of the slot machine, with every change written to the spin log.
+    """
+
+    def __init__(self, log, reel=None):
+        """
+        :param log: SpinLog to write sessions and spins to
+        :param reel: Reel with symbol values to play on (defaults to the game's configuration)
+        """
+        self.log = log
+        self.reel = reel or get_reel(ROWS, COLS, symbol_count, symbol_value)
+        self.reel_lock = threading.Lock()  # A Reel is not thread-safe, and every session spins this one
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def open(self, deposit):
+        """
+        Open a session with a deposit.
+        :param deposit: Amount deposited
+        :return: Session
+        :raises ValueError: If the deposit is not a positive whole amount
+        :raises SpinLogError: If the opening could not be logged
+        """
+        if not isinstance(deposit, int) or isinstance(deposit, bool) or deposit <= 0:
+            raise ValueError("Amount must be greater than 0.")
+        session = Session(secrets.token_urlsafe(12), deposit)
+        with session.lock:
+            with self.lock:
+                self.sessions[session.id] = session
+            try:
+                self.log.append(session.id, "open", deposit).result(LOG_TIMEOUT)
+            except SpinLogError:
+                with self.lock:
+                    del self.sessions[session.id]
+                raise
+        return session
+
+    def get(self, session_id):
+        """
+        :param session_id: Session id
+        :return: Session, or None if there is no such session
+        """
+        with self.lock:
+            return self.sessions.get(session_id)
+
+    def spin(self, session, lines, bet):
+        """
+        Play a spin for a session and log it.
+        :param session: Session
+        :param lines: Number of lines to bet on
+        :param bet: Bet amount per line
+        :return: The spin's columns, winnings and winning lines, and the new balance
+        :raises ValueError: If the bet is invalid or the session is closed
+        :raises SpinLogError: If the spin could not be logged; a spin that failed to be written
+                              is undone, one that timed out stands if it is written later
+        """
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in (lines, bet)):
+            raise ValueError("Please enter a number.")
+        with session.lock:
+            if session.closed:
+                raise ValueError("The session is closed.")
+            with self.reel_lock:
+                slots, winnings, winning_lines, balance = play_spin(session.balance, lines, bet, self.reel)
+            previous, session.balance = session.balance, balance
+            written = self.log.append(session.id, "spin", balance, lines, bet, slots, winnings)
+            # Answer only once the spin is on disk; the session's next spin waits for it too,
+            # so a spin that was not written can be undone
+            try:
+                written.result(LOG_TIMEOUT)
+            except SpinLogError:
+                if written.error is not None:
+                    session.balance = previous
+                raise
+        return self.reel.columns(slots), winnings, winning_lines, balance
+
+    def close(self, session):
+        """
+        Cash out and close a session.
+        :param session: Session
+        :return: Balance cashed out
+        :raises SpinLogError: If the cash-out could not be logged; a cash-out that failed to be
+                              written leaves the session open
+        """
+        with session.lock:
+            if session.closed:
+                raise ValueError("The session is closed.")
+            session.closed = True
+            with self.lock:
+                del self.sessions[session.id]
+            written = self.log.append(session.id, "close", session.balance)
+            try:
+                written.result(LOG_TIMEOUT)
+            except SpinLogError:
+                if written.error is not None:
+                    session.closed = False
+                    with self.lock:
+                        self.sessions[session.id] = session
+                raise
+        return session.balance
+
+
+# Handler for the JSON API
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections open between requests
+    # Headers and body are written separately; with Nagle's algorithm the body would wait for
+    # the client's delayed ACK (about 40 ms) on every response of a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        parts = self.path.strip("/").split("/")
+        body = self.read_json()
+        if body is None:
+            return
+        try:
+            if parts == ["sessions"]:
+                session = self.server.service.open(body.get("deposit"))
+                self.send_json(201, {"session": session.id, "balance": session.balance})
+            elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "spin":
+                session = self.find_session(parts[1])
+                if session is not None:
+                    columns, winnings, winning_lines, balance = self.server.service.spin(session, body.get("lines"), body.get("bet"))
+                    self.send_json(200, {
+                        "columns": columns,
+                        "winnings": winnings,
+                        "winning_lines": winning_lines,
+                        "balance": balance,
+                    })
+            else:
+                self.send_json(404, {"error": "Not found."})
+        except ValueError as error:
+            self.send_json(400, {"error": str(error)})
+        except SpinLogError as error:
+            self.send_json(503, {"error": str(error)})
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "sessions":
+            session = self.find_session(parts[1])
+            if session is not None:
+                self.send_json(200, {"session": session.id, "balance": session.balance})
+        else:
+            self.send_json(404, {"error": "Not found."})
+
+    def do_DELETE(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] == "sessions":
+            session = self.find_session(parts[1])
+            if session is not None:
+                try:
+                    self.send_json(200, {"session": session.id, "balance": self.server.service.close(session)})
+                except ValueError as error:
+                    self.send_json(404, {"error": str(error)})
+                except SpinLogError as error:
+                    self.send_json(503, {"error": str(error)})
+        else:
+            self.send_json(404, {"error": "Not found."})
+
+    def find_session(self, session_id):
+        """
+        Look up a session, answering 404 if there is none.
+        """
+        session = self.server.service.get(session_id)
+        if session is None:
+            self.send_json(404, {"error": "No such session."})
+        return session
+
+    def read_json(self):
+        """
+        Read the request body as a JSON object, answering 400 if it is not one.
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self.send_json(413, {"error": "Request body too large."})
+            self.close_connection = True
+            return None
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            self.send_json(400, {"error": "The request body must be a JSON object."})
+            return None
+        return body
+
+    def send_json(self, status, data):
+        """
+        Send a JSON response.
+        """
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Every spin is in the spin log; no access log
+
+
+# The HTTP server, which owns the game service and closes its spin log
+class SlotServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Room for many players connecting at once
+
+    def __init__(self, address, service):
+        """
+        :param address: (host, port) to listen on; port 0 picks any free port
+        :param service: SlotService to serve
+        """
+        self.service = service
+        super().__init__(address, Handler)
+
+    def server_close(self):
+        super().server_close()
+        self.service.log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--log", default="spins.db", help="SQLite spin log")
+    args = parser.parse_args()
+
+    server = SlotServer((args.host, args.port), SlotService(SpinLog(args.log)))
+    print(f"Serving on http://{args.host}:{server.server_port}, logging to {args.log}", flush=True)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)  # Stop like Ctrl+C when terminated
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
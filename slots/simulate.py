@@ -0,0 +1,220 @@
+"""
+Headless Monte Carlo simulator for the slot machine in main.py.
+
+Runs millions of spins in batched NumPy arrays, split into chunks that are
+simulated in parallel worker processes. Every chunk has its own random
+stream derived from the seed, so results depend only on the seed and the
+number of spins, not on the number of workers.
+
+Usage:
+    python simulate.py [--spins 1000000] [--lines 3] [--seed 42] [--workers 4]
+"""
+import argparse  # Importing argparse to read the command-line options
+import math  # Importing math for the confidence interval
+import os  # Importing os to count the available CPU cores
+import time  # Importing time to report the simulation speed
+from concurrent.futures import ProcessPoolExecutor  # Importing the process pool to use several cores
+
+import numpy as np  # Importing NumPy for batched spins
+
+from main import COLS, MAX_LINES, ROWS, symbol_count, symbol_value  # The machine's configuration
+
+# Number of spins simulated at once by a worker; bounds memory use to a few tens of MB
+BATCH_SIZE = 100_000
+
+# Number of spins in each chunk of work handed to a worker process
+CHUNK_SIZE = 1_000_000
+
+
+# Function to turn the symbol configuration into arrays
+def build_reel(symbols, values):
+    """
+    Encode the symbols as integers for batched spins.
+    :param symbols: Dictionary of symbols and their counts
+    :param values: Dictionary mapping symbols to their values
+    :return: Symbol names, the reel (one entry per symbol copy) and the value of each symbol
+    """
+    names = list(symbols)
+    reel = np.repeat(np.arange(len(names), dtype=np.int8), [symbols[name] for name in names])
+    payouts = np.array([values[name] for name in names], dtype=np.int64)
+    return names, reel, payouts
+
+
+# Function to generate a batch of random slot machine spins
+def spin_batch(rng, spins, reel, rows, cols):
+    """
+    Generate spins the way get_slot_machine_spin does: each column draws rows
+    symbols from the reel without replacement, by a partial Fisher-Yates shuffle
+    of its own copy of the reel (only the first rows positions are shuffled).
+    :param rng: NumPy random generator
+    :param spins: Number of spins
+    :param reel: Reel from build_reel
+    :param rows: Number of rows in the slot machine
+    :param cols: Number of columns in the slot machine
+    :return: Array of shape (spins, cols, rows) of symbol indexes, like columns[col][row]
+    """
+    strips = np.tile(reel, (spins * cols, 1))
+    drawn = np.arange(spins * cols)
+    for row in range(rows):
+        picks = rng.integers(row, len(reel), size=spins * cols)
+        strips[drawn, row], strips[drawn, picks] = strips[drawn, picks], strips[drawn, row]
+    return strips[:, :rows].reshape(spins, cols, rows)
+
+
+# Function to calculate the winnings of a batch of spins
+def line_payouts(grid, lines, payouts):
+    """
+    Calculate the winnings of every line of every spin, for a bet of 1 per line,
+    the way check_winnings does: a line wins if all columns show the same symbol.
+    :param grid: Spins from spin_batch
+    :param lines: Number of lines bet on
+    :param payouts: Value of each symbol
+    :return: Array of shape (spins, lines) with the winnings of each line
+    """
+    rows = grid[:, :, :lines]
+    wins = (rows == rows[:, :1, :]).all(axis=1)
+    return np.where(wins, payouts[rows[:, 0, :]], 0)
+
+
+# Function to simulate one chunk of spins and summarise it
+def simulate_chunk(seed, spins, lines, symbols, values, rows=ROWS, cols=COLS):
+    """
+    Simulate spins in batches and accumulate the statistics.
+    :param seed: Seed (or SeedSequence) of this chunk's random stream
+    :param spins: Number of spins
+    :param lines: Number of lines bet on
+    :param symbols: Dictionary of symbols and their counts
+    :param values: Dictionary mapping symbols to their values
+    :param rows: Number of rows in the slot machine
+    :param cols: Number of columns in the slot machine
+    :return: Dictionary of sums that can be combined across chunks
+    """
+    _, reel, payouts = build_reel(symbols, values)
+    rng = np.random.default_rng(seed)
+    max_payout = int(payouts.max())
+    totals = {
+        "spins": 0,
+        "won": 0,  # Sum of winnings, for a bet of 1 per line
+        "won_squared": 0,  # Sum of squared winnings per spin, for the variance
+        "hits": 0,  # Spins that won on at least one line
+        "line_counts": np.zeros((lines, max_payout + 1), dtype=np.int64),  # Winnings of each line
+    }
+    for start in range(0, spins, BATCH_SIZE):
+        batch = min(BATCH_SIZE, spins - start)
+        won = line_payouts(spin_batch(rng, batch, reel, rows, cols), lines, payouts)
+        per_spin = won.sum(axis=1)
+        totals["spins"] += batch
+        totals["won"] += int(per_spin.sum())
+        totals["won_squared"] += int((per_spin * per_spin).sum())
+        totals["hits"] += int(np.count_nonzero(per_spin))
+        for line in range(lines):
+            totals["line_counts"][line] += np.bincount(won[:, line], minlength=max_payout + 1)
+    return totals
+
+
+# Function to combine the statistics of all chunks into a report
+def summarise(chunks, lines):
+    """
+    Combine chunk statistics into return-to-player, hit frequency and variance.
+    :param chunks: Results of simulate_chunk
+    :param lines: Number of lines bet on
+    :return: Dictionary with the report figures
+    """
+    spins = sum(chunk["spins"] for chunk in chunks)
+    won = sum(chunk["won"] for chunk in chunks)
+    won_squared = sum(chunk["won_squared"] for chunk in chunks)
+    line_counts = sum(chunk["line_counts"] for chunk in chunks)
+
+    # Return per spin as a multiple of the total bet (lines x 1)
+    mean = won / spins / lines
+    variance = won_squared / spins / lines ** 2 - mean ** 2
+    return {
+        "spins": spins,
+        "lines": lines,
+        "rtp": mean,
+        "rtp_ci95": 1.96 * math.sqrt(variance / spins),
+        "hit_frequency": sum(chunk["hits"] for chunk in chunks) / spins,
+        "variance": variance,
+        "std_dev": math.sqrt(variance),
+        "line_distribution": [
+            {payout: int(count) / spins for payout, count in enumerate(counts) if count}
+            for counts in line_counts
+        ],
+    }
+
+
+# Function to run a full simulation across worker processes
+def simulate(spins, lines=MAX_LINES, seed=None, workers=None, symbols=symbol_count, values=symbol_value,
+             rows=ROWS, cols=COLS):
+    """
+    Simulate spins of the slot machine and report its statistics.
+    :param spins: Number of spins
+    :param lines: Number of lines bet on (1 to rows)
+    :param seed: Seed for reproducible results (None for a random seed)
+    :param workers: Number of worker processes (defaults to the number of CPU cores)
+    :param symbols: Dictionary of symbols and their counts
+    :param values: Dictionary mapping symbols to their values
+    :param rows: Number of rows in the slot machine
+    :param cols: Number of columns in the slot machine
+    :return: Dictionary with the report figures (see summarise)
+    """
+    if not 1 <= lines <= rows:
+        raise ValueError(f"lines must be between 1 and {rows}")
+    if rows > sum(symbols.values()):
+        raise ValueError("each column draws more symbols than the reel holds")
+
+    # One independent random stream per chunk, derived from the seed
+    sizes = [min(CHUNK_SIZE, spins - start) for start in range(0, spins, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    arguments = [(chunk_seed, size, lines, symbols, values, rows, cols) for chunk_seed, size in zip(seeds, sizes)]
+
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers <= 1:
+        chunks = [simulate_chunk(*chunk_arguments) for chunk_arguments in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(simulate_chunk, *zip(*arguments)))
+    return summarise(chunks, lines)
+
+
+# Function to print a simulation report
+def print_report(report, names, values, elapsed):
+    """
+    Print the simulation report.
+    :param report: Result of simulate
+    :param names: Symbol names, in the order of build_reel
+    :param values: Dictionary mapping symbols to their values
+    :param elapsed: Seconds the simulation took
+    """
+    print(f"Spins:          {report['spins']:,} on {report['lines']} lines "
+          f"({elapsed:.2f} s, {report['spins'] / elapsed:,.0f} spins/s)")
+    print(f"Return to player: {report['rtp']:.4%} ± {report['rtp_ci95']:.4%} (95% CI)")
+    print(f"Hit frequency:  {report['hit_frequency']:.4%}")
+    print(f"Variance:       {report['variance']:.4f} (std dev {report['std_dev']:.4f}) per unit bet")
+
+    # Winnings of a line identify the symbol that won, since every symbol has its own value
+    symbol_by_payout = {values[name]: name for name in names}
+    for line, distribution in enumerate(report["line_distribution"], start=1):
+        wins = ", ".join(
+            f"{symbol_by_payout.get(payout, '?')} x{payout}: {probability:.4%}"
+            for payout, probability in sorted(distribution.items()) if payout
+        )
+        print(f"Line {line}:         {wins or 'no wins'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spins", type=int, default=1_000_000)
+    parser.add_argument("--lines", type=int, default=MAX_LINES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="defaults to the number of CPU cores")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = simulate(args.spins, args.lines, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    print_report(report, list(symbol_count), symbol_value, elapsed)
+
+
+if __name__ == "__main__":
+    main()
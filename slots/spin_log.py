@@ -0,0 +1,251 @@
+"""
+Append-only log of slot machine sessions and spins, stored in SQLite.
+
+Every session opening, spin and cash-out is appended as an event. Writes are
+batched: a writer thread commits everything queued since its last commit in
+one transaction, and callers wait for the commit of their own event (group
+commit), so a spin is only reported once it is on disk. If a batch cannot be
+written, its callers are told so instead of waiting for ever. Triggers reject
+any UPDATE or DELETE of the events table.
+
+The log can be replayed for audits: every spin is scored again with
+check_winnings and every balance is recomputed from the deposits.
+
+Usage:
+    python spin_log.py spins.db
+"""
+import argparse  # Importing argparse to read the command-line options
+import queue  # Importing queue to hand events to the writer thread
+import sqlite3  # Importing sqlite3 to store the log
+import threading  # Importing threading for the writer thread
+import time  # Importing time to timestamp events
+
+from main import ROWS, COLS, symbol_count, symbol_value, check_winnings, get_reel  # The machine's configuration
+
+# Most events written in one transaction
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    session TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('open', 'spin', 'close')),
+    lines INTEGER,
+    bet INTEGER,
+    spin BLOB,
+    winnings INTEGER,
+    balance INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS events_no_update BEFORE UPDATE ON events
+BEGIN SELECT RAISE(ABORT, 'the spin log is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS events_no_delete BEFORE DELETE ON events
+BEGIN SELECT RAISE(ABORT, 'the spin log is append-only'); END;
+"""
+
+
+# Error of a write to the spin log
+class SpinLogError(Exception):
+    pass
+
+
+# An event's write to the spin log
+class Write(threading.Event):
+    """
+    Set once the event is committed, or once committing it failed (error is then set).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.error = None
+
+    def result(self, timeout=None):
+        """
+        Wait for the event to be committed.
+        :param timeout: Seconds to wait at most (None waits for ever)
+        :raises SpinLogError: If the write failed or did not finish in time
+        """
+        if not self.wait(timeout):
+            raise SpinLogError("The spin log did not answer in time.")
+        if self.error is not None:
+            raise SpinLogError("The spin log could not be written.") from self.error
+
+
+# Append-only log of sessions and spins with batched writes
+class SpinLog:
+    """
+    Log of session openings, spins and cash-outs, written by a background thread.
+    """
+
+    def __init__(self, path):
+        """
+        Open the log, creating it if needed, and start the writer thread.
+        :param path: Path of the SQLite database
+        """
+        self.path = path
+        self.events = queue.Queue()
+        self.error = None  # Last error of the writer, if a write failed
+        self.closed = False
+        self.closing = threading.Lock()  # Orders appends against close
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        connection.close()
+        self.writer = threading.Thread(target=self.write, name="spin-log-writer", daemon=True)
+        self.writer.start()
+
+    def append(self, session, kind, balance, lines=None, bet=None, spin=None, winnings=None):
+        """
+        Queue an event for writing.
+        :param session: Session id
+        :param kind: "open" (balance is the deposit), "spin" or "close" (balance is cashed out)
+        :param balance: Balance after the event
+        :param lines: Number of lines bet on (spins only)
+        :param bet: Bet per line (spins only)
+        :param spin: Spin encoded as in Reel.spin (spins only)
+        :param winnings: Winnings of the spin (spins only)
+        :return: Write set once the event is committed or failed (at once if the log is closed)
+        """
+        written = Write()
+        spin = bytes(spin) if spin is not None else None
+        with self.closing:
+            if not self.closed:
+                self.events.put(((time.time(), session, kind, lines, bet, spin, winnings, balance), written))
+                return written
+        written.error = SpinLogError("The spin log is closed.")
+        written.set()
+        return written
+
+    def write(self):
+        """
+        Writer thread: commit whatever is queued in one transaction, then wake its callers.
+        A batch that cannot be written is failed, and the writer goes on with the next one.
+        """
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as error:
+            connection = None
+            self.error = error
+        while True:
+            batch = [self.events.get()]  # Wait for the next event
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+            closed = None in batch
+            if closed:
+                # Nothing is queued after close; should anything be, it is failed, not left waiting
+                batch, late = batch[:batch.index(None)], batch[batch.index(None) + 1:]
+                for _, written in late:
+                    written.error = SpinLogError("The spin log is closed.")
+                    written.set()
+            self.commit(connection, batch)
+            if closed:
+                break
+        if connection is not None:
+            connection.close()
+
+    def commit(self, connection, batch):
+        """
+        Write a batch of events in one transaction and wake their callers.
+        :param connection: Writer's SQLite connection, or None if it could not be opened
+        :param batch: List of (row, written event)
+        """
+        error = self.error if connection is None else None
+        if connection is not None:
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO events (time, session, kind, lines, bet, spin, winnings, balance)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [row for row, _ in batch],
+                    )
+            except sqlite3.Error as failure:
+                error = self.error = failure
+        for _, written in batch:
+            written.error = error
+            written.set()
+
+    def close(self):
+        """
+        Write the queued events and stop the writer thread. Events appended afterwards fail at once.
+        """
+        with self.closing:
+            if self.closed:
+                return
+            self.closed = True
+            self.events.put(None)
+        self.writer.join()
+
+
+# Function to replay a log and check every spin and balance
+def replay(path, reel=None):
+    """
+    Replay a spin log for an audit.
+    :param path: Path of the SQLite database
+    :param reel: Reel with symbol values the spins were played on (defaults to the game's configuration)
+    :return: Dictionary with the number of sessions, spins, the totals bet and won, the balances
+             of sessions still open and a list of problems found
+    """
+    reel = reel or get_reel(ROWS, COLS, symbol_count, symbol_value)
+    balances = {}
+    report = {"sessions": 0, "spins": 0, "bet": 0, "won": 0, "problems": []}
+    problems = report["problems"]
+
+    connection = sqlite3.connect(path)
+    rows = connection.execute(
+        "SELECT id, session, kind, lines, bet, spin, winnings, balance FROM events ORDER BY id"
+    )
+    for event, session, kind, lines, bet, spin, winnings, balance in rows:
+        if kind == "open":
+            if session in balances:
+                problems.append(f"event {event}: session {session} opened twice")
+            balances[session] = balance
+            report["sessions"] += 1
+            continue
+        if session not in balances:
+            problems.append(f"event {event}: {kind} of unknown session {session}")
+            continue
+        if kind == "close":
+            if balance != balances.pop(session):
+                problems.append(f"event {event}: session {session} cashed out {balance}, not its balance")
+            continue
+
+        # A spin: score it again and settle it against the replayed balance
+        expected, _ = check_winnings(spin, lines, bet, reel.values, reel.rows)
+        if winnings != expected:
+            problems.append(f"event {event}: spin paid {winnings}, check_winnings gives {expected}")
+        if bet * lines > balances[session]:
+            problems.append(f"event {event}: bet {bet * lines} exceeds the balance {balances[session]}")
+        balances[session] += expected - bet * lines
+        if balance != balances[session]:
+            problems.append(f"event {event}: balance {balance}, replay gives {balances[session]}")
+        report["spins"] += 1
+        report["bet"] += bet * lines
+        report["won"] += expected
+    connection.close()
+
+    report["open_balances"] = balances
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="SQLite spin log")
+    args = parser.parse_args()
+
+    report = replay(args.path)
+    print(f"Sessions: {report['sessions']:,} ({len(report['open_balances']):,} still open)")
+    print(f"Spins:    {report['spins']:,}")
+    print(f"Bet:      ${report['bet']:,}")
+    print(f"Won:      ${report['won']:,}")
+    for problem in report["problems"]:
+        print(problem)
+    if report["problems"]:
+        raise SystemExit(f"{len(report['problems'])} problems found")
+    print("Every spin and balance checks out.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmarks for the weather app, run with Django's test client against a local
+stub of weatherapi.com (no API key or network access needed).
+
+Usage:
+    python benchmark.py pooling [--requests 200] [--delay 0.005]
+    python benchmark.py dashboard [--requests 5] [--delay 0.05] [--cities 10 50 200]
+"""
+# Import the modules needed to run a stub server and time requests
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Use the project settings
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weather_project.settings')
+
+
+# Build a weatherapi.com-style forecast payload for a city
+def forecast_payload(city, days=5):
+    today = datetime.date(2025, 1, 6)
+    condition = {"text": "Partly cloudy", "icon": "//cdn.weatherapi.com/weather/64x64/day/116.png"}
+    return {
+        "location": {"name": city},
+        "current": {"temp_c": 12.0, "condition": condition},
+        "forecast": {"forecastday": [
+            {
+                "date": (today + datetime.timedelta(days=day)).isoformat(),
+                "day": {"mintemp_c": 6.0 + day, "maxtemp_c": 14.0 + day, "condition": condition},
+            }
+            for day in range(days)
+        ]},
+    }
+
+
+# Request handler that mimics the current.json and forecast.json endpoints
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Allow keep-alive connections
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls on kept-alive connections
+    delay = 0.0  # Simulated upstream latency in seconds
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        time.sleep(self.delay)
+        city = query.get('q', [''])[0]
+        payload = forecast_payload(city, int(query.get('days', ['5'])[0]))
+        if url.path.endswith('/current.json'):
+            payload.pop('forecast')
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+# Threaded stub server with a listen backlog large enough for concurrent dashboard lookups
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 256
+
+
+# Start the stub server on a free local port in a background thread
+def start_stub(delay=0.0):
+    handler = type('Handler', (StubHandler,), {'delay': delay})
+    server = StubServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Set up Django and point the weather client at the stub
+def setup_django(server):
+    import django
+    from django.conf import settings
+    from django.test.utils import setup_test_environment
+    # Disable the weather cache so every request reaches the stub
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    django.setup()
+    setup_test_environment()  # Allows the 'testserver' host used by the test client
+    settings.WEATHER_RECORD_HISTORY = False  # Keep the benchmark free of database writes
+    settings.WEATHER_API_KEY = 'benchmark'
+    settings.WEATHER_API_BASE_URL = f"http://127.0.0.1:{server.server_port}/v1"
+    # Rebuild the shared client, which was created at startup with the original settings
+    from weather_app import weather_client
+    weather_client.configure()
+
+
+# Return the pct-th percentile of a list of samples (nearest rank)
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+# Send the same form count times (POST by default) and return the latencies in milliseconds
+def time_requests(client, path, form, count, method='post'):
+    send = getattr(client, method)
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = send(path, data=form)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return latencies
+
+
+def report(label, latencies):
+    print(f"{label:<28} p50={percentile(latencies, 50):7.2f} ms  p99={percentile(latencies, 99):7.2f} ms")
+
+
+# Compare per-request overhead with connection pooling on and off
+def bench_pooling(args):
+    server = start_stub(args.delay)
+    setup_django(server)
+    from django.conf import settings
+    from django.test import Client
+    from weather_app import weather_client
+
+    client = Client()
+    for pooling in (False, True):
+        settings.WEATHER_API_POOLING = pooling
+        weather_client.configure()
+        label = 'pooled' if pooling else 'unpooled'
+        report(f"1 city ({label})", time_requests(client, '/', {'city1': 'London'}, args.requests))
+        report(f"2 cities ({label})", time_requests(client, '/', {'city1': 'London', 'city2': 'Paris'}, args.requests))
+
+    server.shutdown()
+
+
+# Dashboard latency for growing city lists, fanned out and one city at a time
+def bench_dashboard(args):
+    server = start_stub(args.delay)
+    setup_django(server)
+    from concurrent.futures import ThreadPoolExecutor
+    from django.conf import settings
+    from django.test import Client
+    from weather_app import dashboard
+
+    settings.WEATHER_DASHBOARD_MAX_CITIES = max(args.cities)
+    settings.WEATHER_DASHBOARD_DEADLINE = 60
+    client = Client()
+    concurrent_executor = dashboard.executor
+    print(f"upstream delay {args.delay * 1000:.0f} ms, concurrency {settings.WEATHER_DASHBOARD_CONCURRENCY} (caching disabled)")
+    for count in args.cities:
+        form = {'cities': ','.join(f"City {number}" for number in range(count))}
+        for label, executor in (('concurrent', concurrent_executor), ('sequential', ThreadPoolExecutor(max_workers=1))):
+            dashboard.executor = executor
+            assert not client.get('/api/weather/', form).json()['failed']
+            report(f"{count} cities ({label})", time_requests(client, '/api/weather/', form, args.requests, 'get'))
+
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pooling = subparsers.add_parser('pooling', help='p50/p99 latency with pooling on and off')
+    pooling.add_argument('--requests', type=int, default=200)
+    pooling.add_argument('--delay', type=float, default=0.005)
+    pooling.set_defaults(func=bench_pooling)
+
+    dashboard = subparsers.add_parser('dashboard', help='dashboard latency for 10/50/200 cities')
+    dashboard.add_argument('--requests', type=int, default=5)
+    dashboard.add_argument('--delay', type=float, default=0.05)
+    dashboard.add_argument('--cities', type=int, nargs='+', default=[10, 50, 200])
+    dashboard.set_defaults(func=bench_dashboard)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
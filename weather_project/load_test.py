@@ -0,0 +1,161 @@
+"""
+Load test comparing the sync views under WSGI with the async views under ASGI,
+against a local stub of weatherapi.com with simulated latency.
+
+Starts the stub, then serves the project with gunicorn (sync workers, one
+request per worker at a time) and with uvicorn (a single async worker), and
+drives the dashboard JSON API with concurrent clients. Caching and history
+recording are disabled so every request waits on the stub.
+
+Requires gunicorn and uvicorn (and aiohttp for the async views):
+    pip install gunicorn uvicorn aiohttp
+
+Usage:
+    python load_test.py [--clients 50] [--duration 5] [--latency 0.1]
+                        [--cities 2] [--wsgi-workers 4]
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlencode
+
+# Reuse the weatherapi.com stub and percentile helper from the benchmarks
+from benchmark import percentile, start_stub
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Settings module for the servers: the project settings pointed at the stub
+SETTINGS = """
+from weather_project.settings import *
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1']
+WEATHER_API_KEY = 'load-test'
+WEATHER_API_BASE_URL = {base_url!r}
+WEATHER_RECORD_HISTORY = False
+CACHES = {{'default': {{'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}}}
+"""
+
+
+# Return a free local port
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# Wait until a server accepts connections on port
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+# Run clients threads requesting url for duration seconds and return the latencies in milliseconds
+def drive(url, clients, duration):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        nonlocal errors
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=60) as response:
+                    response.read()
+            except OSError:
+                with lock:
+                    errors += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def report(label, latencies, errors, duration):
+    if not latencies:
+        print(f"{label:<34} no requests completed ({errors} errors)")
+        return
+    print(f"{label:<34} {len(latencies) / duration:8.1f} req/s  "
+          f"p50={percentile(latencies, 50):8.2f} ms  p99={percentile(latencies, 99):8.2f} ms  errors={errors}")
+
+
+# Serve the project with command, drive it and stop it again
+def run_server(label, command, port, env, url, args):
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env)
+    try:
+        wait_for_port(port, process)
+        latencies, errors = drive(url.format(port=port), args.clients, args.duration)
+        report(label, latencies, errors, args.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--cities', type=int, default=2, help='cities per request')
+    parser.add_argument('--wsgi-workers', type=int, default=4)
+    args = parser.parse_args()
+
+    stub = start_stub(args.latency)
+    query = urlencode({'cities': ','.join(f"City {number}" for number in range(args.cities))})
+    url = f"http://127.0.0.1:{{port}}/api/weather/?{query}"
+
+    with tempfile.TemporaryDirectory() as settings_dir:
+        Path(settings_dir, 'load_test_settings.py').write_text(
+            SETTINGS.format(base_url=f"http://127.0.0.1:{stub.server_port}/v1")
+        )
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE='load_test_settings',
+            PYTHONPATH=os.pathsep.join([settings_dir, str(BASE_DIR)]),
+        )
+        print(f"{args.clients} clients, {args.cities} cities per request, upstream latency {args.latency * 1000:.0f} ms")
+
+        port = free_port()
+        run_server(
+            f"WSGI gunicorn ({args.wsgi_workers} sync workers)",
+            [sys.executable, '-m', 'gunicorn', 'weather_project.wsgi:application',
+             '--workers', str(args.wsgi_workers), '--bind', f"127.0.0.1:{port}", '--log-level', 'warning'],
+            port, env, url, args,
+        )
+
+        port = free_port()
+        run_server(
+            "ASGI uvicorn (1 async worker)",
+            [sys.executable, '-m', 'uvicorn', 'weather_project.asgi:application',
+             '--port', str(port), '--workers', '1', '--log-level', 'warning', '--no-access-log'],
+            port, env, url, args,
+        )
+
+    stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,27 @@
 from django.contrib import admin
 
+# Import the weather models
+from .models import City, Forecast, Observation
+
 # Register models here.
+
+
+@admin.register(City)
+class CityAdmin(admin.ModelAdmin):
+    list_display = ("name", "country", "key")
+    search_fields = ("name", "key")
+
+
+@admin.register(Observation)
+class ObservationAdmin(admin.ModelAdmin):
+    list_display = ("city", "observed_at", "temp_c", "description")
+    list_filter = ("city",)
+    date_hierarchy = "observed_at"
+    list_select_related = ("city",)
+
+
+@admin.register(Forecast)
+class ForecastAdmin(admin.ModelAdmin):
+    list_display = ("city", "date", "min_temp_c", "max_temp_c", "description", "fetched_at")
+    list_filter = ("city",)
+    list_select_related = ("city",)
@@ -1,6 +1,12 @@
+# Import logging and threading to warm the cache in the background at startup
+import logging
+import threading
+
 # Import the AppConfig class from the Django apps module
 from django.apps import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 # Define the configuration class for the weather application
 class WeatherAppConfig(AppConfig):
@@ -9,3 +15,28 @@ class WeatherAppConfig(AppConfig):
     
     # Set the name of the application. This should match the name of the app's folder
     name = 'weather_app'
+
+
+    # Called once when Django starts: load the API configuration and create the shared HTTP client
+    def ready(self):
+        from . import weather_client
+        weather_client.configure()
+
+        # Warm this process's cache in the background, for per-process caches the command cannot reach
+        from django.conf import settings
+        if settings.WEATHER_WARM_ON_STARTUP:
+            threading.Thread(target=warm_popular_cities, name="weather-cache-warmer", daemon=True).start()
+
+
+# Fetch the popular cities (WEATHER_POPULAR_CITIES) into the cache, logging failures
+def warm_popular_cities():
+    from django.conf import settings
+    from . import gazetteer, weather_cache, weather_client
+    from .views import fetch_weather_and_forecast
+
+    cities = [gazetteer.canonicalise(city) for city in settings.WEATHER_POPULAR_CITIES]
+    client = weather_client.get_client()
+    errors = weather_cache.warm(cities, lambda city: fetch_weather_and_forecast(city, client))
+    for city, error in errors.items():
+        if error is not None:
+            logger.warning("Failed to warm %s: %s", city, error)
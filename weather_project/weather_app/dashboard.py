@@ -0,0 +1,119 @@
+# Import asyncio for the async dashboard
+import asyncio
+
+# Import the thread pool executor and wait to fan lookups out under a deadline
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Import sync_to_async to use the cache from the async dashboard
+from asgiref.sync import sync_to_async
+
+# Import Django settings to read the dashboard limits
+from django.conf import settings
+
+# Import the weather cache for batched lookups and storing fetched cities, the gazetteer,
+# and history to close the database connections of worker threads
+from . import gazetteer, history, weather_cache
+
+# Shared worker threads for dashboard lookups; their number caps concurrent upstream requests
+# across all dashboard requests, so a large city list cannot flood the weather API
+executor = ThreadPoolExecutor(
+    max_workers=settings.WEATHER_DASHBOARD_CONCURRENCY, thread_name_prefix="weather-dashboard"
+)
+
+
+# Split city lists into canonical names, dropping blanks and duplicates ("London" and " london" are one city)
+# Lists are comma-separated ("London,Paris"), or semicolon-separated when names are qualified
+# ("London, UK; Portland, ME")
+def parse_cities(values):
+    cities, seen = [], set()
+    for value in values:
+        for city in value.split(";" if ";" in value else ","):
+            city = gazetteer.canonicalise(city)
+            key = city.lower()
+            if city and key not in seen:
+                seen.add(key)
+                cities.append(city)
+    return cities
+
+
+# Join cities into a list that parse_cities reads back as the same cities; canonical names contain
+# commas ("London, United Kingdom"), so those lists are separated with semicolons
+def format_cities(cities):
+    return ("; " if any("," in city for city in cities) else ", ").join(cities)
+
+
+# Fetch a city upstream and cache it, so cities that miss the deadline are cached for the next request
+def fetch_and_store(city, fetch):
+    weather_data, daily_forecasts = fetch(city)
+    weather_cache.store(city, weather_data, daily_forecasts)
+    return weather_data, daily_forecasts
+
+
+# Return the weather of every city, in order, as dicts with city, status, weather and forecast
+# status is "cached" or "fetched", or "error" or "timeout" (with weather and forecast set to None)
+# fetch(city) performs the upstream request and returns (weather_data, daily_forecasts)
+def load(cities, fetch, deadline=None):
+    if deadline is None:
+        deadline = settings.WEATHER_DASHBOARD_DEADLINE
+
+    # Serve as many cities as possible from one cache round trip, then fetch the rest concurrently
+    found = weather_cache.lookup_many(cities)
+    futures = {
+        city: executor.submit(history.close_connection_after, fetch_and_store, city, fetch)
+        for city in cities if city not in found
+    }
+    wait(futures.values(), timeout=deadline)
+
+    results = []
+    for city in cities:
+        result = {"city": city, "status": "cached", "weather": None, "forecast": None}
+        future = futures.get(city)
+        if future is None:
+            result["weather"], result["forecast"] = found[city]
+        elif not future.done():
+            future.cancel()  # Drop lookups that are still queued
+            result["status"] = "timeout"
+        elif future.exception() is not None:
+            result["status"] = "error"
+        else:
+            result["status"] = "fetched"
+            result["weather"], result["forecast"] = future.result()
+        results.append(result)
+    return results
+
+
+# Async version of fetch_and_store; fetch(city) is a coroutine function
+async def afetch_and_store(city, fetch):
+    weather_data, daily_forecasts = await fetch(city)
+    await sync_to_async(weather_cache.store)(city, weather_data, daily_forecasts)
+    return weather_data, daily_forecasts
+
+
+# Async version of load, for the ASGI views; fetch(city) is a coroutine function
+# Concurrency is capped by the async client's connection limit instead of a thread pool,
+# and lookups that miss the deadline are cancelled, freeing their connections
+async def aload(cities, fetch, deadline=None):
+    if deadline is None:
+        deadline = settings.WEATHER_DASHBOARD_DEADLINE
+
+    found = await sync_to_async(weather_cache.lookup_many)(cities)
+    tasks = {city: asyncio.ensure_future(afetch_and_store(city, fetch)) for city in cities if city not in found}
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=deadline)
+
+    results = []
+    for city in cities:
+        result = {"city": city, "status": "cached", "weather": None, "forecast": None}
+        task = tasks.get(city)
+        if task is None:
+            result["weather"], result["forecast"] = found[city]
+        elif not task.done():
+            task.cancel()
+            result["status"] = "timeout"
+        elif task.exception() is not None:
+            result["status"] = "error"
+        else:
+            result["status"] = "fetched"
+            result["weather"], result["forecast"] = task.result()
+        results.append(result)
+    return results
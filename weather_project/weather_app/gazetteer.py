@@ -0,0 +1,248 @@
+# Import the modules needed to read the bundled city dataset and search it
+import bisect
+import csv
+import gzip
+import heapq
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+# Import Django settings to find the city dataset
+from django.conf import settings
+
+# Directory holding the bundled datasets (cities from GeoNames, see README)
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+# Country names and codes, used to read qualifiers such as "London, GB" or "London, United Kingdom"
+COUNTRIES_PATH = DATA_DIR / "countries.csv"
+
+# Common qualifiers that are not a country code or name
+COUNTRY_ALIASES = {
+    "uk": "GB", "england": "GB", "scotland": "GB", "wales": "GB", "northern ireland": "GB",
+    "usa": "US", "america": "US", "united states of america": "US",
+}
+
+# Countries whose cities are labelled with their state code ("Portland, OR, United States")
+ADMIN1_LABELS = {"US"}
+
+# Number of similar names compared with a misspelt input
+FUZZY_CANDIDATES = 50
+
+# Number of autocomplete suggestions precomputed for each one- and two-letter prefix
+PRECOMPUTED_SUGGESTIONS = 10
+
+
+# A city from the gazetteer
+class City(NamedTuple):
+    name: str
+    country_code: str
+    country: str
+    admin1: str
+    latitude: float
+    longitude: float
+    population: int
+
+    # Canonical name sent upstream and used for cache and history keys
+    @property
+    def label(self):
+        if self.country_code in ADMIN1_LABELS and self.admin1:
+            return f"{self.name}, {self.admin1}, {self.country}"
+        return f"{self.name}, {self.country}"
+
+
+# Fold a name for matching: accents removed, case folded, punctuation and extra spaces dropped
+# ("  Zürich " -> "zurich", "St. Louis" -> "st louis")
+def normalise(text):
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    return " ".join("".join(char if char.isalnum() else " " for char in folded).split())
+
+
+# Return the trigrams of a normalised name, padded so that first and last letters count
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+# Return the optimal string alignment distance between a and b (edits, with adjacent swaps
+# counting as one), or limit + 1 as soon as it is known to exceed limit
+def edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+# Read the countries file into {code: (iso3, name)}
+def read_countries(path=COUNTRIES_PATH):
+    with open(path, encoding="utf-8", newline="") as countries_file:
+        return {row["code"]: (row["iso3"], row["name"]) for row in csv.DictReader(countries_file)}
+
+
+# Read a gzipped city dataset (as written by the build_gazetteer command)
+# Returns (city, key, aliases) for each city, with the name and aliases already normalised
+def read_cities(path, countries):
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as cities_file:
+        return [
+            (
+                City(
+                    name=row["name"],
+                    country_code=row["country_code"],
+                    country=countries.get(row["country_code"], ("", row["country_code"]))[1],
+                    admin1=row["admin1_code"],
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                    population=int(row["population"]),
+                ),
+                row["key"],
+                row["aliases"].split("|") if row["aliases"] else [],
+            )
+            for row in csv.DictReader(cities_file)
+        ]
+
+
+# An in-memory index of cities for canonicalising user input and autocomplete
+class Gazetteer:
+    # entries are (city, key, aliases) tuples as returned by read_cities
+    def __init__(self, entries, countries):
+        # Most populous first, so every list below is ordered by population
+        entries = sorted(entries, key=lambda entry: -entry[0].population)
+        self.cities = [city for city, _, _ in entries]
+
+        # Cities by normalised name and by alternate name ("bombay", "new york"), for exact lookups
+        self.by_key, self.by_alias = {}, {}
+        for city, key, aliases in entries:
+            self.by_key.setdefault(key, []).append(city)
+            for alias in aliases:
+                self.by_alias.setdefault(alias, []).append(city)
+
+        # Sorted names for prefix search; entries are (key, rank) so equal names keep population order
+        self.prefix_entries = sorted((key, rank) for rank, (_, key, _) in enumerate(entries))
+        self.prefix_keys = [key for key, _ in self.prefix_entries]
+
+        # Short prefixes match thousands of names, so their top suggestions are computed up front;
+        # cities are visited most populous first, so the first ones seen for a prefix are its top ones
+        self.top_by_prefix = {}
+        for rank, (_, key, _) in enumerate(entries):
+            for prefix in {key[:1], key[:2]}:
+                top = self.top_by_prefix.setdefault(prefix, [])
+                if len(top) < PRECOMPUTED_SUGGESTIONS:
+                    top.append(rank)
+
+        # Trigram index over distinct names, for finding misspelt names
+        self.names = list(self.by_key)
+        self.name_trigrams = {}
+        for index, key in enumerate(self.names):
+            for trigram in trigrams(key):
+                self.name_trigrams.setdefault(trigram, []).append(index)
+
+        # Qualifier spellings ("gb", "gbr", "united kingdom", "uk") by country code
+        self.country_codes = dict(COUNTRY_ALIASES)
+        for code, (iso3, name) in countries.items():
+            self.country_codes[code.lower()] = code
+            self.country_codes[iso3.lower()] = code
+            self.country_codes[normalise(name)] = code
+
+    # Load the gazetteer from a gzipped city dataset and the bundled countries
+    @classmethod
+    def load(cls, path):
+        countries = read_countries()
+        return cls(read_cities(path, countries), countries)
+
+    # Return the cities whose name or alternate name is exactly key, most populous first
+    def candidates(self, key):
+        return self.by_key.get(key) or self.by_alias.get(key) or []
+
+    # Return the cities whose name is within a small edit distance of key, closest first and then
+    # most populous first. Only for "did you mean" suggestions: the dataset holds cities of 50,000
+    # people or more, so a small town is usually close to some other city ("Aspen" -> "Assen")
+    def similar(self, key):
+        if len(key) < 4:
+            return []
+
+        # One typo for short names, two for long ones ("Lodnon" -> "London", but not "Atlantis" -> "Atlanta")
+        limit = 1 if len(key) <= 8 else 2
+
+        # Names sharing enough trigrams with the input; each edit changes at most four trigrams
+        query_trigrams = trigrams(key)
+        shared = Counter(index for trigram in query_trigrams for index in self.name_trigrams.get(trigram, ()))
+        needed = len(query_trigrams) - 4 * limit
+
+        # Only the names sharing the most trigrams are compared, which keeps misses fast
+        best, matches = limit + 1, []
+        for index, count in shared.most_common(FUZZY_CANDIDATES):
+            if count < needed:
+                break
+            distance = edit_distance(key, self.names[index], best)
+            if distance < best:
+                best, matches = distance, [index]
+            elif distance == best and distance <= limit:
+                matches.append(index)
+        return sorted((city for index in matches for city in self.by_key[self.names[index]]), key=lambda city: -city.population)
+
+    # Return the most populous city whose name or alternate name matches a query such as "london",
+    # "London, UK" or "Portland, ME", or None if the query matches no city exactly
+    def resolve(self, query):
+        name, *qualifiers = query.split(",")
+        qualifiers = [normalise(qualifier) for qualifier in qualifiers if normalise(qualifier)]
+        for city in self.candidates(normalise(name)):
+            if all(self.qualifies(city, qualifier) for qualifier in qualifiers):
+                return city
+        return None
+
+    # Return True if a qualifier names the city's country or state
+    def qualifies(self, city, qualifier):
+        return self.country_codes.get(qualifier) == city.country_code or qualifier == city.admin1.lower()
+
+    # Return up to limit cities whose name starts with prefix, most populous first; if none does,
+    # the cities with a similar name, so a misspelt name ("Lodnon") still gets suggestions
+    def suggest(self, prefix, limit=10):
+        key = normalise(prefix)
+        if not key:
+            return []
+        if key in self.top_by_prefix and limit <= PRECOMPUTED_SUGGESTIONS:
+            return [self.cities[rank] for rank in self.top_by_prefix[key][:limit]]
+        start = bisect.bisect_left(self.prefix_keys, key)
+        end = bisect.bisect_left(self.prefix_keys, key + "\uffff", start)
+        ranks = heapq.nsmallest(limit, (rank for _, rank in self.prefix_entries[start:end]))
+        if not ranks:
+            return self.similar(key)[:limit]
+        return [self.cities[rank] for rank in ranks]
+
+
+# The shared gazetteer, loaded on first use
+_gazetteer = None
+_lock = threading.Lock()
+
+
+# Return the shared gazetteer, or None if WEATHER_GAZETTEER_CITIES is not set
+def get_gazetteer():
+    global _gazetteer
+    path = settings.WEATHER_GAZETTEER_CITIES
+    if not path:
+        return None
+    if _gazetteer is None:
+        with _lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer.load(path)
+    return _gazetteer
+
+
+# Return the canonical name for user input, so "london", "London " and "London, UK" become
+# "London, United Kingdom"; input that matches no city is returned with its whitespace tidied
+def canonicalise(query):
+    gazetteer = get_gazetteer()
+    city = gazetteer.resolve(query) if gazetteer is not None else None
+    return city.label if city is not None else " ".join(query.split())
@@ -0,0 +1,100 @@
+# Import the datetime module to convert API timestamps
+import datetime
+
+# Import Django's database utilities, aggregates and timezone helpers
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# Import the models storing cities, observations and forecasts
+from .models import City, Forecast, Observation
+
+
+# Build the normalised lookup key for a city name ("  New  York" -> "new york")
+def city_key(city):
+    return " ".join(city.lower().split())
+
+
+# Run func(*args) in a thread pool worker and then close the worker's database connection
+# Django closes connections only at the end of a request, so a worker thread that records
+# history would otherwise keep its own connection open for as long as the pool lives
+def close_connection_after(func, *args):
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+# Save the current weather and daily forecasts from a forecast.json response
+def record(city, response):
+    now = timezone.now()
+    location = response.get("location", {})
+    current = response["current"]
+
+    # Use the API's own update time so repeated lookups of the same observation are stored once
+    if "last_updated_epoch" in current:
+        observed_at = datetime.datetime.fromtimestamp(current["last_updated_epoch"], tz=datetime.timezone.utc)
+    else:
+        observed_at = now
+
+    try:
+        with transaction.atomic():
+            city_row, _ = City.objects.get_or_create(
+                key=city_key(city),
+                defaults={"name": location.get("name", city), "country": location.get("country", "")},
+            )
+
+            # Insert the observation, skipping it if it was already stored
+            Observation.objects.bulk_create([
+                Observation(
+                    city=city_row,
+                    observed_at=observed_at,
+                    temp_c=current["temp_c"],
+                    feelslike_c=current.get("feelslike_c"),
+                    humidity=current.get("humidity"),
+                    wind_kph=current.get("wind_kph"),
+                    description=current["condition"]["text"],
+                    icon_url=current["condition"]["icon"],
+                )
+            ], ignore_conflicts=True)
+
+            # Insert or update all forecast days in a single statement
+            Forecast.objects.bulk_create([
+                Forecast(
+                    city=city_row,
+                    date=datetime.date.fromisoformat(daily_data["date"]),
+                    min_temp_c=daily_data["day"]["mintemp_c"],
+                    max_temp_c=daily_data["day"]["maxtemp_c"],
+                    description=daily_data["day"]["condition"]["text"],
+                    icon_url=daily_data["day"]["condition"]["icon"],
+                    fetched_at=now,
+                )
+                for daily_data in response["forecast"]["forecastday"]
+            ], update_conflicts=True, unique_fields=["city", "date"],
+                update_fields=["min_temp_c", "max_temp_c", "description", "icon_url", "fetched_at"])
+    except DatabaseError:
+        # History is best effort; never fail the page because it could not be saved
+        return False
+    return True
+
+
+# Return min/max/average temperature per day for a city over the last `days` days
+def daily_summary(city, days=90):
+    since = timezone.now() - datetime.timedelta(days=days)
+
+    # Filtering on city and observed_at uses the (city, observed_at) index, so only
+    # the requested city's rows in the time range are read
+    return list(
+        Observation.objects
+        .filter(city__key=city_key(city), observed_at__gte=since)
+        .annotate(day=TruncDate("observed_at"))
+        .values("day")
+        .annotate(
+            min_temp=Min("temp_c"),
+            max_temp=Max("temp_c"),
+            avg_temp=Avg("temp_c"),
+            observations=Count("id"),
+        )
+        .order_by("day")
+    )
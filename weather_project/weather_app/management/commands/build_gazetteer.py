@@ -0,0 +1,78 @@
+# Import the modules needed to read a GeoNames dump and write the gazetteer dataset
+import csv
+import gzip
+import re
+import sys
+
+# Import the base class for management commands
+from django.core.management.base import BaseCommand
+
+# Import Django settings for the default output path
+from django.conf import settings
+
+# Import the name normalisation used for lookups and the edit distance
+from weather_app.gazetteer import edit_distance, normalise
+
+# Columns of the GeoNames cities dumps (cities500.txt ... cities15000.txt)
+GEONAMES_COLUMNS = [
+    "geonameid", "name", "asciiname", "alternatenames", "latitude", "longitude", "feature_class",
+    "feature_code", "country_code", "cc2", "admin1_code", "admin2_code", "admin3_code", "admin4_code",
+    "population", "elevation", "dem", "timezone", "modification_date",
+]
+
+# Alternate names kept as aliases: capitalised Latin-script names of up to three words ("Bombay", "New York")
+ALIAS_PATTERN = re.compile(r"^[A-Z][A-Za-z.'\-]*( [A-Z][A-Za-z.'\-]*){0,2}$")
+
+# Aliases must be at least this long and this many edits away from the city's name. Shorter names and
+# spelling variants ("Sion" for Jerusalem, "Kendal" for Kendall) are often the names of smaller towns
+# missing from the dataset, which would otherwise be rewritten into the city
+MIN_ALIAS_LENGTH = 5
+MIN_ALIAS_DISTANCE = 3
+
+# Sections of a city (e.g. the arrondissements of Paris) are not looked up on their own
+SKIPPED_FEATURE_CODES = {"PPLX"}
+
+
+# Return True if a normalised alternate name is kept as an alias of the city named key
+def useful_alias(alias, key):
+    return len(alias) >= MIN_ALIAS_LENGTH and edit_distance(alias, key, MIN_ALIAS_DISTANCE - 1) >= MIN_ALIAS_DISTANCE
+
+
+# Command that builds the bundled city dataset from a GeoNames dump
+class Command(BaseCommand):
+    help = "Build the gazetteer dataset (WEATHER_GAZETTEER_CITIES) from a GeoNames cities dump."
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="GeoNames dump, e.g. cities15000.txt from https://download.geonames.org/export/dump/")
+        parser.add_argument("--min-population", type=int, default=50000, help="Skip smaller cities")
+        parser.add_argument("--output", help="Output file (defaults to WEATHER_GAZETTEER_CITIES)")
+
+    def handle(self, *args, **options):
+        csv.field_size_limit(sys.maxsize)  # Some alternate name lists are very long
+        with open(options["source"], encoding="utf-8", newline="") as source:
+            rows = [
+                row for row in csv.DictReader(source, fieldnames=GEONAMES_COLUMNS, delimiter="\t", quoting=csv.QUOTE_NONE)
+                if int(row["population"] or 0) >= options["min_population"]
+                and row["feature_code"] not in SKIPPED_FEATURE_CODES
+            ]
+        rows.sort(key=lambda row: (-int(row["population"]), row["name"]))
+
+        # An alias that is another city's name would shadow that city, so those are dropped
+        names = {normalise(row["name"]) for row in rows}
+
+        output = options["output"] or settings.WEATHER_GAZETTEER_CITIES
+        with gzip.open(output, "wt", encoding="utf-8", newline="", compresslevel=9) as dataset:
+            writer = csv.writer(dataset, lineterminator="\n")
+            writer.writerow(["name", "key", "country_code", "admin1_code", "latitude", "longitude", "population", "aliases"])
+            for row in rows:
+                key = normalise(row["name"])
+                aliases = sorted(alias for alias in {
+                    normalise(alias) for alias in row["alternatenames"].split(",") if ALIAS_PATTERN.match(alias)
+                } - names - {key} if useful_alias(alias, key))
+                writer.writerow([
+                    row["name"], key, row["country_code"], row["admin1_code"],
+                    round(float(row["latitude"]), 4), round(float(row["longitude"]), 4),
+                    row["population"], "|".join(aliases),
+                ])
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(rows)} cities to {output}"))
@@ -0,0 +1,46 @@
+# Import the base class for management commands and the error it reports
+from django.core.management.base import BaseCommand, CommandError
+
+# Import Django settings to read the list of popular cities
+from django.conf import settings
+
+# Import the gazetteer, weather client, cache and fetch helper
+from weather_app import gazetteer, weather_cache, weather_client
+from weather_app.views import fetch_weather_and_forecast
+
+
+# Command that pre-loads the weather cache for popular cities
+class Command(BaseCommand):
+    help = (
+        "Fetch weather for popular cities (WEATHER_POPULAR_CITIES) and store it in the cache. "
+        "Needs a cache shared with the server (file-based, database, Redis, Memcached)."
+    )
+
+    def add_arguments(self, parser):
+        # Optional list of cities overriding WEATHER_POPULAR_CITIES
+        parser.add_argument("cities", nargs="*", help="Cities to warm (defaults to WEATHER_POPULAR_CITIES)")
+        parser.add_argument("--workers", type=int, default=8, help="Number of concurrent upstream requests")
+
+    def handle(self, *args, **options):
+        # A per-process cache would be filled in this process only, and lost when it exits
+        if not weather_cache.is_shared():
+            raise CommandError(
+                f"The cache backend ({settings.CACHES['default']['BACKEND']}) is per process, so warming it "
+                "from a command has no effect on the server. Switch CACHES to a shared backend, or set "
+                "WEATHER_WARM_ON_STARTUP to warm each server process when it starts."
+            )
+
+        # Warm the canonical names, which are what the views look up
+        cities = [gazetteer.canonicalise(city) for city in options["cities"] or settings.WEATHER_POPULAR_CITIES]
+        client = weather_client.get_client()
+        errors = weather_cache.warm(
+            cities, lambda city: fetch_weather_and_forecast(city, client), workers=options["workers"],
+        )
+
+        for city, error in errors.items():
+            if error is None:
+                self.stdout.write(f"Warmed {city}")
+            else:
+                self.stderr.write(f"Failed to warm {city}: {error}")
+        failed = sum(error is not None for error in errors.values())
+        self.stdout.write(self.style.SUCCESS(f"Warmed {len(cities) - failed} of {len(cities)} cities"))
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='City',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=200, unique=True)),
+                ('name', models.CharField(max_length=200)),
+                ('country', models.CharField(blank=True, max_length=200)),
+            ],
+            options={
+                'verbose_name_plural': 'cities',
+            },
+        ),
+        migrations.CreateModel(
+            name='Observation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('observed_at', models.DateTimeField()),
+                ('temp_c', models.FloatField()),
+                ('feelslike_c', models.FloatField(blank=True, null=True)),
+                ('humidity', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('wind_kph', models.FloatField(blank=True, null=True)),
+                ('description', models.CharField(max_length=200)),
+                ('icon_url', models.CharField(blank=True, max_length=300)),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observations', to='weather_app.city')),
+            ],
+            options={
+                'ordering': ['-observed_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Forecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('min_temp_c', models.FloatField()),
+                ('max_temp_c', models.FloatField()),
+                ('description', models.CharField(max_length=200)),
+                ('icon_url', models.CharField(blank=True, max_length=300)),
+                ('fetched_at', models.DateTimeField()),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='forecasts', to='weather_app.city')),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='observation',
+            constraint=models.UniqueConstraint(fields=('city', 'observed_at'), name='unique_city_observation'),
+        ),
+        migrations.AddConstraint(
+            model_name='forecast',
+            constraint=models.UniqueConstraint(fields=('city', 'date'), name='unique_city_forecast_date'),
+        ),
+    ]
@@ -1,3 +1,73 @@
 from django.db import models
 
 # Create models here.
+
+
+# A city that weather has been looked up for
+class City(models.Model):
+    # Normalised lookup name ("new york"), used to match user input
+    key = models.CharField(max_length=200, unique=True)
+
+    # Name as returned by the weather API ("New York")
+    name = models.CharField(max_length=200)
+
+    # Country as returned by the weather API
+    country = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        verbose_name_plural = "cities"
+
+    def __str__(self):
+        return f"{self.name}, {self.country}" if self.country else self.name
+
+
+# The current weather of a city at a point in time
+class Observation(models.Model):
+    city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="observations")
+
+    # Time the weather API last updated the observation
+    observed_at = models.DateTimeField()
+
+    temp_c = models.FloatField()
+    feelslike_c = models.FloatField(null=True, blank=True)
+    humidity = models.PositiveSmallIntegerField(null=True, blank=True)
+    wind_kph = models.FloatField(null=True, blank=True)
+    description = models.CharField(max_length=200)
+    icon_url = models.CharField(max_length=300, blank=True)
+
+    class Meta:
+        # The API returns the same observation until it updates, so store each one once
+        constraints = [
+            models.UniqueConstraint(fields=["city", "observed_at"], name="unique_city_observation"),
+        ]
+        # History queries filter by city and a time range; the unique constraint's
+        # index on (city, observed_at) serves them without scanning the whole table
+        ordering = ["-observed_at"]
+
+    def __str__(self):
+        return f"{self.city} at {self.observed_at}: {self.temp_c}°C"
+
+
+# A daily forecast for a city, as last fetched
+class Forecast(models.Model):
+    city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="forecasts")
+
+    # Day the forecast is for
+    date = models.DateField()
+
+    min_temp_c = models.FloatField()
+    max_temp_c = models.FloatField()
+    description = models.CharField(max_length=200)
+    icon_url = models.CharField(max_length=300, blank=True)
+
+    # Time the forecast was fetched; newer fetches replace older ones
+    fetched_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["city", "date"], name="unique_city_forecast_date"),
+        ]
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.city} on {self.date}: {self.min_temp_c}-{self.max_temp_c}°C"
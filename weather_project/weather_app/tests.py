@@ -1,3 +1,402 @@
-from django.test import TestCase
+# Import the modules needed to load recorded API responses and simulate slow requests
+import asyncio
+import datetime
+import importlib.util
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from . import apps, dashboard, gazetteer, history, views, weather_cache, weather_client
+from .models import City, Forecast, Observation
+
+# Directory holding recorded weatherapi.com responses
+TEST_DATA = Path(__file__).resolve().parent / "test_data"
+
+
+# Load a recorded forecast.json response for a city ("London" or "London, United Kingdom")
+def load_forecast(city):
+    name = city.split(",")[0].strip().lower()
+    with open(TEST_DATA / f"forecast_{name}.json") as fixture:
+        return json.load(fixture)
+
+
+# A stand-in for WeatherClient that serves recorded responses and records every call
+class RecordedClient:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, **params):
+        self.started(endpoint, params)
+        time.sleep(self.delay)
+        return self.finished(params)
+
+    def started(self, endpoint, params):
+        with self.lock:
+            self.calls.append((endpoint, params))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def finished(self, params):
+        with self.lock:
+            self.active -= 1
+        return load_forecast(params["q"])
+
+
+# The async counterpart of RecordedClient, standing in for AsyncWeatherClient
+class AsyncRecordedClient(RecordedClient):
+    async def get(self, endpoint, **params):
+        self.started(endpoint, params)
+        await asyncio.sleep(self.delay)
+        return self.finished(params)
+
+
+# Tests for fetching and parsing weather data
+@override_settings(WEATHER_RECORD_HISTORY=False)
+class FetchWeatherAndForecastTests(SimpleTestCase):
+    def test_single_forecast_request(self):
+        client = RecordedClient()
+        views.fetch_weather_and_forecast("London", client)
+        self.assertEqual(client.calls, [("forecast.json", {"q": "London", "days": 5})])
+
+    def test_current_weather_taken_from_forecast_response(self):
+        weather_data, daily_forecasts = views.fetch_weather_and_forecast("London", RecordedClient())
+        self.assertEqual(weather_data, {
+            "city": "London",
+            "temperature": 7.0,
+            "description": "Light rain",
+            "icon_url": "//cdn.weatherapi.com/weather/64x64/day/296.png",
+        })
+        self.assertEqual(len(daily_forecasts), 5)
+        self.assertEqual(daily_forecasts[0], {
+            "day": "Monday",
+            "min_temp": 3.1,
+            "max_temp": 8.2,
+            "description": "Patchy rain nearby",
+            "icon_url": "//cdn.weatherapi.com/weather/64x64/day/176.png",
+        })
+
+
+# Tests for the index view
+@override_settings(WEATHER_RECORD_HISTORY=False)
+class IndexViewTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post(self, client, data):
+        with mock.patch.object(weather_client, "get_client", return_value=client):
+            return self.client.post("/", data)
+
+    def test_one_city(self):
+        client = RecordedClient()
+        response = self.post(client, {"city1": "London"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(response.context["weather_data1"]["temperature"], 7.0)
+        self.assertIsNone(response.context["weather_data2"])
+
+    def test_two_cities_fetched_concurrently(self):
+        client = RecordedClient(delay=0.2)
+        response = self.post(client, {"city1": "London", "city2": "Paris"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(client.max_active, 2)
+        self.assertEqual(response.context["weather_data1"]["city"], "London, United Kingdom")
+        self.assertEqual(response.context["weather_data2"]["city"], "Paris, France")
+
+
+# Tests for caching weather responses
+@override_settings(WEATHER_RECORD_HISTORY=False)
+class WeatherCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def fetch(self, client):
+        return lambda city: views.fetch_weather_and_forecast(city, client)
+
+    def test_second_lookup_served_from_cache(self):
+        client = RecordedClient()
+        weather_cache.get_weather_and_forecast("London", self.fetch(client))
+        weather_data, daily_forecasts = weather_cache.get_weather_and_forecast(" london ", self.fetch(client))
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(weather_data["city"], " london ")
+        self.assertEqual(len(daily_forecasts), 5)
+        stats = weather_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_expired_current_conditions_refetched(self):
+        client = RecordedClient()
+        weather_cache.get_weather_and_forecast("London", self.fetch(client))
+        cache.delete(weather_cache.cache_key("current", "London"))
+        weather_cache.get_weather_and_forecast("London", self.fetch(client))
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(weather_cache.stats()["forecast_hits"], 1)
+
+    def test_warm_command_fills_cache(self):
+        client = RecordedClient()
+        with tempfile.TemporaryDirectory() as location:
+            shared = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}}
+            with override_settings(CACHES=shared), mock.patch.object(weather_client, "get_client", return_value=client):
+                call_command("warm_weather_cache", "London", "Paris", stdout=mock.MagicMock())
+                self.assertEqual(len(client.calls), 2)
+                weather_cache.get_weather_and_forecast("Paris, France", self.fetch(client))
+                self.assertEqual(len(client.calls), 2)
+
+    def test_warm_command_refuses_per_process_cache(self):
+        client = RecordedClient()
+        with mock.patch.object(weather_client, "get_client", return_value=client):
+            with self.assertRaisesMessage(CommandError, "per process"):
+                call_command("warm_weather_cache", "London", stdout=mock.MagicMock())
+        self.assertEqual(client.calls, [])
+
+    def test_warm_on_startup_fills_this_process(self):
+        client = RecordedClient()
+        with override_settings(WEATHER_POPULAR_CITIES=["London", "Paris"]):
+            with mock.patch.object(weather_client, "get_client", return_value=client):
+                apps.warm_popular_cities()
+        weather_cache.get_weather_and_forecast("London, United Kingdom", self.fetch(client))
+        self.assertEqual(len(client.calls), 2)
+
+
+# Tests for the multi-city dashboard and its JSON API
+@override_settings(WEATHER_RECORD_HISTORY=False)
+class DashboardTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get(self, client, path, cities):
+        with mock.patch.object(weather_client, "get_client", return_value=client):
+            return self.client.get(path, {"cities": cities})
+
+    def test_parse_cities_drops_blanks_and_duplicates(self):
+        self.assertEqual(
+            dashboard.parse_cities(["London, paris,,", " LONDON ,New  York"]),
+            ["London, United Kingdom", "Paris, France", "New York City, NY, United States"],
+        )
+
+    def test_parse_cities_with_qualified_names(self):
+        self.assertEqual(
+            dashboard.parse_cities(["London, UK; London, Canada;Portland, ME"]),
+            ["London, United Kingdom", "London, Canada", "Portland, ME, United States"],
+        )
+
+    def test_partial_results_when_a_city_fails(self):
+        # There is no recorded response for Xyzzy, so its lookup raises
+        response = self.get(RecordedClient(), "/api/weather/", "London,Xyzzy,Paris")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([result["status"] for result in data["cities"]], ["fetched", "error", "fetched"])
+        self.assertEqual(data["cities"][2]["weather"]["city"], "Paris, France")
+        self.assertEqual(data["failed"], ["Xyzzy"])
+
+    def test_cached_cities_not_refetched(self):
+        client = RecordedClient()
+        self.get(client, "/api/weather/", "London")
+        data = self.get(client, "/api/weather/", "London,Paris").json()
+        self.assertEqual([result["status"] for result in data["cities"]], ["cached", "fetched"])
+        self.assertEqual(len(client.calls), 2)
+
+    def test_concurrency_limited(self):
+        client = RecordedClient(delay=0.05)
+        with mock.patch.object(dashboard, "executor", ThreadPoolExecutor(max_workers=2)):
+            results = dashboard.load(["London", "Paris"] * 3, lambda city: views.fetch_weather_and_forecast(city, client))
+        self.assertEqual(len(results), 6)
+        self.assertEqual(client.max_active, 2)
+
+    @override_settings(WEATHER_DASHBOARD_DEADLINE=0.05)
+    def test_slow_cities_reported_as_timeout(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        with mock.patch.object(dashboard, "executor", executor):
+            response = self.get(RecordedClient(delay=0.3), "/api/weather/", "London")
+        self.assertEqual(response.json()["cities"][0]["status"], "timeout")
+        self.assertEqual(response.json()["failed"], ["London, United Kingdom"])
+        # The slow lookup still finishes in the background and fills the cache
+        executor.shutdown(wait=True)
+        self.assertIn("London, United Kingdom", weather_cache.lookup_many(["London, United Kingdom"]))
+
+    @override_settings(WEATHER_DASHBOARD_MAX_CITIES=2)
+    def test_too_many_cities_rejected(self):
+        response = self.get(RecordedClient(), "/api/weather/", "London,Paris,Tokyo")
+        self.assertEqual(response.status_code, 400)
+
+    def test_dashboard_form_round_trips(self):
+        client = RecordedClient()
+        prefill = self.get(client, "/dashboard/", "London,Paris").context["cities"]
+        self.assertEqual(dashboard.parse_cities([prefill]), ["London, United Kingdom", "Paris, France"])
+        response = self.get(client, "/dashboard/", prefill)
+        self.assertEqual(response.context["cities"], prefill)
+        self.assertEqual(len(client.calls), 2)
+
+    def test_dashboard_page(self):
+        response = self.get(RecordedClient(), "/dashboard/", "London,Paris")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Light rain")
+        self.assertEqual(len(response.context["results"]), 2)
+
+
+# Tests for the async views served under ASGI
+@override_settings(WEATHER_RECORD_HISTORY=False)
+class AsyncViewTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+
+    def patch_client(self, client):
+        return mock.patch.object(weather_client, "get_async_client", return_value=client)
+
+    async def test_index_fetches_cities_concurrently(self):
+        client = AsyncRecordedClient(delay=0.1)
+        request = self.factory.post("/", {"city1": "London", "city2": "Paris"})
+        with self.patch_client(client):
+            response = await views.index_async(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Light rain")
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(client.max_active, 2)
+
+    async def test_index_one_city_served_from_cache(self):
+        client = AsyncRecordedClient()
+        with self.patch_client(client):
+            await views.index_async(self.factory.post("/", {"city1": "London"}))
+            response = await views.index_async(self.factory.post("/", {"city1": " london"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(client.calls), 1)
+
+    async def test_api_partial_results(self):
+        client = AsyncRecordedClient()
+        with self.patch_client(client):
+            response = await views.weather_api_async(self.factory.get("/api/weather/", {"cities": "London,Xyzzy"}))
+        data = json.loads(response.content)
+        self.assertEqual([result["status"] for result in data["cities"]], ["fetched", "error"])
+        self.assertEqual(data["failed"], ["Xyzzy"])
+
+    async def test_slow_cities_reported_as_timeout(self):
+        client = AsyncRecordedClient(delay=1)
+        results = await dashboard.aload(
+            ["London"], lambda city: views.fetch_weather_and_forecast_async(city, client), deadline=0.05
+        )
+        self.assertEqual(results[0]["status"], "timeout")
+
+    @skipUnless(importlib.util.find_spec("aiohttp"), "aiohttp is not installed")
+    async def test_async_client_shared_within_event_loop(self):
+        client = weather_client.get_async_client()
+        self.assertIs(weather_client.get_async_client(), client)
+        await client.aclose()
+
+
+# Tests for canonicalising city names and autocomplete
+class GazetteerTests(SimpleTestCase):
+    def test_variants_share_one_canonical_name(self):
+        for query in ("london", " London ", "LONDON, UK", "London, GB", "London, United Kingdom"):
+            self.assertEqual(gazetteer.canonicalise(query), "London, United Kingdom")
+
+    def test_qualifiers_pick_the_city(self):
+        self.assertEqual(gazetteer.canonicalise("London, Canada"), "London, Canada")
+        self.assertEqual(gazetteer.canonicalise("Portland"), "Portland, OR, United States")
+        self.assertEqual(gazetteer.canonicalise("portland, me"), "Portland, ME, United States")
+
+    def test_accents_and_aliases(self):
+        self.assertEqual(gazetteer.canonicalise("zurich"), "Zürich, Switzerland")
+        self.assertEqual(gazetteer.canonicalise("Bombay"), "Mumbai, India")
+
+    def test_similar_names_not_rewritten(self):
+        # Towns missing from the dataset must not become a city with a similar name
+        for query in ("Aspen", "Truro", "Moab", "Davos", "Oban", "Bude", "Sion", "Tring", "Marlow", "Selby", "Kendal", "Lodnon"):
+            self.assertEqual(gazetteer.canonicalise(query), query)
+
+    def test_misspelt_names_suggested(self):
+        self.assertEqual(gazetteer.get_gazetteer().suggest("Lodnon", 1)[0].label, "London, United Kingdom")
+        self.assertEqual(gazetteer.get_gazetteer().suggest("Barcelnoa", 1)[0].label, "Barcelona, Spain")
+
+    def test_unknown_names_passed_through(self):
+        self.assertEqual(gazetteer.canonicalise("  Xyzzy  Town "), "Xyzzy Town")
+
+    @override_settings(WEATHER_GAZETTEER_CITIES=None)
+    def test_disabled(self):
+        self.assertEqual(gazetteer.canonicalise(" london "), "london")
+
+    def test_suggestions_most_populous_first(self):
+        labels = [city.label for city in gazetteer.get_gazetteer().suggest("Lon", 3)]
+        self.assertEqual(labels[0], "London, United Kingdom")
+        self.assertTrue(all(label.startswith("Lon") for label in labels))
+
+    def test_suggestions_api(self):
+        response = self.client.get("/api/cities/", {"q": "pari", "limit": 2})
+        self.assertEqual(response.json()["cities"][0]["label"], "Paris, France")
+        self.assertEqual(len(response.json()["cities"]), 2)
+
+    @override_settings(WEATHER_RECORD_HISTORY=False)
+    def test_index_variants_share_one_lookup(self):
+        cache.clear()
+        client = RecordedClient()
+        with mock.patch.object(weather_client, "get_client", return_value=client):
+            self.client.post("/", {"city1": "london"})
+            self.client.post("/", {"city1": "London, UK "})
+        self.assertEqual(client.calls, [("forecast.json", {"q": "London, United Kingdom", "days": 5})])
+
+
+# Tests for persisting observations and the history view
+class HistoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_fetch_records_observation_and_forecasts(self):
+        views.fetch_weather_and_forecast("London", RecordedClient())
+        city = City.objects.get(key="london")
+        self.assertEqual(city.name, "London")
+        observation = city.observations.get()
+        self.assertEqual(observation.temp_c, 7.0)
+        self.assertEqual(observation.observed_at, datetime.datetime(2025, 1, 6, 8, tzinfo=datetime.timezone.utc))
+        self.assertEqual(city.forecasts.count(), 5)
+
+    def test_repeated_fetch_does_not_duplicate_rows(self):
+        views.fetch_weather_and_forecast("London", RecordedClient())
+        views.fetch_weather_and_forecast(" LONDON ", RecordedClient())
+        self.assertEqual(City.objects.count(), 1)
+        self.assertEqual(Observation.objects.count(), 1)
+        self.assertEqual(Forecast.objects.count(), 5)
+
+    @override_settings(WEATHER_RECORD_HISTORY=False)
+    def test_recording_can_be_disabled(self):
+        views.fetch_weather_and_forecast("London", RecordedClient())
+        self.assertFalse(Observation.objects.exists())
+
+    def test_history_view_summarises_days(self):
+        city = City.objects.create(key=history.city_key("London, United Kingdom"), name="London")
+        for hour, temp_c in ((6, 2.0), (12, 8.0), (18, 5.0)):
+            Observation.objects.create(
+                city=city, observed_at=datetime.datetime(2025, 1, 6, hour, tzinfo=datetime.timezone.utc),
+                temp_c=temp_c, description="Cloudy", icon_url="",
+            )
+        now = datetime.datetime(2025, 1, 7, tzinfo=datetime.timezone.utc)
+        with mock.patch.object(history.timezone, "now", return_value=now):
+            response = self.client.get("/history/london/", {"days": 7})
+        self.assertEqual(response.status_code, 200)
+        [day] = response.context["summary"]
+        self.assertEqual((day["min_temp"], day["max_temp"], day["avg_temp"], day["observations"]), (2.0, 8.0, 5.0, 3))
+
+
+# Tests for history recorded from worker threads, whose writes are not rolled back by TestCase
+class HistoryWorkerTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_dashboard_workers_close_their_connections(self):
+        closed = []
+        with mock.patch.object(history, "close_old_connections", lambda: closed.append(threading.current_thread())):
+            [result] = dashboard.load(["London"], lambda city: views.fetch_weather_and_forecast(city, RecordedClient()))
+        self.assertEqual(result["status"], "fetched")
+        self.assertEqual(Observation.objects.count(), 1)
+        self.assertEqual(len(closed), 1)
+        self.assertNotEqual(closed[0], threading.current_thread())
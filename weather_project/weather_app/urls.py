@@ -1,12 +1,34 @@
 # Import the path function from Django's urls module
 from django.urls import path
 
+# Import Django settings to choose between the sync and async views
+from django.conf import settings
+
 # Import the views module from the current directory
 from . import views
 
+# Under ASGI (see asgi.py) the weather views are served by their async versions
+if settings.WEATHER_ASYNC_VIEWS:
+    index_view, dashboard_view, api_view = views.index_async, views.weather_dashboard_async, views.weather_api_async
+else:
+    index_view, dashboard_view, api_view = views.index, views.weather_dashboard, views.weather_api
+
 # Define the URL patterns for this application
 urlpatterns = [
     # Map the root URL ('') to the 'index' view function in the views module
     # The 'name' parameter assigns a name ('index') to this URL pattern for reference in templates and code
-    path('', views.index, name='index'),
+    path('', index_view, name='index'),
+
+    # Map 'history/<city>/' to the daily temperature history of a city
+    path('history/<str:city>/', views.city_history, name='city_history'),
+
+    # Map 'dashboard/' to the multi-city dashboard and 'api/weather/' to its JSON API
+    path('dashboard/', dashboard_view, name='dashboard'),
+    path('api/weather/', api_view, name='weather_api'),
+
+    # Map 'api/cities/' to city name autocomplete
+    path('api/cities/', views.city_suggestions, name='city_suggestions'),
+
+    # Map 'debug/cache/' to the cache statistics view (staff only)
+    path('debug/cache/', views.cache_stats, name='cache_stats'),
 ]
@@ -4,34 +4,62 @@ from django.shortcuts import render
 # Import the datetime module to work with dates
 import datetime
 
-# Import the requests module to make HTTP requests
-import requests
+# Import asyncio to fetch cities concurrently in the async views
+import asyncio
+
+# Import the thread pool executor to fetch cities concurrently
+from concurrent.futures import ThreadPoolExecutor
+
+# Import sync_to_async to call the ORM from the async views
+from asgiref.sync import sync_to_async
+
+# Import the shared, pooled weather API client, the weather cache, the history store, the dashboard
+# and the city gazetteer
+from . import dashboard, gazetteer, history, weather_cache, weather_client
+
+# Import Django settings to check whether history recording is enabled
+from django.conf import settings
+
+# Import the decorator restricting debug views to staff users
+from django.contrib.admin.views.decorators import staff_member_required
+
+# Import JsonResponse to return JSON from the debug view
+from django.http import JsonResponse
+
+# Shared worker threads for fetching cities concurrently
+executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="weather-fetch")
 
 # Create views here.
 
 # The index view handles both GET and POST requests
 def index(request):
-    # Read the API key from a file and remove any extra whitespace or newline characters
-    API_KEY = open("API_KEY", "r").read().strip()
-    
-    # Define the API endpoint URLs for current weather and 5-day forecast
-    current_weather_url = "http://api.weatherapi.com/v1/current.json?key={}&q={}"
-    forecast_url = "http://api.weatherapi.com/v1/forecast.json?key={}&q={}&days=5"  # 5-day forecast
+    # Get the shared client; its API key and connections are set up once at startup
+    client = weather_client.get_client()
     
     # Handle the form submission when the request method is POST
     if request.method == "POST":
-        # Get the first city from the form
-        city1 = request.POST['city1']
+        # Get the first city from the form, as its canonical name ("london" -> "London, United Kingdom")
+        city1 = gazetteer.canonicalise(request.POST['city1'])
         
-        # Optionally get the second city, defaulting to None if not provided
-        city2 = request.POST.get('city2', None)
+        # Optionally get the second city, defaulting to an empty name if not provided
+        city2 = gazetteer.canonicalise(request.POST.get('city2', ''))
         
-        # Fetch weather and forecast data for the first city
-        weather_data1, daily_forecasts1 = fetch_weather_and_forecast(city1, API_KEY, current_weather_url, forecast_url)
+        # Fetch a city from the weather API on a cache miss
+        def fetch(city):
+            return fetch_weather_and_forecast(city, client)
         
-        # If a second city is provided, fetch its data; otherwise, set it to None
-        if city2:
-            weather_data2, daily_forecasts2 = fetch_weather_and_forecast(city2, API_KEY, current_weather_url, forecast_url)
+        # Start fetching the second city (if provided) in the background so both cities load concurrently
+        # The worker closes its database connection afterwards, as history may have used it
+        future2 = executor.submit(
+            history.close_connection_after, weather_cache.get_weather_and_forecast, city2, fetch
+        ) if city2 else None
+        
+        # Fetch weather and forecast data for the first city, from the cache when possible
+        weather_data1, daily_forecasts1 = weather_cache.get_weather_and_forecast(city1, fetch)
+        
+        # Wait for the second city's data; otherwise, set it to None
+        if future2 is not None:
+            weather_data2, daily_forecasts2 = future2.result()
         else:
             weather_data2, daily_forecasts2 = None, None
         
@@ -50,11 +78,187 @@ def index(request):
         return render(request, "weather_app/index.html")
 
 
+# Read the dashboard's city list from ?cities=London,Paris (or repeated ?cities=)
+# Returns the cities, or an error message if the list is empty or too long
+def dashboard_cities(request, default=()):
+    cities = dashboard.parse_cities(request.GET.getlist("cities")) or list(default)
+    if not cities:
+        return None, "No cities given; use ?cities=London,Paris"
+    if len(cities) > settings.WEATHER_DASHBOARD_MAX_CITIES:
+        return None, f"At most {settings.WEATHER_DASHBOARD_MAX_CITIES} cities can be requested at once"
+    return cities, None
+
+
+# Fetch every city of the dashboard from the cache or the weather API
+def load_dashboard(cities):
+    client = weather_client.get_client()
+    
+    # Fetch a city from the weather API on a cache miss
+    def fetch(city):
+        return fetch_weather_and_forecast(city, client)
+    
+    return dashboard.load(cities, fetch)
+
+
+# Build the dashboard page from the loaded results (or an error message)
+def render_dashboard(request, results, error):
+    context = {
+        "results": results,
+        "error": error,
+        "cities": dashboard.format_cities([result["city"] for result in results or []]),
+    }
+    return render(request, "weather_app/dashboard.html", context, status=400 if error else 200)
+
+
+# Build the JSON API response from the loaded results (or an error message)
+def dashboard_json(results, error):
+    if error:
+        return JsonResponse({"error": error}, status=400)
+    return JsonResponse({
+        "cities": results,
+        "failed": [result["city"] for result in results if result["status"] in ("error", "timeout")],
+    })
+
+
+# The dashboard view shows the current weather of many cities (the popular cities by default)
+def weather_dashboard(request):
+    cities, error = dashboard_cities(request, settings.WEATHER_POPULAR_CITIES)
+    return render_dashboard(request, load_dashboard(cities) if cities else None, error)
+
+
+# JSON API for the dashboard; cities that fail or miss the deadline are listed in "failed"
+def weather_api(request):
+    cities, error = dashboard_cities(request)
+    return dashboard_json(load_dashboard(cities) if cities else None, error)
+
+
+# JSON API for city name autocomplete: ?q=lon returns the most populous cities starting with "lon"
+def city_suggestions(request):
+    try:
+        limit = min(max(int(request.GET.get("limit", 10)), 1), 50)
+    except ValueError:
+        limit = 10
+    
+    index = gazetteer.get_gazetteer()
+    cities = index.suggest(request.GET.get("q", ""), limit) if index is not None else []
+    return JsonResponse({
+        "cities": [
+            {"label": city.label, "name": city.name, "country": city.country, "population": city.population}
+            for city in cities
+        ]
+    })
+
+
+# Async views, served instead of index, weather_dashboard and weather_api under ASGI (see urls.py)
+# Upstream waits do not hold a thread, so one worker can serve many slow requests at once
+
+# Async version of index
+async def index_async(request):
+    # Get the async client of this worker's event loop
+    client = weather_client.get_async_client()
+    
+    if request.method == "POST":
+        city1 = gazetteer.canonicalise(request.POST['city1'])
+        city2 = gazetteer.canonicalise(request.POST.get('city2', ''))
+        
+        # Fetch a city from the weather API on a cache miss
+        async def fetch(city):
+            return await fetch_weather_and_forecast_async(city, client)
+        
+        # Fetch both cities concurrently
+        lookup1 = weather_cache.aget_weather_and_forecast(city1, fetch)
+        if city2:
+            (weather_data1, daily_forecasts1), (weather_data2, daily_forecasts2) = await asyncio.gather(
+                lookup1, weather_cache.aget_weather_and_forecast(city2, fetch)
+            )
+        else:
+            weather_data1, daily_forecasts1 = await lookup1
+            weather_data2, daily_forecasts2 = None, None
+        
+        context = {
+            "weather_data1": weather_data1,
+            "daily_forecasts1": daily_forecasts1,
+            "weather_data2": weather_data2,
+            "daily_forecasts2": daily_forecasts2
+        }
+        return render(request, "weather_app/index.html", context)
+    else:
+        return render(request, "weather_app/index.html")
+
+
+# Async version of load_dashboard
+async def load_dashboard_async(cities):
+    client = weather_client.get_async_client()
+    
+    # Fetch a city from the weather API on a cache miss
+    async def fetch(city):
+        return await fetch_weather_and_forecast_async(city, client)
+    
+    return await dashboard.aload(cities, fetch)
+
+
+# Async version of weather_dashboard
+async def weather_dashboard_async(request):
+    cities, error = dashboard_cities(request, settings.WEATHER_POPULAR_CITIES)
+    return render_dashboard(request, await load_dashboard_async(cities) if cities else None, error)
+
+
+# Async version of weather_api
+async def weather_api_async(request):
+    cities, error = dashboard_cities(request)
+    return dashboard_json(await load_dashboard_async(cities) if cities else None, error)
+
+
+# A debug view showing the weather cache hit/miss counters (staff only)
+@staff_member_required
+def cache_stats(request):
+    return JsonResponse(weather_cache.stats())
+
+
+# The history view shows daily min/max/average temperatures recorded for a city
+def city_history(request, city):
+    city = gazetteer.canonicalise(city)
+    
+    # Number of days to show, 90 by default and at most about 5 years
+    try:
+        days = min(max(int(request.GET.get("days", 90)), 1), 5 * 366)
+    except ValueError:
+        days = 90
+    
+    context = {
+        "city": city,
+        "days": days,
+        "summary": history.daily_summary(city, days),
+    }
+    return render(request, "weather_app/history.html", context)
+
+
 # A helper function to fetch weather and forecast data for a given city
-def fetch_weather_and_forecast(city, api_key, current_weather_url, forecast_url):
-    # Fetch current weather data by making a GET request to the weather API
-    response = requests.get(current_weather_url.format(api_key, city)).json()
+def fetch_weather_and_forecast(city, client):
+    # Fetch the 5-day forecast from the weather API; the response also contains the current weather
+    response = client.get("forecast.json", q=city, days=5)
+    
+    # Save the observation and forecasts for history queries
+    if settings.WEATHER_RECORD_HISTORY:
+        history.record(city, response)
+    
+    # Extract the current weather and daily forecasts from the single response
+    return parse_weather_and_forecast(city, response)
+
+
+# Async version of fetch_weather_and_forecast, for an AsyncWeatherClient
+async def fetch_weather_and_forecast_async(city, client):
+    response = await client.get("forecast.json", q=city, days=5)
     
+    # The ORM is synchronous, so history is saved from a worker thread
+    if settings.WEATHER_RECORD_HISTORY:
+        await sync_to_async(history.record)(city, response)
+    
+    return parse_weather_and_forecast(city, response)
+
+
+# A helper function to extract the current weather and daily forecasts from a forecast.json response
+def parse_weather_and_forecast(city, response):
     # Extract the relevant current weather information
     weather_data = {
         "city": city,  # City name
@@ -63,14 +267,11 @@ def fetch_weather_and_forecast(city, api_key, current_weather_url, forecast_url)
         "icon_url": response['current']['condition']['icon']  # Weather icon URL
     }
     
-    # Fetch forecast data by making a GET request to the weather API
-    forecast_response = requests.get(forecast_url.format(api_key, city)).json()
-    
     # Initialize an empty list to store daily forecast information
     daily_forecasts = []
     
     # Loop through the forecast data for each day
-    for daily_data in forecast_response['forecast']['forecastday']:
+    for daily_data in response['forecast']['forecastday']:
         # Append relevant forecast information for each day to the list
         daily_forecasts.append({
             "day": datetime.datetime.strptime(daily_data['date'], "%Y-%m-%d").strftime("%A"),  # Day of the week
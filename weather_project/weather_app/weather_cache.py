@@ -0,0 +1,134 @@
+# Import quote to build cache keys that are safe for every cache backend
+from urllib.parse import quote
+
+# Import sync_to_async to use the cache from async views without blocking the event loop
+from asgiref.sync import sync_to_async
+
+# Import the thread pool executor to warm several cities concurrently
+from concurrent.futures import ThreadPoolExecutor
+
+# Import Django's cache and settings
+from django.conf import settings
+from django.core.cache import cache
+
+# Import history to close the database connections of the warming threads
+from . import history
+
+# Names of the hit/miss counters kept in the cache
+STAT_KEYS = {
+    "hits": "weather:stats:hits",
+    "current_hits": "weather:stats:current_hits",
+    "forecast_hits": "weather:stats:forecast_hits",
+    "misses": "weather:stats:misses",
+}
+
+
+# Build the cache key for a city; "London", "london " and "LONDON" share one entry
+def cache_key(kind, city):
+    return f"weather:{kind}:{quote(' '.join(city.lower().split()))}"
+
+
+# Increment a hit/miss counter stored in the cache (shared by all processes for shared backends)
+def count(stat, amount=1):
+    key = STAT_KEYS[stat]
+    cache.add(key, 0, None)  # Create the counter if it does not exist yet, without expiry
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.set(key, amount, None)  # The counter was evicted between add() and incr()
+
+
+# Store a city's current weather and forecast with their own TTLs
+def store(city, weather_data, daily_forecasts):
+    cache.set(cache_key("current", city), weather_data, settings.WEATHER_CURRENT_TTL)
+    cache.set(cache_key("forecast", city), daily_forecasts, settings.WEATHER_FORECAST_TTL)
+
+
+# Return the cached current weather and forecast of several cities, looked up in one round trip
+# Cities missing either part are left out of the result and counted as misses
+def lookup_many(cities):
+    keys = {city: (cache_key("current", city), cache_key("forecast", city)) for city in cities}
+    cached = cache.get_many([key for pair in keys.values() for key in pair])
+
+    found = {}
+    tallies = dict.fromkeys(STAT_KEYS, 0)
+    for city, (current_key, forecast_key) in keys.items():
+        weather_data = cached.get(current_key)
+        daily_forecasts = cached.get(forecast_key)
+        tallies["current_hits"] += weather_data is not None
+        tallies["forecast_hits"] += daily_forecasts is not None
+        if weather_data is not None and daily_forecasts is not None:
+            tallies["hits"] += 1
+            # Show the city as the user typed it this time
+            found[city] = dict(weather_data, city=city), daily_forecasts
+        else:
+            tallies["misses"] += 1
+
+    # Update each counter once per batch rather than once per city
+    for stat, amount in tallies.items():
+        if amount:
+            count(stat, amount)
+    return found
+
+
+# Return a city's current weather and forecast, from the cache when possible
+# fetch(city) performs the upstream request and returns (weather_data, daily_forecasts)
+def get_weather_and_forecast(city, fetch):
+    # Serve from the cache if both parts are still valid
+    found = lookup_many([city])
+    if city in found:
+        return found[city]
+
+    # Otherwise make one upstream request, which returns both parts, and cache them
+    weather_data, daily_forecasts = fetch(city)
+    store(city, weather_data, daily_forecasts)
+    return weather_data, daily_forecasts
+
+
+# Async version of get_weather_and_forecast; fetch(city) is a coroutine function
+async def aget_weather_and_forecast(city, fetch):
+    found = await sync_to_async(lookup_many)([city])
+    if city in found:
+        return found[city]
+
+    weather_data, daily_forecasts = await fetch(city)
+    await sync_to_async(store)(city, weather_data, daily_forecasts)
+    return weather_data, daily_forecasts
+
+
+# Cache backends that keep their entries inside one process
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+# Return whether the cache is shared by all server processes; entries and counters of a
+# process-local cache are only seen by the process that wrote them
+def is_shared():
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
+
+
+# Fetch cities from upstream with fetch(city) and store them, so entries get a full TTL
+# Returns the exception raised for each city, or None for cities that were warmed
+def warm(cities, fetch, workers=8):
+    def warm_city(city):
+        weather_data, daily_forecasts = fetch(city)
+        store(city, weather_data, daily_forecasts)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {city: executor.submit(history.close_connection_after, warm_city, city) for city in cities}
+        return {city: future.exception() for city, future in futures.items()}
+
+
+# Return the hit/miss counters and cache configuration for the debug view
+def stats():
+    values = cache.get_many(STAT_KEYS.values())
+    counters = {name: values.get(key, 0) for name, key in STAT_KEYS.items()}
+    lookups = counters["hits"] + counters["misses"]
+    counters["hit_ratio"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+    counters["backend"] = settings.CACHES["default"]["BACKEND"]
+    counters["shared"] = is_shared()  # False: counters cover this process only
+    counters["current_ttl"] = settings.WEATHER_CURRENT_TTL
+    counters["forecast_ttl"] = settings.WEATHER_FORECAST_TTL
+    return counters
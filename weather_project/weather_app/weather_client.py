@@ -0,0 +1,132 @@
+# Import asyncio and weakref to keep one async client per event loop
+import asyncio
+import weakref
+
+# Import the requests module and its connection adapter to make pooled HTTP requests
+import requests
+from requests.adapters import HTTPAdapter
+
+# Import Django settings to read the weather API configuration
+from django.conf import settings
+
+
+# A client for weatherapi.com that keeps connections alive between requests
+class WeatherClient:
+    def __init__(self, api_key, base_url, timeout=(3.05, 10), pool_size=10, pooling=True):
+        # API key sent with every request
+        self.api_key = api_key
+
+        # Base URL of the API, e.g. http://api.weatherapi.com/v1
+        self.base_url = base_url.rstrip("/")
+
+        # (connect, read) timeout in seconds for every request
+        self.timeout = timeout
+
+        # When pooling is disabled every call opens a new connection (used by the benchmark)
+        self.session = requests.Session() if pooling else None
+        if self.session is not None:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+    # Perform a GET request against an API endpoint and return the decoded JSON
+    def get(self, endpoint, **params):
+        params["key"] = self.api_key
+        url = f"{self.base_url}/{endpoint}"
+        if self.session is not None:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        else:
+            response = requests.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    # Close all pooled connections
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+
+# An asyncio client for weatherapi.com, used by the async views when served over ASGI
+# aiohttp is optional and only imported when an async client is created
+class AsyncWeatherClient:
+    def __init__(self, api_key, base_url, timeout=(3.05, 10), pool_size=10):
+        import aiohttp
+
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+
+        # Waiting for a free pooled connection counts against the read timeout
+        connect_timeout, read_timeout = timeout
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size),
+            timeout=aiohttp.ClientTimeout(connect=read_timeout, sock_connect=connect_timeout, sock_read=read_timeout),
+        )
+
+    # Perform a GET request against an API endpoint and return the decoded JSON
+    async def get(self, endpoint, **params):
+        params["key"] = self.api_key
+        async with self.session.get(f"{self.base_url}/{endpoint}", params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    # Close all pooled connections
+    async def aclose(self):
+        await self.session.close()
+
+
+# The shared client, created once when the app is ready (see apps.py)
+_client = None
+
+# Async clients by event loop; their connections cannot be shared between loops
+_async_clients = weakref.WeakKeyDictionary()
+
+
+# Read the API key from settings, or from the API_KEY file if no key is set
+def load_api_key():
+    if getattr(settings, "WEATHER_API_KEY", None):
+        return settings.WEATHER_API_KEY
+    with open(settings.WEATHER_API_KEY_FILE, "r") as key_file:
+        return key_file.read().strip()
+
+
+# Return the API key, or "" if none is configured (requests then fail upstream until one is)
+def configured_api_key():
+    try:
+        return load_api_key()
+    except OSError:
+        return ""
+
+
+# Build the shared client from the project settings
+def configure():
+    global _client
+    if _client is not None:
+        _client.close()
+    _client = WeatherClient(
+        configured_api_key(),
+        settings.WEATHER_API_BASE_URL,
+        timeout=settings.WEATHER_API_TIMEOUT,
+        pool_size=settings.WEATHER_API_POOL_SIZE,
+        pooling=settings.WEATHER_API_POOLING,
+    )
+    return _client
+
+
+# Return the shared client, creating it on first use
+def get_client():
+    return _client or configure()
+
+
+# Return the async client of the running event loop, creating it on first use
+# Under ASGI there is one loop per worker, so connections are kept alive across requests
+def get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncWeatherClient(
+            configured_api_key(),
+            settings.WEATHER_API_BASE_URL,
+            timeout=settings.WEATHER_API_TIMEOUT,
+            pool_size=settings.WEATHER_API_POOL_SIZE,
+        )
+    return client
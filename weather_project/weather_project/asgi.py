@@ -16,5 +16,8 @@ from django.core.asgi import get_asgi_application
 # Set the default settings module for the Django project
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'weather_project.settings')
 
+# Serve the async weather views, so upstream waits do not block the worker
+os.environ.setdefault('WEATHER_ASYNC_VIEWS', '1')
+
 # Create the ASGI application callable
 application = get_asgi_application()
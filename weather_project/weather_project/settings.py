@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -82,6 +83,24 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The in-memory cache is per process. For multi-process deployments use a shared backend, e.g.
+#     'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': BASE_DIR / 'cache'
+# or 'django.core.cache.backends.db.DatabaseCache' with 'LOCATION': 'weather_cache'
+# (run `python manage.py createcachetable` first).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'weather',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -125,4 +144,56 @@ STATICFILES_DIRS = [
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Weather API
+# The API key is read once at startup: from WEATHER_API_KEY if set, otherwise from the API_KEY file
+
+WEATHER_API_KEY = None
+
+WEATHER_API_KEY_FILE = BASE_DIR / 'API_KEY'
+
+WEATHER_API_BASE_URL = 'http://api.weatherapi.com/v1'
+
+# (connect, read) timeout in seconds for every upstream request
+WEATHER_API_TIMEOUT = (3.05, 10)
+
+# Maximum number of kept-alive connections to the weather API
+# (at least WEATHER_DASHBOARD_CONCURRENCY, so dashboard lookups reuse connections)
+WEATHER_API_POOL_SIZE = 50
+
+# Set to False to open a new connection for every upstream request
+WEATHER_API_POOLING = True
+
+# Serve the async weather views (set by asgi.py; WSGI and runserver use the sync views)
+WEATHER_ASYNC_VIEWS = os.environ.get('WEATHER_ASYNC_VIEWS') == '1'
+
+# Save every fetched observation and forecast to the database for history queries
+WEATHER_RECORD_HISTORY = True
+
+# Seconds cached current conditions and forecasts stay valid
+WEATHER_CURRENT_TTL = 10 * 60
+
+WEATHER_FORECAST_TTL = 60 * 60
+
+# Gzipped city dataset used to canonicalise city names and for autocomplete (None to disable)
+WEATHER_GAZETTEER_CITIES = BASE_DIR / 'weather_app' / 'data' / 'cities.csv.gz'
+
+# Maximum number of cities per dashboard request
+WEATHER_DASHBOARD_MAX_CITIES = 200
+
+# Maximum number of concurrent upstream requests made by the dashboard, shared by all requests
+WEATHER_DASHBOARD_CONCURRENCY = 50
+
+# Seconds the dashboard waits for upstream lookups; slower cities are reported as timed out
+WEATHER_DASHBOARD_DEADLINE = 5
+
+# Cities pre-loaded into the cache by `python manage.py warm_weather_cache`
+WEATHER_POPULAR_CITIES = [
+    'London', 'New York', 'Paris', 'Tokyo', 'Sydney', 'Dubai', 'Toronto', 'Berlin',
+]
+
+# Warm WEATHER_POPULAR_CITIES in the background when each process starts. With the per-process
+# in-memory cache this is the only way to warm it: the warm_weather_cache command only reaches shared caches
+WEATHER_WARM_ON_STARTUP = os.environ.get('WEATHER_WARM_ON_STARTUP') == '1'